@@ -1,6 +1,3 @@
-from langchain_text_splitters import CharacterTextSplitter
-
-
 def character_text_splitter(docs):
     """
     문서 분할 메서드
@@ -11,6 +8,8 @@ def character_text_splitter(docs):
     Returns:
         CharacterTextSplitter 객체
     """
+    from langchain_text_splitters import CharacterTextSplitter
+
     print("Splitting documents")
     text_splitter = CharacterTextSplitter(
         separator="\n\n",
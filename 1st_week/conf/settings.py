@@ -1,11 +1,8 @@
-from dotenv import load_dotenv
-from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
 
-
-class config(BaseSettings):
+class Config(BaseSettings):
     AOAI_API_KEY: str
     AOAI_ENDPOINT: str
     AOAI_API_VERSION: str
@@ -15,6 +12,8 @@ class config(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
     def get_llm(self):
+        from langchain_openai import AzureChatOpenAI
+
         return AzureChatOpenAI(
             openai_api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
@@ -26,6 +25,8 @@ class config(BaseSettings):
         )
 
     def get_embeddings(self):
+        from langchain_openai import AzureOpenAIEmbeddings
+
         return AzureOpenAIEmbeddings(
             # model=self.AOAI_EMBEDDING_DEPLOYMENT,
             model="text-embedding-3-large",
@@ -35,7 +36,27 @@ class config(BaseSettings):
         )
 
 
-config = config()
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """
+    설정 인스턴스 반환 메서드
+
+    .env 로드와 설정 검증은 처음 호출될 때 한 번만 수행합니다.
+
+    Returns:
+        Config 객체
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Config()
+
+
+def __getattr__(name):
+    # 기존 `from conf.settings import config` 사용처 호환
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_llm():
@@ -45,7 +66,7 @@ def get_llm():
     Returns:
         AzureChatOpenAI 객체
     """
-    return config.get_llm()
+    return get_config().get_llm()
 
 
 def get_embeddings():
@@ -55,4 +76,4 @@ def get_embeddings():
     Returns:
         AzureOpenAIEmbeddings 객체
     """
-    return config.get_embeddings()
+    return get_config().get_embeddings()
@@ -1,9 +1,10 @@
-from langgraph.graph import StateGraph, END
 from core.state import State
 from agent.pdf_agent import PdfAgent
 
 
 def create_graph():
+    from langgraph.graph import StateGraph, END
+
     workflow = StateGraph(State)
 
     pdf_agent = PdfAgent()
@@ -1,4 +1,3 @@
-from langchain_community.vectorstores import FAISS
 import os
 from conf.settings import get_embeddings
 
@@ -14,6 +13,8 @@ def create_faiss_vector_store(documents):
     Returns:
         FAISS 벡터스토어 객체
     """
+    from langchain_community.vectorstores import FAISS
+
     print("Creating FAISS vector store...")
     vectorstore = FAISS.from_documents(documents, embedding=get_embeddings())
     print("FAISS vector store created successfully")
@@ -44,6 +45,8 @@ def load_faiss_vector_store(folder_path):
     Returns:
         FAISS 벡터스토어 객체
     """
+    from langchain_community.vectorstores import FAISS
+
     embeddings = get_embeddings()
     print(f"Loading FAISS vector store from {folder_path}...")
     vectorstore = FAISS.load_local(
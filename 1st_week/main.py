@@ -1,14 +1,10 @@
-from parsing.load_pdf import load_pdf
-from chunking.character_text_splitter import character_text_splitter
-from indexing.faiss_imbedding import (
-    create_faiss_vector_store,
-    save_faiss_vector_store,
-    load_faiss_vector_store,
-    search_faiss_vector_store,
-)
 import os
-from graph.graph import create_graph
-from core.state import State
+import sys
+
+# 무거운 의존성(langchain_community, FAISS, pypdf, langgraph, langchain_openai)은
+# 실제로 필요한 경로에서만 로드하도록 함수 내부에서 import 합니다.
+
+DEFAULT_QUERY = "2025 고용 전망은 어떠한가?"
 
 
 def pdf_text_splitter_faiss_indexing(query):
@@ -18,10 +14,22 @@ def pdf_text_splitter_faiss_indexing(query):
     Args:
         query: 검색할 질의
     """
+    from indexing.faiss_imbedding import (
+        create_faiss_vector_store,
+        save_faiss_vector_store,
+        load_faiss_vector_store,
+        search_faiss_vector_store,
+    )
+    from graph.graph import create_graph
+    from core.state import State
 
     if os.path.exists("faiss/pdf_faiss_index"):
         vectorstore = load_faiss_vector_store("faiss/pdf_faiss_index")
     else:
+        # 인덱스가 없을 때만 PDF 파싱/청킹 모듈을 로드
+        from parsing.load_pdf import load_pdf
+        from chunking.character_text_splitter import character_text_splitter
+
         docs = load_pdf()
         chunks = character_text_splitter(docs)
         vectorstore = create_faiss_vector_store(chunks)
@@ -39,7 +47,8 @@ def pdf_text_splitter_faiss_indexing(query):
 
 
 def __main__():
-    pdf_text_splitter_faiss_indexing("2025 고용 전망은 어떠한가?")
+    query = " ".join(sys.argv[1:]) or DEFAULT_QUERY
+    pdf_text_splitter_faiss_indexing(query)
 
     # graph = create_graph()
 
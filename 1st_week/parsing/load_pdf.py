@@ -1,6 +1,3 @@
-from langchain_community.document_loaders import PyPDFLoader
-
-
 def load_pdf(file_path="docs/2025년_2월_경제전망보고서(Indigo_Book).pdf"):
     """
     파일 로드 메서드
@@ -11,6 +8,8 @@ def load_pdf(file_path="docs/2025년_2월_경제전망보고서(Indigo_Book).pdf
     Returns:
         PyPDFLoader 객체
     """
+    from langchain_community.document_loaders import PyPDFLoader
+
     print("Reading file from: ", file_path)
 
     loader = PyPDFLoader(file_path)
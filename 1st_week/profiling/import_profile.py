@@ -0,0 +1,143 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 질의 한 번 실행(main.py)이 import 하는 모듈. 무거운 의존성은 함수 안에서 로드
+ONE_SHOT_MODULES = ("main", "conf.settings", "indexing.faiss_imbedding", "graph.graph")
+
+# ONE_SHOT_MODULES 에 허용하는 누적 import 시간(ms)
+DEFAULT_IMPORT_BUDGET_MS = 500.0
+
+
+class ImportRecord(NamedTuple):
+    """
+    `-X importtime` 한 줄에 대한 기록
+
+    - module: 모듈 이름
+    - self_us: 모듈 자체 import 시간(us)
+    - cumulative_us: 하위 모듈을 포함한 누적 import 시간(us)
+    - depth: import 중첩 깊이 (0이 최상위)
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _module_names(module: Union[str, Sequence[str]]) -> List[str]:
+    return [module] if isinstance(module, str) else list(module)
+
+
+def measure_import_time(
+    module: Union[str, Sequence[str]] = ONE_SHOT_MODULES,
+) -> List[ImportRecord]:
+    """
+    새 인터프리터에서 모듈을 import 하며 `-X importtime` 결과를 수집하는 메서드
+
+    Args:
+        module: import 할 모듈 이름 (여러 개면 목록)
+
+    Returns:
+        ImportRecord 목록
+    """
+    statement = f"import {', '.join(_module_names(module))}"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{completed.stderr}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append(
+            ImportRecord(
+                module=name.strip(),
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=depth,
+            )
+        )
+    return records
+
+
+def check_import_budget(
+    module: Union[str, Sequence[str]] = ONE_SHOT_MODULES,
+    budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+    records: Optional[List[ImportRecord]] = None,
+) -> Tuple[bool, float]:
+    """
+    모듈의 누적 import 시간이 예산 이내인지 확인하는 메서드
+
+    여러 모듈이면 최상위에서 import 된 모듈의 누적 시간을 합산합니다.
+    (다른 모듈이 먼저 import 한 모듈은 그 모듈의 누적 시간에 이미 포함됨)
+
+    Args:
+        module: 확인할 모듈 이름 (여러 개면 목록)
+        budget_ms: 허용 import 시간(ms)
+        records: 이미 측정한 ImportRecord 목록. None이면 새로 측정
+
+    Returns:
+        (예산 충족 여부, 측정된 누적 import 시간(ms))
+    """
+    if records is None:
+        records = measure_import_time(module)
+    names = set(_module_names(module))
+    elapsed_ms = sum(
+        r.cumulative_us for r in records if r.module in names and r.depth == 0
+    ) / 1000
+    return elapsed_ms <= budget_ms, elapsed_ms
+
+
+def format_report(records: List[ImportRecord], top: int = 15) -> str:
+    """
+    누적 import 시간 기준 상위 모듈 리포트 생성 메서드
+
+    Args:
+        records: ImportRecord 목록
+        top: 출력할 모듈 수
+
+    Returns:
+        리포트 문자열
+    """
+    lines = [f"{'cumulative(ms)':>15} {'self(ms)':>10}  module"]
+    for record in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{record.cumulative_us / 1000:>15.1f} {record.self_us / 1000:>10.1f}  "
+            f"{'  ' * record.depth}{record.module}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="-X importtime 기반 시작 시간 리포트")
+    parser.add_argument("modules", nargs="*", default=list(ONE_SHOT_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    records = measure_import_time(args.modules)
+    print(format_report(records, args.top))
+
+    ok, elapsed_ms = check_import_budget(args.modules, args.budget_ms, records)
+    print(
+        f"\nimport {', '.join(args.modules)}: {elapsed_ms:.1f} ms "
+        f"(budget {args.budget_ms:.1f} ms) -> {'OK' if ok else 'OVER BUDGET'}"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
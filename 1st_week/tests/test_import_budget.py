@@ -0,0 +1,51 @@
+import pytest
+
+from profiling.import_profile import (
+    DEFAULT_IMPORT_BUDGET_MS,
+    ONE_SHOT_MODULES,
+    check_import_budget,
+    format_report,
+    measure_import_time,
+)
+
+# 질의 한 번 실행 시 모듈 import 단계에서 로드되면 안 되는 무거운 의존성
+LAZY_DEPENDENCIES = (
+    "langchain_openai",
+    "langchain_community",
+    "langchain_text_splitters",
+    "langgraph",
+    "faiss",
+    "pypdf",
+)
+
+
+def test_one_shot_imports_within_budget():
+    records = measure_import_time(ONE_SHOT_MODULES)
+    ok, elapsed_ms = check_import_budget(
+        ONE_SHOT_MODULES, DEFAULT_IMPORT_BUDGET_MS, records
+    )
+    assert ok, (
+        f"{elapsed_ms:.1f} ms > {DEFAULT_IMPORT_BUDGET_MS:.1f} ms\n"
+        + format_report(records)
+    )
+
+
+def test_one_shot_imports_skip_lazy_dependencies():
+    records = measure_import_time(ONE_SHOT_MODULES)
+    loaded = sorted(
+        {
+            r.module
+            for r in records
+            if r.module.split(".")[0] in LAZY_DEPENDENCIES
+        }
+    )
+    assert not loaded, f"Heavy modules imported at module level: {loaded}"
+
+
+def test_check_import_budget_sums_top_level_modules():
+    records = measure_import_time(["conf.settings", "core.state"])
+    _, settings_ms = check_import_budget("conf.settings", records=records)
+    _, state_ms = check_import_budget("core.state", records=records)
+    _, total_ms = check_import_budget(["conf.settings", "core.state"], records=records)
+    assert settings_ms > 0 and state_ms > 0
+    assert total_ms == pytest.approx(settings_ms + state_ms)
@@ -3,10 +3,12 @@ from agents.task_planner import TaskPlannerAgent
 from agents.todo_generator import TodoGeneratorAgent
 from agents.scheduler import SchedulerAgent
 from agents.review_agent import ReviewAgent
+from agents.plan_generator import PlanGeneratorAgent
 
 __all__ = [
     "TaskPlannerAgent",
     "TodoGeneratorAgent",
     "SchedulerAgent",
-    "ReviewAgent"
+    "ReviewAgent",
+    "PlanGeneratorAgent"
 ] 
\ No newline at end of file
@@ -0,0 +1,105 @@
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
+from typing import Dict, List, Any
+from conf.settings import get_llm, get_llm_cache
+from utils.llm_cache import cached_invoke, expect_json
+
+
+class PlanGeneratorAgent:
+    """
+    목표 분석(작업 영역 추출)과 영역별 할 일 생성을 한 번의 LLM 호출로 처리하는 에이전트
+    """
+
+    # 프롬프트를 바꾸면 올려서 이전 버전의 캐시 항목을 사용하지 않도록 함
+    PROMPT_VERSION = "v1"
+
+    def __init__(self, model=None, cache=None):
+        """
+        Args:
+            model: 사용할 채팅 모델. None이면 get_llm("plan_generator")으로 생성
+            cache: 출력 캐시(LLMOutputCache). None이면 설정(LLM_CACHE_PATH)에 따르고, False이면 사용하지 않음
+        """
+        self.model = model or get_llm("plan_generator")
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.output_parser = JsonOutputParser()
+
+        self.prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """당신은 사용자의 목표를 분석하여 작업 영역을 정하고, 영역별 세부 할 일 목록을 생성하는 전문가입니다.
+
+1. 목표를 달성하기 위해 필요한 주요 작업 영역을 3-6개 정도로 식별하세요.
+   예: "포트폴리오 웹사이트 만들기" → ["기획", "디자인", "개발", "콘텐츠 작성", "배포"]
+2. 각 작업 영역에 대해 명확하고 실행 가능한 할 일을 3-5개 생성하세요.
+   각 할 일에는 제목(title), 필요한 경우 간략한 설명(description), 예상 소요 시간(duration_days, 일 단위)을 포함하세요.
+
+todos의 키는 task_areas의 영역 이름과 정확히 같아야 하며, task_areas와 같은 순서로 작성하세요.
+
+결과는 다음 JSON 형식으로 반환하세요:
+{{
+    "task_areas": ["영역1", "영역2", ...],
+    "goal_analysis": "목표에 대한 간략한 분석",
+    "todos": {{
+        "영역1": [
+            {{"title": "할 일 제목", "description": "설명", "duration_days": 1}},
+            ...
+        ],
+        "영역2": [
+            {{"title": "할 일 제목", "description": "설명", "duration_days": 2}},
+            ...
+        ]
+    }}
+}}""",
+                ),
+                ("user", "{goal}"),
+            ]
+        )
+
+    def generate_plan(self, goal: str) -> Dict[str, Any]:
+        """
+        목표를 분석하여 작업 영역과 영역별 할 일 목록을 함께 생성합니다.
+
+        Args:
+            goal: 사용자가 입력한 목표
+
+        Returns:
+            task_areas, goal_analysis, todos(영역별 할 일 목록)가 포함된 딕셔너리.
+            할 일을 받지 못한 영역은 todos에 포함되지 않습니다.
+        """
+        chain = self.prompt | self.model | self.output_parser
+
+        try:
+            result = cached_invoke(
+                chain,
+                {"goal": goal},
+                self.cache,
+                f"plan_generator:{self.PROMPT_VERSION}",
+                expect_json(task_areas=list, todos=dict),
+            )
+        except Exception as e:
+            # 파싱 오류 시 기본값 반환
+            print(f"Error generating plan: {e}")
+            return {
+                "task_areas": ["기획", "실행", "검토"],
+                "goal_analysis": f"목표 분석 중 오류 발생: {goal}",
+                "todos": {},
+            }
+
+        task_areas = [
+            area for area in result.get("task_areas") or [] if isinstance(area, str)
+        ]
+        raw_todos = result.get("todos") if isinstance(result.get("todos"), dict) else {}
+        todos: Dict[str, List[Dict[str, Any]]] = {}
+        for area in task_areas:
+            tasks = raw_todos.get(area)
+            if isinstance(tasks, list):
+                todos[area] = [
+                    task for task in tasks if isinstance(task, dict) and task.get("title")
+                ]
+
+        return {
+            "task_areas": task_areas or ["기획", "실행", "검토"],
+            "goal_analysis": result.get("goal_analysis", ""),
+            "todos": todos,
+        }
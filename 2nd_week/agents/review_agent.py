@@ -2,7 +2,9 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from typing import Dict, List, Any
 import json
-from conf.settings import get_llm
+from conf.settings import get_llm, get_llm_cache
+from utils.llm_cache import cached_invoke, expect_json
+from utils.prompt_codec import encode_review_plan
 
 
 class ReviewAgent:
@@ -10,8 +12,17 @@ class ReviewAgent:
     생성된 TODO 리스트와 일정을 검토하는 에이전트
     """
 
-    def __init__(self):
-        self.model = get_llm()
+    # 프롬프트를 바꾸면 올려서 이전 버전의 캐시 항목을 사용하지 않도록 함
+    PROMPT_VERSION = "v2"
+
+    def __init__(self, model=None, cache=None):
+        """
+        Args:
+            model: 사용할 채팅 모델. None이면 get_llm("reviewer")으로 생성
+            cache: 출력 캐시(LLMOutputCache). None이면 설정(LLM_CACHE_PATH)에 따르고, False이면 사용하지 않음
+        """
+        self.model = model or get_llm("reviewer")
+        self.cache = cache if cache is not None else get_llm_cache()
         self.output_parser = JsonOutputParser()
 
         self.prompt = ChatPromptTemplate.from_messages(
@@ -25,6 +36,9 @@ class ReviewAgent:
 2. 일정이 현실적이고 효율적인지
 3. 개선이 필요한 부분이 있는지
 
+계획은 [영역] 줄 아래에 "제목|소요일|D+시작~종료|핵심 경로 여부(*)" 형식의 행으로 주어집니다.
+D+n은 시작일로부터 n일째를 뜻합니다.
+
 결과는 다음 JSON 형식으로 반환하세요:
 {{
     "is_sufficient": true,
@@ -41,11 +55,8 @@ class ReviewAgent:
                     "user",
                     """목표: {goal}
 
-할 일 목록:
-{todos_markdown}
-
-추천 일정:
-{schedule_markdown}
+할 일 목록과 추천 일정:
+{plan_table}
 
 위 할 일 목록과 일정을 검토하고 평가해주세요.""",
                 ),
@@ -53,15 +64,16 @@ class ReviewAgent:
         )
 
     def review_plan(
-        self, goal: str, todos_markdown: str, schedule_markdown: str
+        self, goal: str, todos: Dict[str, List[Dict[str, Any]]], schedule: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         생성된 TODO 리스트와 일정을 검토합니다.
+        프롬프트에는 검토에 필요한 필드만 압축 표(encode_review_plan)로 전달합니다.
 
         Args:
             goal: 사용자의 목표
-            todos_markdown: 마크다운 형식의 할 일 목록
-            schedule_markdown: 마크다운 형식의 일정
+            todos: 영역별 할 일 목록
+            schedule: 추천 일정 (start_date, tasks, total_days)
 
         Returns:
             검토 결과가 포함된 딕셔너리
@@ -69,12 +81,12 @@ class ReviewAgent:
         chain = self.prompt | self.model | self.output_parser
 
         try:
-            result = chain.invoke(
-                {
-                    "goal": goal,
-                    "todos_markdown": todos_markdown,
-                    "schedule_markdown": schedule_markdown,
-                }
+            result = cached_invoke(
+                chain,
+                {"goal": goal, "plan_table": encode_review_plan(todos, schedule)},
+                self.cache,
+                f"review_agent:{self.PROMPT_VERSION}",
+                expect_json(review_comment=str),
             )
             return result
         except Exception as e:
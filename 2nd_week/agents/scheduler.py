@@ -1,39 +1,48 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
-import json
-from conf.settings import get_llm
+from datetime import datetime
+from conf.settings import get_llm, get_llm_cache
+from utils.llm_cache import cached_invoke, expect_json
+from utils.schedule_engine import build_schedule
+from utils.leveling import level_schedule
+from utils.prompt_codec import encode_todo_titles
 
 
 class SchedulerAgent:
     """
     할 일 목록을 바탕으로 일정을 추천하는 에이전트
+    (LLM은 할 일 간 의존성 추론에만 선택적으로 사용)
     """
 
-    def __init__(self):
-        self.model = get_llm()
+    # 프롬프트를 바꾸면 올려서 이전 버전의 캐시 항목을 사용하지 않도록 함
+    PROMPT_VERSION = "v2"
+
+    def __init__(self, model=None, cache=None):
+        """
+        Args:
+            model: 사용할 채팅 모델. None이면 get_llm("scheduler")으로 생성
+            cache: 출력 캐시(LLMOutputCache). None이면 설정(LLM_CACHE_PATH)에 따르고, False이면 사용하지 않음
+        """
+        self.model = model or get_llm("scheduler")
+        self.cache = cache if cache is not None else get_llm_cache()
         self.output_parser = JsonOutputParser()
 
+        # 할 일 간 선후 관계 추론용 프롬프트 (선택적으로 사용)
         self.prompt = ChatPromptTemplate.from_messages(
             [
                 (
                     "system",
-                    """당신은 할 일 목록을 바탕으로 효율적인 일정을 추천하는 전문가입니다.
+                    """당신은 할 일 목록에서 작업 간의 선후 관계(의존성)를 분석하는 전문가입니다.
             
-사용자의 할 일 목록과 목표 기간을 바탕으로, 각 할 일에 대한 시작일과 종료일을 추천하세요.
-일정은 현실적이고 효율적이어야 합니다. 작업 간의 의존성과 우선순위를 고려하세요.
+사용자의 목표와 할 일 목록을 보고, 각 할 일을 시작하기 전에 반드시 끝나야 하는 선행 할 일을 찾으세요.
+병렬로 진행할 수 있는 할 일에는 의존성을 만들지 마세요. 할 일 제목은 목록에 있는 그대로 사용하세요.
+할 일 목록은 [영역] 줄 아래에 그 영역의 할 일 제목이 한 줄씩 나열된 형식입니다.
 
 결과는 다음 JSON 형식으로 반환하세요:
 {{
-    "start_date": "YYYY-MM-DD",
-    "tasks": [
-        {{
-            "title": "할 일 제목",
-            "area": "작업 영역",
-            "duration_days": 1,
-            "start_day_offset": 0
-        }},
+    "dependencies": [
+        {{"task": "할 일 제목", "depends_on": ["선행 할 일 제목", ...]}},
         ...
     ]
 }}""",
@@ -42,88 +51,107 @@ class SchedulerAgent:
                     "user",
                     """목표: {goal}
 
-목표 기간: {duration} 일
-
 할 일 목록:
-{todos_json}
+{todos_list}
 
-위 할 일 목록을 바탕으로 {duration}일 이내에 완료할 수 있는 효율적인 일정을 추천해주세요.
-오늘({today})부터 시작한다고 가정합니다.""",
+각 할 일의 선행 할 일을 알려주세요.""",
                 ),
             ]
         )
 
+    def infer_dependencies(
+        self, goal: str, todos: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, List[str]]:
+        """
+        LLM을 사용하여 할 일 간의 의존성을 추론합니다.
+
+        Args:
+            goal: 사용자의 목표
+            todos: 영역별 할 일 목록
+
+        Returns:
+            할 일 제목 → 선행 할 일 제목 목록. 실패 시 빈 딕셔너리
+        """
+        chain = self.prompt | self.model | self.output_parser
+
+        todos_list = encode_todo_titles(todos)
+
+        try:
+            result = cached_invoke(
+                chain,
+                {"goal": goal, "todos_list": todos_list},
+                self.cache,
+                f"scheduler.dependencies:{self.PROMPT_VERSION}",
+                expect_json(dependencies=list),
+            )
+            return {
+                item["task"]: list(item.get("depends_on") or [])
+                for item in result["dependencies"]
+            }
+        except Exception as e:
+            print(f"Error inferring dependencies: {e}")
+            return {}
+
     def recommend_schedule(
-        self, goal: str, todos: Dict[str, List[Dict[str, Any]]], duration: int = None
+        self,
+        goal: str,
+        todos: Dict[str, List[Dict[str, Any]]],
+        duration: int = None,
+        infer_dependencies: bool = False,
+        previous: Dict[str, Any] = None,
+        changed_areas: List[str] = None,
+        leveling: Dict[str, Any] = None,
     ) -> Dict[str, Any]:
         """
         할 일 목록을 바탕으로 일정을 추천합니다.
 
+        일정은 로컬 스케줄링 엔진(위상 정렬 + 핵심 경로)으로 계산하며,
+        infer_dependencies가 True일 때만 LLM으로 할 일 간 의존성을 추론합니다.
+
         Args:
             goal: 사용자의 목표
             todos: 영역별 할 일 목록
-            duration: 목표 기간(일). None인 경우 할 일의 총 소요 시간을 사용
+            duration: 목표 기간(일). 계산된 일정이 이를 넘으면 경고를 출력
+            infer_dependencies: LLM으로 의존성을 추론할지 여부.
+                False이면 영역 내 할 일은 순차, 영역 간에는 병렬로 배치
+            previous: 이전 추천 일정. changed_areas와 함께 주면 증분 계산
+            changed_areas: 이전 일정 이후 할 일이 바뀐 영역
+            leveling: level_schedule 옵션 (workers, area_capacity, weekmask, holidays).
+                주면 작업자/영역별 동시 작업 수와 근무일 달력에 맞춰 일정을 평준화
 
         Returns:
             추천 일정이 포함된 딕셔너리
         """
-        # 총 소요 시간 계산
-        total_days = 0
-        flattened_todos = []
-
-        for area, tasks in todos.items():
-            for task in tasks:
-                total_days += task.get("duration_days", 0)
-                flattened_todos.append(
-                    {
-                        "title": task["title"],
-                        "area": area,
-                        "duration_days": task.get("duration_days", 0),
-                    }
-                )
-
-        # 목표 기간이 지정되지 않은 경우, 총 소요 시간의 1.2배로 설정
-        if duration is None:
-            duration = int(total_days * 1.2)
-
-        chain = self.prompt | self.model | self.output_parser
+        dependencies = self.infer_dependencies(goal, todos) if infer_dependencies else {}
+
+        plan = build_schedule(
+            todos,
+            dependencies,
+            chain_areas=not dependencies,
+            previous=previous,
+            changed_areas=changed_areas,
+        )
 
-        try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            result = chain.invoke(
-                {
-                    "goal": goal,
-                    "duration": duration,
-                    "todos_json": json.dumps(todos, ensure_ascii=False, indent=2),
-                    "today": today,
-                }
+        if duration is not None and plan["total_days"] > duration:
+            print(
+                f"Schedule exceeds target duration: {plan['total_days']} > {duration} days"
             )
 
-            # 날짜 문자열을 datetime 객체로 변환
-            start_date = datetime.strptime(result["start_date"], "%Y-%m-%d")
+        if previous and previous.get("start_date"):
+            # 재계획 시에는 기존 시작일 유지
+            start_date = previous["start_date"]
+        else:
+            start_date = datetime.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
 
-            # 태스크 정렬 및 시작일 계산
-            sorted_tasks = sorted(result["tasks"], key=lambda x: x["start_day_offset"])
+        if leveling:
+            plan.update(level_schedule(plan["tasks"], start_date, **leveling))
 
-            return {"start_date": start_date, "tasks": sorted_tasks}
-        except Exception as e:
-            # 파싱 오류 시 기본 일정 생성
-            print(f"Error recommending schedule: {e}")
-
-            start_date = datetime.now()
-            tasks = []
-            day_offset = 0
-
-            for area, area_tasks in todos.items():
-                for task in area_tasks:
-                    tasks.append(
-                        {
-                            "title": task["title"],
-                            "area": area,
-                            "duration_days": task.get("duration_days", 1),
-                            "start_day_offset": day_offset,
-                        }
-                    )
-                    day_offset += task.get("duration_days", 1)
-
-            return {"start_date": start_date, "tasks": tasks}
+        return {
+            "start_date": start_date,
+            "tasks": plan["tasks"],
+            "total_days": plan["total_days"],
+            "critical_path": plan["critical_path"],
+            "recomputed": plan["recomputed"],
+        }
@@ -2,7 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from typing import Dict, List, Any
 import json
-from conf.settings import get_llm
+from conf.settings import get_llm, get_llm_cache
+from utils.llm_cache import cached_invoke, expect_json
 
 
 class TaskPlannerAgent:
@@ -10,8 +11,17 @@ class TaskPlannerAgent:
     사용자의 목표를 분석하여 핵심 작업 영역을 추출하는 에이전트
     """
 
-    def __init__(self):
-        self.model = get_llm()
+    # 프롬프트를 바꾸면 올려서 이전 버전의 캐시 항목을 사용하지 않도록 함
+    PROMPT_VERSION = "v1"
+
+    def __init__(self, model=None, cache=None):
+        """
+        Args:
+            model: 사용할 채팅 모델. None이면 get_llm("task_planner")으로 생성
+            cache: 출력 캐시(LLMOutputCache). None이면 설정(LLM_CACHE_PATH)에 따르고, False이면 사용하지 않음
+        """
+        self.model = model or get_llm("task_planner")
+        self.cache = cache if cache is not None else get_llm_cache()
         self.output_parser = JsonOutputParser()
 
         self.prompt = ChatPromptTemplate.from_messages(
@@ -50,7 +60,13 @@ class TaskPlannerAgent:
         chain = self.prompt | self.model | self.output_parser
 
         try:
-            result = chain.invoke({"goal": goal})
+            result = cached_invoke(
+                chain,
+                {"goal": goal},
+                self.cache,
+                f"task_planner:{self.PROMPT_VERSION}",
+                expect_json(task_areas=list),
+            )
             return result
         except Exception as e:
             # 파싱 오류 시 기본값 반환
@@ -2,7 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from typing import Dict, List, Any
 import json
-from conf.settings import get_llm
+from conf.settings import get_llm, get_llm_cache
+from utils.llm_cache import cached_invoke, cached_batch, expect_json
 
 
 class TodoGeneratorAgent:
@@ -10,8 +11,17 @@ class TodoGeneratorAgent:
     작업 영역별로 세부 할 일 목록을 생성하는 에이전트
     """
 
-    def __init__(self):
-        self.model = get_llm()
+    # 프롬프트를 바꾸면 올려서 이전 버전의 캐시 항목을 사용하지 않도록 함
+    PROMPT_VERSION = "v2"
+
+    def __init__(self, model=None, cache=None):
+        """
+        Args:
+            model: 사용할 채팅 모델. None이면 get_llm("todo_generator")으로 생성
+            cache: 출력 캐시(LLMOutputCache). None이면 설정(LLM_CACHE_PATH)에 따르고, False이면 사용하지 않음
+        """
+        self.model = model or get_llm("todo_generator")
+        self.cache = cache if cache is not None else get_llm_cache()
         self.output_parser = JsonOutputParser()
 
         self.prompt = ChatPromptTemplate.from_messages(
@@ -47,14 +57,52 @@ class TodoGeneratorAgent:
 
 작업 영역:
 {task_areas}
-
+{feedback}
 각 영역별로 구체적인 할 일 목록을 생성해주세요.""",
                 ),
             ]
         )
 
+        # 영역 하나만 생성하는 프롬프트 (영역별 병렬 생성용)
+        self.area_prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    """당신은 목표 달성을 위한 세부 할 일 목록을 생성하는 전문가입니다.
+            
+사용자의 목표와 전체 작업 영역을 참고하여, 지정된 한 개의 작업 영역에 대한 구체적인 할 일 목록을 생성하세요.
+각 할 일은 명확하고 실행 가능해야 하며, 3-5개의 할 일을 생성하세요.
+다른 작업 영역에 속하는 할 일은 포함하지 마세요.
+
+각 할 일에는 다음 정보를 포함하세요:
+1. 제목: 간결하고 명확한 할 일 제목
+2. 설명: 필요한 경우 간략한 설명
+3. 소요 시간(일): 예상 소요 시간(일 단위)
+
+결과는 다음 JSON 형식으로 반환하세요:
+{{
+    "todos": [
+        {{"title": "할 일 제목", "description": "설명", "duration_days": 1}},
+        ...
+    ]
+}}""",
+                ),
+                (
+                    "user",
+                    """목표: {goal}
+
+전체 작업 영역:
+{task_areas}
+
+담당 작업 영역: {area}
+{feedback}
+{area} 영역의 구체적인 할 일 목록을 생성해주세요.""",
+                ),
+            ]
+        )
+
     def generate_todos(
-        self, goal: str, task_areas: List[str]
+        self, goal: str, task_areas: List[str], feedback: str = ""
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         작업 영역별로 세부 할 일 목록을 생성합니다.
@@ -62,6 +110,7 @@ class TodoGeneratorAgent:
         Args:
             goal: 사용자의 목표
             task_areas: 작업 영역 목록
+            feedback: 재생성 시 반영할 사용자 피드백
 
         Returns:
             영역별 할 일 목록이 포함된 딕셔너리
@@ -70,28 +119,94 @@ class TodoGeneratorAgent:
 
         try:
             task_areas_str = "\n".join([f"- {area}" for area in task_areas])
-            result = chain.invoke({"goal": goal, "task_areas": task_areas_str})
+            feedback_str = f"\n사용자 피드백: {feedback}\n" if feedback else ""
+            result = cached_invoke(
+                chain,
+                {"goal": goal, "task_areas": task_areas_str, "feedback": feedback_str},
+                self.cache,
+                f"todo_generator:{self.PROMPT_VERSION}",
+                expect_json(),
+            )
             return result
         except Exception as e:
             # 파싱 오류 시 기본값 반환
             print(f"Error generating todos: {e}")
-            default_todos = {}
-            for area in task_areas:
-                default_todos[area] = [
-                    {
-                        "title": f"{area} 계획 수립",
-                        "description": "기본 계획 수립",
-                        "duration_days": 1,
-                    },
-                    {
-                        "title": f"{area} 실행",
-                        "description": "계획 실행",
-                        "duration_days": 2,
-                    },
-                    {
-                        "title": f"{area} 검토",
-                        "description": "결과 검토",
-                        "duration_days": 1,
-                    },
-                ]
-            return default_todos
+            return {area: self._default_area_todos(area) for area in task_areas}
+
+    def generate_todos_by_area(
+        self,
+        goal: str,
+        task_areas: List[str],
+        max_concurrency: int = 4,
+        areas: List[str] = None,
+        feedback: str = "",
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        작업 영역마다 별도의 LLM 호출을 동시에 실행하여 할 일 목록을 생성합니다.
+
+        전체 소요 시간은 영역 수가 아니라 가장 느린 영역의 생성 시간에 가까워집니다.
+
+        Args:
+            goal: 사용자의 목표
+            task_areas: 작업 영역 목록
+            max_concurrency: 동시에 실행할 최대 LLM 호출 수
+            areas: 생성할 영역 목록. None이면 task_areas 전체를 생성
+            feedback: 재생성 시 반영할 사용자 피드백
+
+        Returns:
+            영역별 할 일 목록이 포함된 딕셔너리 (task_areas 순서 유지)
+        """
+        chain = self.area_prompt | self.model | self.output_parser
+
+        if areas is None:
+            areas = task_areas
+        task_areas_str = "\n".join([f"- {area}" for area in task_areas])
+        feedback_str = f"\n사용자 피드백: {feedback}\n" if feedback else ""
+        inputs = [
+            {
+                "goal": goal,
+                "task_areas": task_areas_str,
+                "area": area,
+                "feedback": feedback_str,
+            }
+            for area in areas
+        ]
+        results = cached_batch(
+            chain,
+            inputs,
+            self.cache,
+            f"todo_generator.area:{self.PROMPT_VERSION}",
+            expect_json(todos=list),
+            config={"max_concurrency": max_concurrency},
+        )
+
+        todos = {}
+        for area, result in zip(areas, results):
+            if isinstance(result, dict) and isinstance(result.get("todos"), list):
+                todos[area] = result["todos"]
+            else:
+                # 실패한 영역만 기본값으로 대체
+                print(f"Error generating todos for {area}: {result}")
+                todos[area] = self._default_area_todos(area)
+
+        return todos
+
+    def _default_area_todos(self, area: str) -> List[Dict[str, Any]]:
+        """파싱 오류 시 사용할 영역별 기본 할 일 목록을 반환합니다."""
+        return [
+            {
+                "title": f"{area} 계획 수립",
+                "description": "기본 계획 수립",
+                "duration_days": 1,
+            },
+            {
+                "title": f"{area} 실행",
+                "description": "계획 실행",
+                "duration_days": 2,
+            },
+            {
+                "title": f"{area} 검토",
+                "description": "결과 검토",
+                "duration_days": 1,
+            },
+        ]
@@ -1,26 +1,149 @@
 import streamlit as st
+import uuid
 from datetime import datetime
-from graph.task_graph import create_task_graph, initialize_state
-from langchain_core.callbacks import BaseCallbackHandler
+from graph.task_graph import (
+    create_task_graph,
+    initialize_state,
+    resume_with_human_input,
+)
+from utils.background_runner import BackgroundGraphRunner
+from utils.leveling import WEEKDAYS_WEEKMASK
+from utils.metrics import GraphMetricsCallbackHandler
+from utils.snapshot import load_session, restore_graph_state, save_session
+from conf.settings import config, get_snapshot_store
 
 # 페이지 설정
 st.set_page_config(page_title="AI 기반 TODO 생성기", page_icon="✅", layout="wide")
 
-# 세션 상태 초기화
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+@st.cache_resource
+def get_task_graph():
+    """
+    프로세스 전체에서 공유하는 컴파일된 그래프를 반환합니다.
+    세션별 상태는 thread_id로 구분된 체크포인트(TaskState/MCPContext)에 저장됩니다.
+    """
+    return create_task_graph()
+
+
+@st.cache_resource
+def get_background_runner():
+    """
+    프로세스 전체에서 공유하는 그래프 실행기를 반환합니다.
+    그래프는 스크립트 스레드가 아닌 작업 스레드에서 실행되며 thread_id별로 보관됩니다.
+    """
+    return BackgroundGraphRunner()
+
+
+# 스트리밍 화면에 표시할 노드별 이름
+AGENT_LABELS = {
+    "analyze_goal": "목표 분석",
+    "plan_goal": "목표 분석 및 할 일 목록 생성",
+    "generate_todos": "할 일 목록 생성",
+    "recommend_schedule": "의존성 분석",
+    "review_plan": "계획 검토",
+}
+
+# 그래프 체크포인트와 백그라운드 실행을 구분하는 세션별 thread_id
+# (URL에도 저장하여 새로 고침 후에도 같은 실행/체크포인트에 다시 연결)
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = st.query_params.get("session") or str(uuid.uuid4())
+st.query_params["session"] = st.session_state.thread_id
+
+
+def reset_metrics():
+    """현재 thread_id를 세션 식별자로 쓰는 지표 수집 콜백을 새로 만듭니다."""
+    st.session_state.metrics = GraphMetricsCallbackHandler(
+        session_id=st.session_state.thread_id,
+        export_path=config.METRICS_EXPORT_PATH or None,
+    )
 
-if "graph" not in st.session_state:
-    st.session_state.graph = None
 
-if "task_state" not in st.session_state:
+def restore_session():
+    """
+    새 세션(새로 고침 등)의 화면 상태를 진행 중인 실행, 이 프로세스의 체크포인트,
+    세션 스냅샷(서버 재시작/다른 서버) 순으로 찾아 복원합니다.
+    """
+    st.session_state.messages = []
     st.session_state.task_state = None
+    st.session_state.current_step = "goal_input"
+    st.session_state.goal = ""
+
+    graph = get_task_graph()
+    run_config = {"configurable": {"thread_id": st.session_state.thread_id}}
+    values = graph.get_state(run_config).values
+    store = get_snapshot_store()
+    snapshot = load_session(store, st.session_state.thread_id) if store and not values else None
+    if snapshot:
+        # 그래프를 다시 실행하지 않고 검토 단계 체크포인트로 되돌림
+        values = snapshot["state"]
+        if values.get("current_node") != "final_output":
+            restore_graph_state(graph, run_config, values)
+        st.session_state.task_state = values
+        st.session_state.goal = snapshot["meta"].get("goal", values.get("goal", ""))
+        st.session_state.messages = snapshot["meta"].get("messages", [])
+        st.session_state.current_step = (
+            "result" if values.get("current_node") == "final_output" else "review"
+        )
+    elif values:
+        st.session_state.task_state = values
+        st.session_state.goal = values.get("goal", "")
+        if values.get("output"):
+            st.session_state.messages.append(
+                {"role": "assistant", "content": values["output"]}
+            )
+        st.session_state.current_step = (
+            "result" if values.get("current_node") == "final_output" else "review"
+        )
 
+    run = get_background_runner().get(st.session_state.thread_id)
+    if run is not None:
+        # 진행 중이거나 결과를 아직 가져가지 않은 실행에 다시 연결
+        st.session_state.current_step = "running"
+        st.session_state.goal = run.info.get("goal", st.session_state.goal)
+
+    reset_metrics()
+
+
+def discard_thread(thread_id):
+    """
+    더 이상 쓰지 않는 세션 thread의 체크포인트, 백그라운드 실행, 스냅샷을 정리합니다.
+    (공유 그래프의 체크포인터에 버려진 세션이 남지 않도록 thread_id를 바꿀 때마다 호출)
+    """
+    get_task_graph().checkpointer.delete_thread(thread_id)
+    get_background_runner().discard(thread_id)
+    store = get_snapshot_store()
+    if store:
+        store.delete(thread_id)
+
+
+def start_new_thread():
+    """이전 세션 thread를 정리하고 새 thread_id로 바꿉니다 (지표도 새 thread 기준으로 다시 집계)."""
+    discard_thread(st.session_state.thread_id)
+    st.session_state.thread_id = str(uuid.uuid4())
+    st.query_params["session"] = st.session_state.thread_id
+    reset_metrics()
+
+
+# 세션 상태 초기화
 if "current_step" not in st.session_state:
-    st.session_state.current_step = "goal_input"
+    restore_session()
+
+
+# 세션 thread의 모든 그래프 실행에 대한 노드별 지표
+if (
+    "metrics" not in st.session_state
+    or st.session_state.metrics.session_id != st.session_state.thread_id
+):
+    reset_metrics()
+
+
+def get_graph_config(callbacks=None, **kwargs):
+    """세션의 thread_id와 지표 수집 콜백이 포함된 그래프 실행 설정을 반환합니다."""
+    return {
+        "configurable": {"thread_id": st.session_state.thread_id},
+        "callbacks": [st.session_state.metrics, *(callbacks or [])],
+        **kwargs,
+    }
 
-if "goal" not in st.session_state:
-    st.session_state.goal = ""
 
 # 헤더 및 설명
 st.title("✅ AI 기반 TODO 생성기")
@@ -43,6 +166,130 @@ with st.sidebar:
     """
     )
 
+    # 일정 평준화 설정 (새 목표를 시작할 때 적용)
+    st.markdown("### 일정 설정")
+    workers = st.number_input("작업자 수 (0이면 제한 없음)", min_value=0, value=0, step=1)
+    area_capacity = st.number_input(
+        "영역별 동시 작업 수 (0이면 제한 없음)", min_value=0, value=0, step=1
+    )
+    skip_weekends = st.checkbox("주말 제외")
+    holidays_input = st.text_input("휴일 (YYYY-MM-DD, 쉼표로 구분)")
+
+    # 노드별 실행 지표
+    metrics_summary = st.session_state.metrics.summary()
+    if metrics_summary["nodes"]:
+        with st.expander("실행 지표"):
+            st.dataframe(
+                [
+                    {
+                        "노드": node,
+                        "실행": stats["calls"],
+                        "평균 시간(ms)": round(stats["avg_wall_ms"]),
+                        "평균 TTFT(ms)": round(stats["avg_ttft_ms"]),
+                        "입력 토큰": stats["prompt_tokens"],
+                        "출력 토큰": stats["completion_tokens"],
+                        "비용(USD)": round(stats["cost_usd"], 4),
+                    }
+                    for node, stats in metrics_summary["nodes"].items()
+                ]
+            )
+            # 모델 경로(배포)별 LLM 호출 지표
+            st.dataframe(
+                [
+                    {
+                        "경로/배포": route,
+                        "LLM 호출": stats["llm_calls"],
+                        "평균 응답(ms)": round(stats["avg_llm_ms"]),
+                        "평균 TTFT(ms)": round(stats["avg_ttft_ms"]),
+                        "출력 토큰": stats["completion_tokens"],
+                        "비용(USD)": round(stats["cost_usd"], 4),
+                    }
+                    for route, stats in metrics_summary["routes"].items()
+                ]
+            )
+            st.download_button(
+                "지표 내보내기 (Prometheus)",
+                data=st.session_state.metrics.to_prometheus(),
+                file_name="task_graph_metrics.prom",
+                mime="text/plain",
+            )
+
+
+def get_schedule_preferences():
+    """사이드바 설정을 MCPContext 사용자 선호도 형식으로 반환합니다."""
+    holidays = []
+    for value in holidays_input.split(","):
+        try:
+            holidays.append(datetime.strptime(value.strip(), "%Y-%m-%d").date().isoformat())
+        except ValueError:
+            continue
+    return {
+        "workers": int(workers) or None,
+        "area_capacity": int(area_capacity) or None,
+        "weekmask": WEEKDAYS_WEEKMASK if skip_weekends else None,
+        "holidays": holidays,
+    }
+
+
+def show_messages():
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+
+@st.fragment(run_every=0.5)
+def show_run_progress():
+    """백그라운드 실행의 진행 상황을 주기적으로 가져와 표시하고, 끝나면 화면 전체를 다시 실행합니다."""
+    run = get_background_runner().get(st.session_state.thread_id)
+    if run is None or run.done:
+        st.rerun()
+    with st.chat_message("assistant"):
+        st.markdown(run.poll() or "처리 중...")
+
+
+def finish_run(run):
+    """끝난 백그라운드 실행의 결과를 대화 기록과 화면 단계에 반영합니다."""
+    get_background_runner().discard(st.session_state.thread_id)
+    if run is None:
+        # 실행 기록이 없으면 (서버 재시작 등) 체크포인트 기준으로 복원
+        restore_session()
+        return
+
+    try:
+        result = run.result()
+    except Exception as e:
+        print(f"Error running task graph: {e}")
+        st.session_state.messages.append(
+            {"role": "assistant", "content": f"처리 중 오류가 발생했습니다: {e}"}
+        )
+        st.session_state.current_step = "review" if run.kind == "resume" else "goal_input"
+        return
+
+    # 첫 실행은 에이전트별 최종 결과도 대화 기록에 남김
+    if run.kind == "start" and run.presenter.last_output:
+        st.session_state.messages.append(
+            {"role": "assistant", "content": run.presenter.last_output}
+        )
+    if result.get("output"):
+        st.session_state.messages.append({"role": "assistant", "content": result["output"]})
+
+    # 최종 출력이면 결과 단계로, 아니면 검토 단계로 이동
+    st.session_state.current_step = (
+        "result" if result.get("current_node") == "final_output" else "review"
+    )
+    st.session_state.task_state = result
+
+    # 다른 서버나 재시작 후에도 이어서 진행할 수 있도록 세션 스냅샷 저장
+    store = get_snapshot_store()
+    if store:
+        save_session(
+            store,
+            st.session_state.thread_id,
+            result,
+            {"goal": st.session_state.goal, "messages": st.session_state.messages},
+        )
+
+
 # 메인 화면
 if st.session_state.current_step == "goal_input":
     st.header("목표 입력")
@@ -53,117 +300,70 @@ if st.session_state.current_step == "goal_input":
     )
 
     if st.button("분석 시작", type="primary", disabled=not goal_input):
-        progress_placeholder = st.empty()
-        with st.spinner("목표를 분석 중입니다..."):
-            # 그래프 생성
-            st.session_state.graph = create_task_graph()
-
-            # 초기 상태 설정
-            st.session_state.task_state = initialize_state(goal_input)
-            st.session_state.goal = goal_input
-
-            # 진행 상황을 표시할 컨테이너
-            progress_container = st.container()
-
-            def handle_agent_output(output: str, agent_name: str):
-                with progress_container:
-                    with st.chat_message("assistant"):
-                        st.markdown(f"✅ **{agent_name}의 최종 분석 결과:**")
-                        st.markdown(output)
-                    st.session_state.messages.append(
-                        {
-                            "role": "assistant",
-                            "content": f"**{agent_name}의 분석 결과:**\n{output}",
-                        }
-                    )
-
-            class StreamlitCallbackHandler(BaseCallbackHandler):
-                def __init__(self):
-                    super().__init__()
-                    self.text = ""
-                    self.container = st.empty()
-                    self.current_agent = ""
-
-                def on_llm_new_token(self, token: str, **kwargs) -> None:
-                    self.text += token
-                    # Agent 정보와 함께 스트리밍 데이터 표시
-                    display_text = (
-                        f"**{self.current_agent}의 진행 중인 응답:**\n{self.text}"
-                        if self.current_agent
-                        else self.text
-                    )
-                    self.container.markdown(display_text)
-
-                def on_agent_start(self, agent: str, **kwargs) -> None:
-                    self.current_agent = agent
-                    self.text = ""  # 새로운 Agent 시작시 텍스트 초기화
-                    with st.chat_message("assistant"):
-                        st.markdown(f"�� **{agent}** 작업을 시작합니다...")
-
-                def on_agent_finish(
-                    self, output: str, agent_name: str, **kwargs
-                ) -> None:
-                    # 스트리밍 컨테이너 정리
-                    self.container.empty()
-                    # 최종 결과를 메시지에 추가
-                    handle_agent_output(output, agent_name)
-                    # 현재 Agent 정보 초기화
-                    self.current_agent = ""
-                    self.text = ""
-
-            # 그래프 실행 - 각 Agent의 결과를 실시간으로 표시
-            result = st.session_state.graph.invoke(
-                st.session_state.task_state,
-                config={"callbacks": [StreamlitCallbackHandler()]},
-            )
-
-            # 최종 상태 업데이트
-            st.session_state.current_step = "review"
-            st.session_state.task_state = result
-
-            st.rerun()
+        # 초기 상태 설정 (새 목표는 새 체크포인트 thread에서 시작하고 이전 thread는 정리)
+        start_new_thread()
+        st.session_state.task_state = initialize_state(goal_input)
+        for key, value in get_schedule_preferences().items():
+            if value:
+                st.session_state.task_state["context"].update_user_preference(key, value)
+        st.session_state.goal = goal_input
+
+        # 그래프 실행은 작업 스레드에서 진행하고 화면은 진행 상황만 표시
+        # (review_plan 이후 사용자 입력 대기 지점에서 멈춤)
+        graph = get_task_graph()
+        state = st.session_state.task_state
+        run_config = get_graph_config()
+        get_background_runner().submit(
+            st.session_state.thread_id,
+            lambda callbacks: graph.invoke(
+                state, {**run_config, "callbacks": run_config["callbacks"] + callbacks}
+            ),
+            kind="start",
+            labels=AGENT_LABELS,
+            info={"goal": goal_input},
+        )
+        st.session_state.current_step = "running"
+        st.rerun()
 
 elif st.session_state.current_step == "review":
     st.header(f"목표: {st.session_state.goal}")
 
     # 메시지 표시
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    show_messages()
 
     # 사용자 입력
     user_input = st.chat_input(
-        "수정이 필요하면 입력하세요 (예: '할일 목록을 수정해주세요', '일정을 더 여유있게 해주세요', '완료')"
+        "수정이 필요하면 입력하세요 (예: '제안 적용', '할일 목록을 수정해주세요', '일정을 더 여유있게 해주세요', '완료')"
     )
 
     if user_input:
         # 사용자 메시지 추가
         st.session_state.messages.append({"role": "user", "content": user_input})
 
-        with st.chat_message("user"):
-            st.markdown(user_input)
-
-        with st.spinner("처리 중..."):
-            # 사용자 입력 처리
-            st.session_state.task_state["human_input"] = user_input
-
-            # 그래프 실행 - 사용자 입력 처리
-            result = st.session_state.graph.invoke(st.session_state.task_state)
-
-            # 결과에서 출력 메시지 추출
-            if "output" in result and result["output"]:
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": result["output"]}
-                )
-
-            # 최종 출력이면 결과 단계로 이동
-            if result.get("current_node") == "final_output":
-                st.session_state.current_step = "result"
+        # 그래프 실행 - 저장된 체크포인트에서 사용자 입력 처리부터 이어서 실행
+        graph = get_task_graph()
+        run_config = get_graph_config()
+        get_background_runner().submit(
+            st.session_state.thread_id,
+            lambda callbacks: resume_with_human_input(
+                graph, {**run_config, "callbacks": run_config["callbacks"] + callbacks}, user_input
+            ),
+            kind="resume",
+            labels=AGENT_LABELS,
+            info={"goal": st.session_state.goal},
+        )
+        st.session_state.current_step = "running"
+        st.rerun()
 
-            # 상태 업데이트
-            st.session_state.task_state = result
+elif st.session_state.current_step == "running":
+    st.header(f"목표: {st.session_state.goal}")
+    show_messages()
 
-            st.rerun()
+    run = get_background_runner().get(st.session_state.thread_id)
+    if run is None or run.done:
+        finish_run(run)
+        st.rerun()
+    show_run_progress()
 
 elif st.session_state.current_step == "result":
     st.header(f"최종 결과: {st.session_state.goal}")
@@ -188,9 +388,9 @@ elif st.session_state.current_step == "result":
 
     # 새로운 목표 시작 버튼
     if st.button("새로운 목표 시작", type="primary"):
-        # 세션 상태 초기화
+        # 세션 상태 초기화 (공유 그래프에서 이 세션의 체크포인트 정리)
+        discard_thread(st.session_state.thread_id)
         st.session_state.messages = []
-        st.session_state.graph = None
         st.session_state.task_state = None
         st.session_state.current_step = "goal_input"
         st.session_state.goal = ""
@@ -0,0 +1,52 @@
+"""
+여러 목표의 계획을 한 번에 생성하는 배치 실행 스크립트
+
+사용법 (2nd_week 디렉터리에서):
+    python batch_plan.py goals.txt -o plans.jsonl --concurrency 8 --rpm 60 --tpm 60000
+
+goals.txt에는 한 줄에 목표 하나를 적습니다 (빈 줄은 무시).
+"""
+
+import argparse
+import asyncio
+
+from conf.settings import config
+from graph.batch_runner import run_batch
+
+
+def read_goals(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목표 목록의 계획을 배치로 생성")
+    parser.add_argument("goals_file", help="한 줄에 목표 하나가 적힌 텍스트 파일")
+    parser.add_argument("-o", "--output", default="plans.jsonl", help="결과 JSONL 파일 경로")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 실행할 최대 그래프 수")
+    parser.add_argument("--rpm", type=float, default=config.AOAI_RPM_LIMIT, help="분당 최대 요청 수")
+    parser.add_argument("--tpm", type=float, default=config.AOAI_TPM_LIMIT, help="분당 최대 토큰 수 (0이면 제한 없음)")
+    parser.add_argument("--max-retries", type=int, default=6, help="429 응답 시 최대 재시도 횟수")
+    parser.add_argument("--fused", action="store_true", help="목표 분석과 할 일 생성을 한 번의 호출로 처리")
+    args = parser.parse_args()
+
+    goals = read_goals(args.goals_file)
+    summary = asyncio.run(
+        run_batch(
+            goals,
+            args.output,
+            max_concurrency=args.concurrency,
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm or None,
+            max_retries=args.max_retries,
+            fused_planning=args.fused,
+        )
+    )
+    print(
+        f"{summary['total']}개 목표 중 {summary['total'] - summary['failed']}개 완료 "
+        f"({summary['failed']}개 실패, {summary['elapsed_s']:.1f}초) → {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+MCPContext 세션당 메모리 사용량 벤치마크
+
+사용법 (2nd_week 디렉터리에서):
+    python -m benchmarks.context_memory --tasks 1000 5000 10000
+"""
+
+import argparse
+import pickle
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any
+
+from utils.mcp_context import MCPContext
+
+
+def make_todos(task_count: int, area_count: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """벤치마크용 할 일 목록을 생성합니다."""
+    per_area = max(task_count // area_count, 1)
+    return {
+        f"영역{a}": [
+            {
+                "title": f"영역{a} 할 일 {i}",
+                "description": f"영역{a}의 {i}번째 할 일 설명",
+                "duration_days": i % 5 + 1,
+            }
+            for i in range(per_area)
+        ]
+        for a in range(area_count)
+    }
+
+
+def build_legacy_context(todos: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """이전 방식(할 일/기록 모두 딕셔너리, 기록 무제한)과 같은 구조를 만듭니다."""
+    history = []
+    todo_store: Dict[str, List[Dict[str, Any]]] = {}
+    for area, tasks in todos.items():
+        for task in tasks:
+            todo_store.setdefault(area, []).append(dict(task))
+            history.append(
+                {
+                    "role": "system",
+                    "message": f"할 일 추가 ({area}): {task['title']}",
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+    return {"todos": todo_store, "conversation_history": history}
+
+
+def build_context(todos: Dict[str, List[Dict[str, Any]]]) -> MCPContext:
+    """add_todo로 할 일을 하나씩 추가한 MCPContext를 만듭니다."""
+    context = MCPContext()
+    for area, tasks in todos.items():
+        for task in tasks:
+            context.add_todo(area, task)
+    return context
+
+
+def measure(builder, todos) -> Dict[str, Any]:
+    """builder가 만든 객체의 메모리 사용량과 pickle 크기를 측정합니다."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = builder(todos)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"obj": obj, "bytes": allocated, "pickle_bytes": len(pickle.dumps(obj))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCPContext 메모리 벤치마크")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000, 10000])
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>7} {'legacy KB':>10} {'context KB':>11} {'ratio':>6} "
+        f"{'legacy pickle KB':>17} {'context pickle KB':>18} {'snapshot ms':>12}"
+    )
+    for task_count in args.tasks:
+        todos = make_todos(task_count)
+        # 측정 대상이 아닌 입력 데이터가 먼저 메모리에 올라가도록 함
+        legacy = measure(build_legacy_context, todos)
+        current = measure(build_context, todos)
+
+        start = time.perf_counter()
+        current["obj"].get_context_dict()
+        snapshot_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"{task_count:>7} {legacy['bytes'] / 1024:>10.1f} {current['bytes'] / 1024:>11.1f} "
+            f"{current['bytes'] / legacy['bytes']:>6.2f} "
+            f"{legacy['pickle_bytes'] / 1024:>17.1f} {current['pickle_bytes'] / 1024:>18.1f} "
+            f"{snapshot_ms:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
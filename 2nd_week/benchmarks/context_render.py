@@ -0,0 +1,60 @@
+"""
+MCPContext 마크다운 렌더링 캐시 벤치마크
+
+전체 렌더링, 변경 없는 재렌더링, 한 영역만 바뀐 뒤의 재렌더링 시간을 비교합니다.
+
+사용법 (2nd_week 디렉터리에서):
+    python -m benchmarks.context_render --tasks 1000 10000
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Callable
+
+from benchmarks.context_memory import make_todos, build_context
+from utils.schedule_engine import build_schedule
+
+
+def elapsed_ms(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCPContext 렌더링 캐시 벤치마크")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>7} {'todos full ms':>14} {'todos cached ms':>16} {'todos 1 area ms':>16} "
+        f"{'schedule full ms':>17} {'schedule cached ms':>19} {'schedule same ms':>17}"
+    )
+    for task_count in args.tasks:
+        todos = make_todos(task_count)
+        context = build_context(todos)
+        start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        tasks = build_schedule(todos)["tasks"]
+        context.set_schedule(start_date, tasks)
+
+        todos_full = elapsed_ms(context.get_formatted_todos)
+        todos_cached = elapsed_ms(context.get_formatted_todos)
+        area = next(iter(todos))
+        context.set_area_todos(area, todos[area][::-1])
+        todos_one_area = elapsed_ms(context.get_formatted_todos)
+
+        schedule_full = elapsed_ms(context.get_formatted_schedule)
+        schedule_cached = elapsed_ms(context.get_formatted_schedule)
+        # 같은 일정을 다시 설정하면 행은 모두 캐시에서 재사용
+        context.set_schedule(start_date, tasks)
+        schedule_same = elapsed_ms(context.get_formatted_schedule)
+
+        print(
+            f"{task_count:>7} {todos_full:>14.2f} {todos_cached:>16.2f} {todos_one_area:>16.2f} "
+            f"{schedule_full:>17.2f} {schedule_cached:>19.2f} {schedule_same:>17.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+오프라인 벤치마크용 가짜 채팅 모델
+
+에이전트별 시스템 프롬프트를 보고 결정적인 JSON 응답을 만들며,
+첫 토큰 지연과 청크(토큰)당 지연을 설정해 스트리밍 LLM을 흉내 냅니다.
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# 에이전트 시스템 프롬프트의 식별 문구
+PLAN_GENERATOR_MARKER = "영역별 세부 할 일 목록을 생성하는 전문가"
+TASK_PLANNER_MARKER = "핵심 작업 영역을 추출하는 전문가"
+TODO_GENERATOR_MARKER = "세부 할 일 목록을 생성하는 전문가"
+SCHEDULER_MARKER = "선후 관계(의존성)를 분석하는 전문가"
+REVIEW_MARKER = "검토하는 전문가"
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    에이전트 프롬프트에 맞는 결정적 JSON을 스트리밍하는 가짜 채팅 모델.
+    area_count × todos_per_area개의 할 일이 생성됩니다.
+    """
+
+    area_count: int = 5
+    todos_per_area: int = 4
+    chunk_chars: int = 16  # 청크 하나(토큰 하나로 간주)의 글자 수
+    first_token_latency: float = 0.0  # 첫 청크까지의 지연(초)
+    token_latency: float = 0.0  # 청크당 지연(초)
+    streaming: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming-chat"
+
+    def _areas(self) -> List[str]:
+        return [f"영역{index}" for index in range(self.area_count)]
+
+    def _area_todos(self, area: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "title": f"{area} 할 일 {index}",
+                "description": f"{area}의 {index}번째 작업",
+                "duration_days": index % 5 + 1,
+            }
+            for index in range(self.todos_per_area)
+        ]
+
+    def respond(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """프롬프트에 해당하는 에이전트의 응답 JSON을 만듭니다."""
+        system = str(messages[0].content) if messages else ""
+        user = str(messages[-1].content) if messages else ""
+
+        if PLAN_GENERATOR_MARKER in system:
+            areas = self._areas()
+            return {
+                "task_areas": areas,
+                "goal_analysis": "벤치마크용 목표 분석",
+                "todos": {area: self._area_todos(area) for area in areas},
+            }
+        if TASK_PLANNER_MARKER in system:
+            return {"task_areas": self._areas(), "goal_analysis": "벤치마크용 목표 분석"}
+        if TODO_GENERATOR_MARKER in system:
+            match = re.search(r"담당 작업 영역: (.+)", user)
+            if match:
+                return {"todos": self._area_todos(match.group(1).strip())}
+            areas = re.findall(r"^- (.+)$", user, re.MULTILINE)
+            return {area: self._area_todos(area) for area in areas}
+        if SCHEDULER_MARKER in system:
+            return {"dependencies": []}
+        if REVIEW_MARKER in system:
+            return {
+                "is_sufficient": True,
+                "is_realistic": True,
+                "review_comment": "벤치마크용 검토 의견",
+                "suggestions": [],
+            }
+        return {}
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> Dict[str, int]:
+        # 대략 4글자를 1토큰으로 계산
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        output_tokens = len(text) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.streaming:
+            # ChatOpenAI와 같이 streaming=True이면 스트림을 모아 결과를 만듦
+            return generate_from_stream(self._stream(messages, stop, run_manager, **kwargs))
+        text = json.dumps(self.respond(messages), ensure_ascii=False)
+        time.sleep(self.first_token_latency + self.token_latency * (len(text) // self.chunk_chars))
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        text = json.dumps(self.respond(messages), ensure_ascii=False)
+        if self.first_token_latency:
+            time.sleep(self.first_token_latency)
+        for start in range(0, len(text), self.chunk_chars):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=text[start : start + self.chunk_chars])
+            )
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        # 마지막 청크에 토큰 사용량 포함 (stream_usage=True와 같은 형식)
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(content="", usage_metadata=self._usage(messages, text))
+        )
+
+
+def make_fake_agents(model: Optional[BaseChatModel] = None, **model_options: Any) -> Dict[str, Any]:
+    """
+    가짜 모델을 주입한 에이전트를 create_task_graph(agents=...) 형식으로 만듭니다.
+    출력 캐시는 사용하지 않습니다.
+    """
+    from agents.plan_generator import PlanGeneratorAgent
+    from agents.review_agent import ReviewAgent
+    from agents.scheduler import SchedulerAgent
+    from agents.task_planner import TaskPlannerAgent
+    from agents.todo_generator import TodoGeneratorAgent
+
+    model = model or FakeStreamingChatModel(**model_options)
+    return {
+        "task_planner": TaskPlannerAgent(model, cache=False),
+        "todo_generator": TodoGeneratorAgent(model, cache=False),
+        "scheduler": SchedulerAgent(model, cache=False),
+        "reviewer": ReviewAgent(model, cache=False),
+        "plan_generator": PlanGeneratorAgent(model, cache=False),
+    }
@@ -0,0 +1,266 @@
+"""
+TaskGraph 오프라인 벤치마크
+
+가짜 채팅 모델(FakeStreamingChatModel)을 주입한 에이전트로 create_task_graph()를 목표 입력부터
+최종 결과까지 실행하고, 할 일 수별로 다음을 측정합니다.
+
+- total_ms: 세션 전체 실행 시간
+- llm_ms: LLM 호출이 하나라도 진행 중이던 시간 (영역별 병렬 호출의 구간은 합집합으로 계산)
+- overhead_ms: 같은 실행의 전체 시간 - llm_ms (그래프/에이전트/일정 계산/렌더링 비용)
+- stream_callback_ms: StreamPresenter 스트리밍 콜백을 붙였을 때 늘어난 시간
+- render_cold_ms / render_warm_ms: MCPContext 마크다운 렌더링 시간 (캐시 없음 / 캐시 사용)
+- session_kb / peak_kb: 세션 하나(체크포인트 포함)가 유지하는 메모리와 실행 중 최대 메모리
+
+사용법 (2nd_week 디렉터리에서):
+    python -m benchmarks.graph_bench --todos 10 100 1000 10000
+    python -m benchmarks.graph_bench --json bench.json
+    python -m benchmarks.graph_bench --baseline bench.json --max-regression 20
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import pickle
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import Any, Dict, List, Optional
+
+# 가짜 모델만 사용하므로 Azure OpenAI 설정 없이도 conf.settings를 import할 수 있도록 함
+os.environ.setdefault("AOAI_API_KEY", "offline-benchmark")
+os.environ.setdefault("AOAI_ENDPOINT", "https://offline-benchmark.invalid")
+os.environ.setdefault("AOAI_API_VERSION", "2024-10-21")
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from benchmarks.fake_models import make_fake_agents
+from graph.task_graph import create_task_graph, initialize_state, resume_with_human_input
+from utils.stream_presenter import StreamPresenter, StreamPresenterCallbackHandler
+
+DEFAULT_GOAL = "벤치마크용 목표"
+
+# 기준 결과와 비교할 지표 (값이 클수록 나쁨)와 노이즈로 보는 최소 차이
+REGRESSION_METRICS = {
+    "total_ms": 5.0,
+    "overhead_ms": 5.0,
+    "stream_callback_ms": 5.0,
+    "render_cold_ms": 1.0,
+    "session_kb": 16.0,
+}
+
+
+class LLMIntervalRecorder(BaseCallbackHandler):
+    """LLM 호출마다 시작/종료 시각을 기록하고, 호출이 하나라도 진행 중이던 시간을 계산합니다."""
+
+    def __init__(self):
+        super().__init__()
+        self.intervals: List[tuple] = []
+        self._starts: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._starts[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def _end(self, run_id) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+            if start is not None:
+                self.intervals.append((start, now))
+
+    def busy_ms(self) -> float:
+        """겹치는 호출 구간을 합친 시간(ms)"""
+        busy = 0.0
+        current_start = current_end = None
+        for start, end in sorted(self.intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    busy += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            busy += current_end - current_start
+        return busy * 1000
+
+
+def area_layout(todo_count: int) -> Dict[str, int]:
+    """할 일 수를 영역 수와 영역당 할 일 수로 나눕니다 (최대 10개 영역)."""
+    area_count = min(10, max(1, todo_count // 5))
+    return {
+        "area_count": area_count,
+        "todos_per_area": math.ceil(todo_count / area_count),
+    }
+
+
+def run_session(graph, goal: str, callbacks: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """목표 입력부터 '완료'까지 한 세션을 실행하고 최종 상태를 반환합니다."""
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}, "callbacks": callbacks or []}
+    graph.invoke(initialize_state(goal), config)
+    return resume_with_human_input(graph, config, "완료")
+
+
+def timed_session(graph, goal: str, callbacks: Optional[List[Any]] = None) -> float:
+    start = time.perf_counter()
+    run_session(graph, goal, callbacks)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_memory(graph, goal: str) -> Dict[str, float]:
+    """세션 하나가 실행 후에도 유지하는 메모리와 실행 중 최대 메모리(KB)를 측정합니다."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = run_session(graph, goal)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return {"session_kb": (current - before) / 1024, "peak_kb": (peak - before) / 1024}
+
+
+def measure_render(context) -> Dict[str, float]:
+    """렌더링 캐시가 없는 사본과 캐시가 채워진 상태의 렌더링 시간을 측정합니다."""
+    fresh = pickle.loads(pickle.dumps(context))  # 렌더링 캐시는 pickle에 포함되지 않음
+    start = time.perf_counter()
+    fresh.get_formatted_todos()
+    fresh.get_formatted_schedule()
+    cold = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    fresh.get_formatted_todos()
+    fresh.get_formatted_schedule()
+    warm = (time.perf_counter() - start) * 1000
+    return {"render_cold_ms": cold, "render_warm_ms": warm}
+
+
+def benchmark(todo_count: int, args) -> Dict[str, Any]:
+    """할 일 수 하나에 대한 지표를 측정합니다. 시간 지표는 repeat번 실행한 중앙값입니다."""
+    layout = area_layout(todo_count)
+    agents = make_fake_agents(
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        chunk_chars=args.chunk_chars,
+        **layout,
+    )
+    graph = create_task_graph(agents=agents, fused_planning=args.fused)
+
+    # 워밍업 (import, 프롬프트 컴파일 등 1회성 비용 제외)
+    run_session(graph, args.goal)
+
+    base_runs, stream_runs, llm_runs, overhead_runs, render_counts = [], [], [], [], []
+    for _ in range(args.repeat):
+        base_runs.append(timed_session(graph, args.goal))
+
+        presenter = StreamPresenter(lambda markdown: None)
+        stream_runs.append(
+            timed_session(graph, args.goal, [StreamPresenterCallbackHandler(presenter)])
+        )
+        render_counts.append(presenter.render_count)
+
+        # LLM 시간과 전체 시간을 같은 실행에서 측정해야 차이가 그래프 자체 비용이 됨
+        recorder = LLMIntervalRecorder()
+        elapsed_ms = timed_session(graph, args.goal, [recorder])
+        llm_runs.append(recorder.busy_ms())
+        overhead_runs.append(elapsed_ms - recorder.busy_ms())
+
+    total_ms = statistics.median(base_runs)
+    state = run_session(graph, args.goal)
+
+    result = {
+        "todos": sum(len(tasks) for tasks in state["todos"].values()),
+        "total_ms": total_ms,
+        "llm_ms": statistics.median(llm_runs),
+        "overhead_ms": statistics.median(overhead_runs),
+        "stream_callback_ms": max(statistics.median(stream_runs) - total_ms, 0.0),
+        "stream_renders": statistics.median(render_counts),
+    }
+    result.update(measure_render(state["context"]))
+    result.update(measure_memory(graph, args.goal))
+    return result
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float) -> List[str]:
+    """기준 결과보다 max_regression(%) 넘게 나빠진 지표를 찾습니다."""
+    baseline_by_todos = {row["todos"]: row for row in baseline}
+    regressions = []
+    for row in results:
+        base = baseline_by_todos.get(row["todos"])
+        if base is None:
+            continue
+        for metric, noise in REGRESSION_METRICS.items():
+            diff = row[metric] - base[metric]
+            if diff > noise and diff > base[metric] * max_regression / 100:
+                regressions.append(
+                    f"todos={row['todos']} {metric}: {base[metric]:.1f} -> {row[metric]:.1f} "
+                    f"(+{diff / base[metric] * 100 if base[metric] else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="TaskGraph 오프라인 벤치마크")
+    parser.add_argument("--todos", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--goal", default=DEFAULT_GOAL)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--first-token-latency", type=float, default=0.0, help="첫 토큰 지연(초)")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="청크당 지연(초)")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="청크 하나의 글자 수")
+    parser.add_argument("--fused", action="store_true", help="통합 계획(plan_goal) 모드로 실행")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일 경로")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="허용 회귀 비율(%%)")
+    args = parser.parse_args()
+
+    columns = [
+        ("todos", 6, "d"),
+        ("total_ms", 10, ".1f"),
+        ("llm_ms", 9, ".1f"),
+        ("overhead_ms", 12, ".1f"),
+        ("stream_callback_ms", 19, ".1f"),
+        ("stream_renders", 15, ".0f"),
+        ("render_cold_ms", 15, ".2f"),
+        ("render_warm_ms", 15, ".3f"),
+        ("session_kb", 11, ".1f"),
+        ("peak_kb", 10, ".1f"),
+    ]
+    print(" ".join(f"{name:>{width}}" for name, width, _ in columns))
+
+    results = []
+    for todo_count in args.todos:
+        row = benchmark(todo_count, args)
+        results.append(row)
+        print(" ".join(f"{row[name]:>{width}{fmt}}" for name, width, fmt in columns))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print("\n회귀 발생:")
+            print("\n".join(f"- {line}" for line in regressions))
+            return 1
+        print("\n기준 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+계획 단계(작업 영역 + 할 일 생성) 지연 시간 벤치마크
+
+두 단계 방식(TaskPlannerAgent → TodoGeneratorAgent)과 통합 방식(PlanGeneratorAgent)의
+실행 시간을 비교합니다. 실제 LLM을 호출하므로 .env의 Azure OpenAI 설정이 필요합니다.
+
+사용법 (2nd_week 디렉터리에서):
+    python -m benchmarks.planning_latency --runs 3 --goal "포트폴리오 웹사이트 만들기"
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from graph.task_graph import get_agents
+
+DEFAULT_GOAL = "3개월 안에 포트폴리오 웹사이트 만들기"
+
+
+def two_step_plan(agents: Dict[str, Any], goal: str, max_concurrency: int) -> Dict[str, Any]:
+    """analyze_goal → generate_todos 노드와 같은 순서로 계획을 생성합니다."""
+    task_areas = agents["task_planner"].analyze_goal(goal)["task_areas"]
+    todos = agents["todo_generator"].generate_todos_by_area(
+        goal, task_areas, max_concurrency=max_concurrency
+    )
+    return {"task_areas": task_areas, "todos": todos}
+
+
+def fused_plan(agents: Dict[str, Any], goal: str, max_concurrency: int) -> Dict[str, Any]:
+    """plan_goal 노드와 같이 한 번의 호출로 계획을 생성합니다."""
+    return agents["plan_generator"].generate_plan(goal)
+
+
+def measure(plan: Callable, agents: Dict[str, Any], goal: str, runs: int, max_concurrency: int) -> Dict[str, Any]:
+    """plan을 runs번 실행하여 실행 시간(초)과 생성된 할 일 수를 수집합니다."""
+    timings: List[float] = []
+    todo_counts: List[int] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = plan(agents, goal, max_concurrency)
+        timings.append(time.perf_counter() - start)
+        todo_counts.append(sum(len(tasks) for tasks in result["todos"].values()))
+    return {"timings": timings, "todo_counts": todo_counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계획 단계 지연 시간 벤치마크")
+    parser.add_argument("--goal", default=DEFAULT_GOAL)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    agents = get_agents()
+    modes = {"two-step": two_step_plan, "fused": fused_plan}
+
+    print(f"{'mode':>9} {'mean s':>8} {'median s':>9} {'min s':>7} {'max s':>7} {'todos':>6}")
+    for name, plan in modes.items():
+        result = measure(plan, agents, args.goal, args.runs, args.max_concurrency)
+        timings = result["timings"]
+        print(
+            f"{name:>9} {statistics.mean(timings):>8.2f} {statistics.median(timings):>9.2f} "
+            f"{min(timings):>7.2f} {max(timings):>7.2f} {statistics.mean(result['todo_counts']):>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+프롬프트 직렬화 토큰 수 비교
+
+의존성 추론(SchedulerAgent)과 계획 검토(ReviewAgent) 프롬프트에 들어가는 할 일/일정 부분의
+토큰 수를 이전 형식(영역 접두사를 붙인 목록, 마크다운 할 일 목록 + 일정)과
+압축 형식(utils.prompt_codec)으로 비교합니다.
+
+tiktoken 인코딩을 불러올 수 없는 환경에서는 추정치로 계산하며 결과에 표시합니다.
+
+사용법 (2nd_week 디렉터리에서):
+    python -m benchmarks.prompt_tokens --tasks 10 100 1000 10000
+"""
+
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.context_memory import make_todos, build_context
+from utils.prompt_codec import (
+    count_tokens,
+    encode_review_plan,
+    encode_todo_titles,
+    is_token_count_exact,
+)
+from utils.schedule_engine import build_schedule
+
+
+def legacy_todo_titles(todos: Dict[str, List[Dict[str, Any]]]) -> str:
+    """이전 의존성 추론 프롬프트의 할 일 목록 형식."""
+    return "\n".join(
+        f"- [{area}] {task['title']}" for area, tasks in todos.items() for task in tasks
+    )
+
+
+def legacy_review_plan(todos: Dict[str, List[Dict[str, Any]]], schedule: Dict[str, Any]) -> str:
+    """이전 검토 프롬프트의 할 일 목록(마크다운) + 추천 일정(마크다운) 형식."""
+    context = build_context(todos)
+    context.set_schedule(schedule["start_date"], schedule["tasks"])
+    return (
+        f"할 일 목록:\n{context.get_formatted_todos()}\n\n"
+        f"추천 일정:\n{context.get_formatted_schedule()}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 직렬화 토큰 수 비교")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--model", default="gpt-4o", help="토큰 수를 셀 모델 이름")
+    args = parser.parse_args()
+
+    print(f"토큰 계산: {'tiktoken' if is_token_count_exact(args.model) else '추정치'} ({args.model})")
+    print(
+        f"{'tasks':>7} {'deps before':>12} {'deps after':>11} {'saved':>6} "
+        f"{'review before':>14} {'review after':>13} {'saved':>6}"
+    )
+    for task_count in args.tasks:
+        todos = make_todos(task_count)
+        plan = build_schedule(todos)
+        schedule = {
+            "start_date": datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+            "tasks": plan["tasks"],
+            "total_days": plan["total_days"],
+        }
+
+        deps_before = count_tokens(legacy_todo_titles(todos), args.model)
+        deps_after = count_tokens(encode_todo_titles(todos), args.model)
+        review_before = count_tokens(legacy_review_plan(todos, schedule), args.model)
+        review_after = count_tokens(encode_review_plan(todos, schedule), args.model)
+
+        print(
+            f"{task_count:>7} {deps_before:>12} {deps_after:>11} "
+            f"{1 - deps_after / deps_before:>6.0%} "
+            f"{review_before:>14} {review_after:>13} {1 - review_after / review_before:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
 # conf 패키지
-from conf.settings import get_llm, get_embeddings, config
+from conf.settings import get_llm, get_model_route, get_embeddings, config
 
-__all__ = ["get_llm", "get_embeddings", "config"]
+__all__ = ["get_llm", "get_model_route", "get_embeddings", "config"]
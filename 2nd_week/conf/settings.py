@@ -1,28 +1,83 @@
 from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Dict, Any, Optional
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from utils.llm_cache import LLMOutputCache, CACHE_TEMPERATURE
+from utils.snapshot import FileSnapshotStore, SQLiteSnapshotStore
+import openai
 
 load_dotenv()
 
+# 에이전트(경로)별 모델 설정. 경로에 없는 항목은 "default" 값을 사용
+# - deployment: Azure OpenAI 배포 이름
+# - temperature: 샘플링 temperature
+# - max_tokens: 최대 출력 토큰 수 (None이면 제한 없음)
+# - fallback: 속도 제한(429)/과부하 시 대신 호출할 배포 이름 (None이면 사용하지 않음)
+DEFAULT_MODEL_ROUTES: Dict[str, Dict[str, Any]] = {
+    "default": {"deployment": "gpt-4o", "temperature": 0.7, "max_tokens": None, "fallback": None},
+    "task_planner": {"max_tokens": 1024},
+    "todo_generator": {},
+    "plan_generator": {},
+    "scheduler": {},
+    "reviewer": {"max_tokens": 2048},
+}
+
+# 대체 배포로 전환할 오류 (클라이언트 재시도 없이 바로 전환)
+FALLBACK_EXCEPTIONS = (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError)
+
 
 class config(BaseSettings):
     AOAI_API_KEY: str
     AOAI_ENDPOINT: str
     AOAI_API_VERSION: str
+    # Azure OpenAI 배포의 분당 요청/토큰 할당량 (배치 실행 시 속도 제한 기준)
+    AOAI_RPM_LIMIT: int = 60
+    AOAI_TPM_LIMIT: int = 60000
+    # 에이전트 출력 캐시 (SQLite 파일 경로가 비어 있으면 사용하지 않음)
+    LLM_CACHE_PATH: str = ""
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    # 스트리밍 응답에 토큰 사용량 포함 (노드별 지표/TPM 집계용, API 버전 2024-09-01 이상 필요)
+    AOAI_STREAM_USAGE: bool = True
+    # 그래프 실행 지표를 추가할 JSONL 파일 경로 (비어 있으면 내보내지 않음)
+    METRICS_EXPORT_PATH: str = ""
+    # 경로별 모델 설정 재정의 (JSON, 예: {"reviewer": {"deployment": "gpt-4o-mini", "fallback": "gpt-4o"}})
+    MODEL_ROUTES: Dict[str, Dict[str, Any]] = {}
+    # 세션 스냅샷 저장소 ("sqlite": SNAPSHOT_PATH가 DB 파일, "file": SNAPSHOT_PATH가 디렉터리)
+    # SNAPSHOT_PATH가 비어 있으면 저장하지 않음
+    SNAPSHOT_BACKEND: str = "sqlite"
+    SNAPSHOT_PATH: str = ""
+    # 메모리 체크포인터에 보관할 최대 세션 수와, 사용하지 않은 세션을 정리할 시간(초)
+    CHECKPOINT_MAX_THREADS: int = 1000
+    CHECKPOINT_TTL_SECONDS: int = 6 * 3600
     # AOAI_DEPLOY_GPT4O: str
     # AOAI_EMBEDDING_DEPLOYMENT: str
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
-    def get_llm(self):
+    def get_llm(
+        self,
+        rate_limiter=None,
+        max_retries: int = 2,
+        temperature: float = 0.7,
+        deployment: str = "gpt-4o",
+        max_tokens: Optional[int] = None,
+    ):
         return AzureChatOpenAI(
             openai_api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
             # azure_deployment=self.AOAI_DEPLOY_GPT4O,
             api_version=self.AOAI_API_VERSION,
-            azure_deployment="gpt-4o",
-            temperature=0.7,
+            azure_deployment=deployment,
+            temperature=temperature,
+            max_tokens=max_tokens,
             streaming=True,
+            # 요청 전 대기할 속도 제한기, 429 등 일시적 오류의 재시도 횟수 (지수 백오프)
+            rate_limiter=rate_limiter,
+            max_retries=max_retries,
+            # 스트리밍 응답에도 토큰 사용량 포함 (지표/TPM 집계용)
+            stream_usage=self.AOAI_STREAM_USAGE,
         )
 
     def get_embeddings(self):
@@ -38,14 +93,102 @@ class config(BaseSettings):
 config = config()
 
 
-def get_llm():
+def get_model_route(route: Optional[str] = None) -> Dict[str, Any]:
+    """
+    경로의 모델 설정을 반환합니다.
+    기본 설정 → 경로 기본 설정 → MODEL_ROUTES 환경 설정 순으로 덮어씁니다.
+
+    Args:
+        route: 경로 이름 (에이전트 이름, 예: "task_planner"). None이면 "default"
+
+    Returns:
+        deployment, temperature, max_tokens, fallback 딕셔너리
+    """
+    settings = dict(DEFAULT_MODEL_ROUTES["default"])
+    settings.update(config.MODEL_ROUTES.get("default", {}))
+    if route and route != "default":
+        settings.update(DEFAULT_MODEL_ROUTES.get(route, {}))
+        settings.update(config.MODEL_ROUTES.get(route, {}))
+    return settings
+
+
+def get_llm(
+    route: Optional[str] = None,
+    rate_limiter=None,
+    max_retries: int = 2,
+    temperature: float = None,
+):
     """
     Azure OpenAI LLM 인스턴스 반환 메서드
 
+    경로 설정에 fallback이 있으면 기본 배포는 재시도 없이 호출하고,
+    속도 제한/과부하 오류가 나면 대체 배포로 다시 호출합니다.
+    호출에는 model_route 메타데이터가 붙어 지표를 경로별로 집계할 수 있습니다.
+
+    Args:
+        route: 모델 경로 이름 (get_model_route 참고). None이면 "default"
+        rate_limiter: 요청마다 acquire할 langchain BaseRateLimiter (예: TokenBucketRateLimiter)
+        max_retries: 429/5xx 응답 시 지수 백오프로 재시도할 최대 횟수
+        temperature: 샘플링 temperature. None이면 출력 캐시 사용 시 0, 아니면 경로 설정값
+
+    Returns:
+        AzureChatOpenAI 객체 (fallback이 있으면 대체 배포를 포함한 Runnable)
+    """
+    settings = get_model_route(route)
+    if temperature is None:
+        # 캐시된 출력이 그대로 재사용되므로 캐시 사용 시 결정적으로 생성
+        temperature = (
+            CACHE_TEMPERATURE if get_llm_cache() is not None else settings["temperature"]
+        )
+    options = {
+        "rate_limiter": rate_limiter,
+        "temperature": temperature,
+        "max_tokens": settings["max_tokens"],
+    }
+    fallback = settings["fallback"]
+    llm = config.get_llm(
+        deployment=settings["deployment"],
+        max_retries=0 if fallback else max_retries,
+        **options,
+    )
+    if fallback:
+        llm = llm.with_fallbacks(
+            [config.get_llm(deployment=fallback, max_retries=max_retries, **options)],
+            exceptions_to_handle=FALLBACK_EXCEPTIONS,
+        )
+    return llm.with_config(metadata={"model_route": route or "default"})
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache():
+    """
+    에이전트 출력 캐시 반환 메서드
+
+    Returns:
+        LLM_CACHE_PATH가 설정되어 있으면 LLMOutputCache 객체, 아니면 None
+    """
+    if not config.LLM_CACHE_PATH:
+        return None
+    return LLMOutputCache(
+        config.LLM_CACHE_PATH,
+        ttl_seconds=config.LLM_CACHE_TTL_SECONDS or None,
+        max_entries=config.LLM_CACHE_MAX_ENTRIES or None,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_snapshot_store():
+    """
+    세션 스냅샷 저장소 반환 메서드
+
     Returns:
-        AzureChatOpenAI 객체
+        SNAPSHOT_PATH가 설정되어 있으면 SNAPSHOT_BACKEND에 맞는 SnapshotStore 객체, 아니면 None
     """
-    return config.get_llm()
+    if not config.SNAPSHOT_PATH:
+        return None
+    if config.SNAPSHOT_BACKEND == "file":
+        return FileSnapshotStore(config.SNAPSHOT_PATH)
+    return SQLiteSnapshotStore(config.SNAPSHOT_PATH)
 
 
 def get_embeddings():
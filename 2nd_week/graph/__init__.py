@@ -1,7 +1,16 @@
 # graph 패키지
-from graph.task_graph import create_task_graph, initialize_state
+from graph.task_graph import (
+    create_task_graph,
+    get_agents,
+    initialize_state,
+    resume_with_human_input,
+)
+from graph.batch_runner import run_batch
 
 __all__ = [
     "create_task_graph",
-    "initialize_state"
+    "get_agents",
+    "initialize_state",
+    "resume_with_human_input",
+    "run_batch"
 ] 
\ No newline at end of file
@@ -0,0 +1,106 @@
+from typing import Dict, List, Any, Iterable, Optional
+from agents.task_planner import TaskPlannerAgent
+from agents.todo_generator import TodoGeneratorAgent
+from agents.scheduler import SchedulerAgent
+from agents.review_agent import ReviewAgent
+from agents.plan_generator import PlanGeneratorAgent
+from conf.settings import get_llm
+from graph.task_graph import create_task_graph, initialize_state
+from utils.rate_limiter import TokenBucketRateLimiter, RateLimitUsageCallbackHandler
+import asyncio
+import json
+import time
+
+# 배치 결과에 기록할 TaskState 필드 (MCPContext 등 직렬화할 수 없는 값 제외)
+RESULT_FIELDS = ("task_areas", "todos", "schedule", "review_result")
+
+
+def _result_record(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: state.get(field) for field in RESULT_FIELDS}
+
+
+async def run_batch(
+    goals: Iterable[str],
+    output_path: str,
+    max_concurrency: int = 8,
+    requests_per_minute: float = 60,
+    tokens_per_minute: Optional[float] = None,
+    max_retries: int = 6,
+    **graph_options: Any,
+) -> Dict[str, Any]:
+    """
+    여러 목표의 계획을 동시에 생성하여 JSONL 파일로 저장합니다.
+
+    모든 LLM 호출은 하나의 TokenBucketRateLimiter를 공유하므로 처리량은 순차 실행이 아니라
+    Azure OpenAI 할당량(RPM/TPM)에 의해 제한됩니다. 429 응답은 OpenAI 클라이언트가
+    Retry-After와 지수 백오프로 max_retries번까지 재시도합니다.
+
+    각 목표는 review_plan 이후 사용자 입력 대기 지점까지 실행되며, 결과는 완료되는 순서대로
+    {"index", "goal", "elapsed_s", "error", "task_areas", "todos", "schedule", "review_result"}
+    형식의 한 줄로 기록됩니다.
+
+    Args:
+        goals: 목표 목록
+        output_path: 결과 JSONL 파일 경로
+        max_concurrency: 동시에 실행할 최대 그래프 수
+        requests_per_minute: 분당 최대 LLM 요청 수
+        tokens_per_minute: 분당 최대 토큰 수. None이면 토큰 수는 제한하지 않음
+        max_retries: 429/5xx 응답 시 최대 재시도 횟수
+        **graph_options: create_task_graph에 전달할 옵션 (fused_planning 등)
+
+    Returns:
+        total(전체 목표 수), failed(실패 수), elapsed_s(전체 소요 시간)
+    """
+    limiter = TokenBucketRateLimiter(requests_per_minute, tokens_per_minute)
+    agent_classes = {
+        "task_planner": TaskPlannerAgent,
+        "todo_generator": TodoGeneratorAgent,
+        "scheduler": SchedulerAgent,
+        "reviewer": ReviewAgent,
+        "plan_generator": PlanGeneratorAgent,
+    }
+    # 에이전트별 모델 경로를 따르되 속도 제한기는 모두 공유
+    agents = {
+        name: agent_class(get_llm(name, rate_limiter=limiter, max_retries=max_retries))
+        for name, agent_class in agent_classes.items()
+    }
+    graph = create_task_graph(agents=agents, **graph_options)
+    usage_handler = RateLimitUsageCallbackHandler(limiter)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def plan_goal(index: int, goal: str) -> Dict[str, Any]:
+        async with semaphore:
+            thread_id = f"batch-{index}"
+            config = {"configurable": {"thread_id": thread_id}, "callbacks": [usage_handler]}
+            start = time.perf_counter()
+            record: Dict[str, Any] = {"index": index, "goal": goal, "error": None}
+            try:
+                state = await graph.ainvoke(initialize_state(goal), config)
+                record.update(_result_record(state))
+            except Exception as e:
+                print(f"Error planning goal #{index}: {e}")
+                record["error"] = str(e)
+            finally:
+                # 배치에서는 이어서 실행하지 않으므로 체크포인트 정리
+                graph.checkpointer.delete_thread(thread_id)
+            record["elapsed_s"] = round(time.perf_counter() - start, 3)
+            return record
+
+    start = time.perf_counter()
+    tasks: List[asyncio.Task] = [
+        asyncio.create_task(plan_goal(index, goal)) for index, goal in enumerate(goals)
+    ]
+    failed = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for task in asyncio.as_completed(tasks):
+            record = await task
+            failed += record["error"] is not None
+            # 일정의 datetime 등은 문자열로 기록
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+
+    return {
+        "total": len(tasks),
+        "failed": failed,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
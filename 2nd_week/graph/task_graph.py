@@ -1,10 +1,17 @@
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from typing import Dict, List, Any, TypedDict, Annotated, Literal
+from functools import lru_cache
 from agents.task_planner import TaskPlannerAgent
 from agents.todo_generator import TodoGeneratorAgent
 from agents.scheduler import SchedulerAgent
 from agents.review_agent import ReviewAgent
+from agents.plan_generator import PlanGeneratorAgent
 from utils.mcp_context import MCPContext
+from utils.review_applier import apply_suggestions, reschedule
+from utils.leveling import leveling_options
+from utils.checkpointer import BoundedMemorySaver
+from conf.settings import config as settings
 import json
 
 
@@ -21,20 +28,67 @@ class TaskState(TypedDict):
     human_input: str
     output: str
     next: str
+    affected_areas: List[str]
+    changed_areas: List[str]
 
 
-def create_task_graph():
+@lru_cache(maxsize=1)
+def get_agents() -> Dict[str, Any]:
+    """
+    프로세스 전체에서 공유하는 에이전트 인스턴스를 반환합니다.
+
+    에이전트는 LLM 클라이언트와 프롬프트만 가지며 세션별 상태는 TaskState와
+    MCPContext에 있으므로, 여러 세션과 그래프가 같은 인스턴스를 재사용합니다.
+
+    Returns:
+        에이전트 이름 → 에이전트 인스턴스
+    """
+    return {
+        "task_planner": TaskPlannerAgent(),
+        "todo_generator": TodoGeneratorAgent(),
+        "scheduler": SchedulerAgent(),
+        "reviewer": ReviewAgent(),
+        "plan_generator": PlanGeneratorAgent(),
+    }
+
+
+def create_task_graph(
+    fan_out_todos: bool = True,
+    max_concurrency: int = 4,
+    infer_dependencies: bool = False,
+    checkpointer=None,
+    agents: Dict[str, Any] = None,
+    fused_planning: bool = False,
+):
     """
     TODO 생성 및 일정 추천을 위한 LangGraph 흐름을 생성합니다.
 
+    Args:
+        fan_out_todos: True이면 작업 영역별로 TODO를 동시에 생성 (map-reduce),
+            False이면 한 번의 LLM 호출로 모든 영역을 생성
+        max_concurrency: 영역별 동시 생성 시 최대 동시 LLM 호출 수
+        infer_dependencies: True이면 일정 계산 전에 LLM으로 할 일 간 의존성을 추론
+        checkpointer: 실행 상태를 저장할 체크포인터. None이면 세션별 최근 체크포인트만 보관하는
+            메모리 체크포인터(BoundedMemorySaver, CHECKPOINT_MAX_THREADS/CHECKPOINT_TTL_SECONDS 설정) 사용
+        agents: 사용할 에이전트 (get_agents()와 같은 형식). None이면 공유 에이전트 사용
+        fused_planning: True이면 목표 분석과 TODO 생성을 한 번의 LLM 호출(plan_goal 노드)로
+            처리하고, False이면 analyze_goal → generate_todos 두 단계로 처리.
+            사용자 피드백에 따른 TODO 재생성은 두 방식 모두 generate_todos 노드를 사용
+
     Returns:
-        컴파일된 LangGraph 실행 그래프
+        컴파일된 LangGraph 실행 그래프.
+        review_plan 이후 process_human_input 직전에서 멈추며, 같은 thread_id로
+        human_input을 넣고 다시 실행하면 저장된 체크포인트부터 이어서 실행됩니다.
     """
     # 에이전트 초기화 - 싱글톤 패턴 활용
-    task_planner = TaskPlannerAgent()
-    todo_generator = TodoGeneratorAgent()
-    scheduler = SchedulerAgent()
-    reviewer = ReviewAgent()
+    agents = agents or get_agents()
+    task_planner = agents["task_planner"]
+    todo_generator = agents["todo_generator"]
+    scheduler = agents["scheduler"]
+    reviewer = agents["reviewer"]
+    plan_generator = None
+    if fused_planning:
+        plan_generator = agents.get("plan_generator") or PlanGeneratorAgent()
 
     # 그래프 생성
     graph = StateGraph(TaskState)
@@ -68,17 +122,44 @@ def create_task_graph():
         goal = state["goal"]
         task_areas = state["task_areas"]
         context = state["context"]
+        previous_todos = state.get("todos") or {}
+
+        # 사용자 피드백으로 재생성하는 경우 영향받는 영역만 다시 생성
+        replanning = state.get("current_node") == "process_human_input"
+        affected_areas = state.get("affected_areas") or []
+        if replanning and affected_areas:
+            target_areas = [area for area in task_areas if area in affected_areas]
+        else:
+            target_areas = list(task_areas)
+        feedback = state.get("human_input", "") if replanning else ""
 
         # TODO 생성
-        todos = todo_generator.generate_todos(goal, task_areas)
+        if fan_out_todos:
+            generated = todo_generator.generate_todos_by_area(
+                goal,
+                task_areas,
+                max_concurrency=max_concurrency,
+                areas=target_areas,
+                feedback=feedback,
+            )
+        else:
+            generated = todo_generator.generate_todos(goal, target_areas, feedback=feedback)
 
-        # 컨텍스트 업데이트
-        for area, tasks in todos.items():
-            for task in tasks:
-                context.add_todo(area, task)
+        # 변경되지 않은 영역은 기존 결과 재사용 (task_areas 순서 유지)
+        todos = {}
+        for area in task_areas:
+            if area in target_areas:
+                todos[area] = generated.get(area, [])
+            else:
+                todos[area] = previous_todos.get(area, [])
+
+        # 컨텍스트 업데이트 (영역 단위 교체로 중복 추가 방지)
+        for area in target_areas:
+            context.set_area_todos(area, todos[area])
 
         # 상태 업데이트
         state["todos"] = todos
+        state["changed_areas"] = target_areas
         state["current_node"] = "generate_todos"
         state["output"] = (
             f"할 일 목록을 생성했습니다:\n\n{context.get_formatted_todos()}"
@@ -86,14 +167,59 @@ def create_task_graph():
 
         return state
 
+    # 1-2. 목표 분석 + TODO 생성 통합 노드 (fused_planning)
+    def plan_goal(state: TaskState) -> TaskState:
+        goal = state["goal"]
+        context = state["context"]
+
+        # 작업 영역과 TODO를 한 번에 생성
+        result = plan_generator.generate_plan(goal)
+        task_areas = result["task_areas"]
+        todos = result["todos"]
+
+        # 응답에서 빠진 영역만 영역별 생성으로 보충
+        missing_areas = [area for area in task_areas if not todos.get(area)]
+        if missing_areas:
+            todos.update(
+                todo_generator.generate_todos_by_area(
+                    goal, task_areas, max_concurrency=max_concurrency, areas=missing_areas
+                )
+            )
+        todos = {area: todos[area] for area in task_areas}
+
+        # 컨텍스트 업데이트
+        context.set_goal(goal)
+        context.set_task_areas(task_areas)
+        for area in task_areas:
+            context.set_area_todos(area, todos[area])
+
+        # 상태 업데이트
+        state["task_areas"] = task_areas
+        state["todos"] = todos
+        state["changed_areas"] = task_areas
+        state["current_node"] = "plan_goal"
+        state["output"] = (
+            f"목표를 분석했습니다: {result['goal_analysis']}\n\n작업 영역: {', '.join(task_areas)}\n\n"
+            f"할 일 목록을 생성했습니다:\n\n{context.get_formatted_todos()}"
+        )
+
+        return state
+
     # 3. 일정 추천 노드
     def recommend_schedule(state: TaskState) -> TaskState:
         goal = state["goal"]
         todos = state["todos"]
         context = state["context"]
 
-        # 일정 추천
-        schedule_result = scheduler.recommend_schedule(goal, todos)
+        # 일정 추천 (이전 일정이 있으면 바뀐 영역만 다시 계산)
+        schedule_result = scheduler.recommend_schedule(
+            goal,
+            todos,
+            infer_dependencies=infer_dependencies,
+            previous=state.get("schedule") or None,
+            changed_areas=state.get("changed_areas"),
+            leveling=leveling_options(context.user_preferences),
+        )
 
         # 컨텍스트 업데이트
         context.set_schedule(schedule_result["start_date"], schedule_result["tasks"])
@@ -108,12 +234,9 @@ def create_task_graph():
     # 4. 검토 노드
     def review_plan(state: TaskState) -> TaskState:
         goal = state["goal"]
-        context = state["context"]
 
         # 검토
-        todos_markdown = context.get_formatted_todos()
-        schedule_markdown = context.get_formatted_schedule()
-        review_result = reviewer.review_plan(goal, todos_markdown, schedule_markdown)
+        review_result = reviewer.review_plan(goal, state["todos"], state["schedule"])
 
         # 상태 업데이트
         state["review_result"] = review_result
@@ -131,6 +254,7 @@ def create_task_graph():
                     output += f"- 제거: {suggestion['area']}에서 '{suggestion['task_title']}' 제거\n"
                 elif suggestion["type"] == "modify_duration":
                     output += f"- 수정: {suggestion['area']}의 '{suggestion['task_title']}'의 소요 시간을 {suggestion['new_duration']}일로 변경\n"
+            output += "\n'제안 적용'이라고 입력하면 개선 제안을 할 일 목록과 일정에 바로 반영합니다.\n"
 
         state["output"] = output
 
@@ -158,8 +282,22 @@ def create_task_graph():
         # 사용자 입력을 컨텍스트에 추가
         context.add_to_history("user", human_input)
 
+        # 입력에서 언급된 작업 영역 또는 할 일이 속한 영역 추출
+        affected_areas = [
+            area for area in state["task_areas"] if area.lower() in human_input
+        ]
+        for area, tasks in state["todos"].items():
+            if area not in affected_areas and any(
+                task["title"].lower() in human_input for task in tasks
+            ):
+                affected_areas.append(area)
+        state["affected_areas"] = affected_areas
+
         # 사용자 입력에 따른 다음 노드 결정
-        if "수정" in human_input or "변경" in human_input:
+        has_suggestions = bool((state.get("review_result") or {}).get("suggestions"))
+        if has_suggestions and ("적용" in human_input or "반영" in human_input):
+            state["next"] = "apply_review"
+        elif "수정" in human_input or "변경" in human_input:
             if "할일" in human_input or "todo" in human_input:
                 state["next"] = "generate_todos"
             elif "일정" in human_input or "스케줄" in human_input:
@@ -175,33 +313,78 @@ def create_task_graph():
         state["current_node"] = "process_human_input"
         return state
 
+    # 7. 검토 제안 적용 노드 (LLM 호출 없이 로컬에서 할 일과 일정 갱신)
+    def apply_review(state: TaskState) -> TaskState:
+        context = state["context"]
+        review_result = state.get("review_result") or {}
+
+        # 제안 적용
+        result = apply_suggestions(state["todos"], review_result.get("suggestions") or [])
+        todos = result["todos"]
+        changed_areas = result["changed_areas"]
+
+        # 컨텍스트 업데이트 (새 영역이 추가된 경우 작업 영역도 갱신)
+        task_areas = state["task_areas"] + [
+            area for area in todos if area not in state["task_areas"]
+        ]
+        if len(task_areas) != len(state["task_areas"]):
+            context.set_task_areas(task_areas)
+        for area in changed_areas:
+            context.set_area_todos(area, todos[area])
+
+        # 바뀐 영역만 로컬에서 다시 일정 계산
+        schedule = state["schedule"]
+        if changed_areas:
+            schedule = reschedule(
+                schedule,
+                todos,
+                changed_areas,
+                leveling=leveling_options(context.user_preferences),
+            )
+            context.set_schedule(schedule["start_date"], schedule["tasks"])
+
+        # 상태 업데이트 (적용하지 못한 제안만 남김)
+        state["task_areas"] = task_areas
+        state["todos"] = todos
+        state["schedule"] = schedule
+        state["changed_areas"] = changed_areas
+        state["review_result"] = {**review_result, "suggestions": result["skipped"]}
+        state["current_node"] = "apply_review"
+
+        # 출력 생성
+        output = "개선 제안을 반영했습니다:\n"
+        output += "".join(f"- {line}\n" for line in result["applied"]) or "- 반영된 변경 없음\n"
+        if result["skipped"]:
+            output += f"\n적용하지 못한 제안: {len(result['skipped'])}개\n"
+        output += f"\n{context.get_formatted_todos()}\n\n{context.get_formatted_schedule()}"
+        state["output"] = output
+
+        return state
+
     # 노드 추가
-    graph.add_node("analyze_goal", analyze_goal)
+    if fused_planning:
+        graph.add_node("plan_goal", plan_goal)
+    else:
+        graph.add_node("analyze_goal", analyze_goal)
     graph.add_node("generate_todos", generate_todos)
     graph.add_node("recommend_schedule", recommend_schedule)
     graph.add_node("review_plan", review_plan)
     graph.add_node("final_output", generate_final_output)
     graph.add_node("process_human_input", process_human_input)
+    graph.add_node("apply_review", apply_review)
 
     # 엣지 추가
-    graph.add_edge("analyze_goal", "generate_todos")
+    if fused_planning:
+        graph.add_edge("plan_goal", "recommend_schedule")
+    else:
+        graph.add_edge("analyze_goal", "generate_todos")
     graph.add_edge("generate_todos", "recommend_schedule")
     graph.add_edge("recommend_schedule", "review_plan")
 
-    # 초기 실행에서는 review_plan에서 종료
-    # 사용자 입력이 있을 때만 process_human_input으로 이동
-    def should_process_human_input(state: TaskState) -> str:
-        """사용자 입력이 있는지 확인하여 다음 노드 결정"""
-        if state.get("human_input", "").strip():
-            return "process_human_input"
-        else:
-            return "END"
-
-    graph.add_conditional_edges(
-        "review_plan",
-        should_process_human_input,
-        {"process_human_input": "process_human_input", "END": END},
-    )
+    # 검토 후에는 사용자 입력 처리로 이동하며, 컴파일 시 interrupt_before로
+    # process_human_input 직전에 멈춰 사용자 입력을 기다림
+    graph.add_edge("review_plan", "process_human_input")
+    graph.add_edge("apply_review", "process_human_input")
 
     # 조건부 엣지 추가
     def route_after_human_input(state: TaskState) -> str:
@@ -216,16 +399,58 @@ def create_task_graph():
             "recommend_schedule": "recommend_schedule",
             "review_plan": "review_plan",
             "final_output": "final_output",
+            "apply_review": "apply_review",
         },
     )
 
     graph.add_edge("final_output", END)
 
     # 시작 노드 설정
-    graph.set_entry_point("analyze_goal")
+    graph.set_entry_point("plan_goal" if fused_planning else "analyze_goal")
 
     # 그래프 컴파일
-    return graph.compile()
+    # MCPContext는 msgpack으로 직렬화할 수 없으므로 pickle fallback 허용
+    if checkpointer is None:
+        checkpointer = BoundedMemorySaver(
+            serde=JsonPlusSerializer(pickle_fallback=True),
+            max_threads=settings.CHECKPOINT_MAX_THREADS,
+            ttl_seconds=settings.CHECKPOINT_TTL_SECONDS,
+        )
+
+    return graph.compile(
+        checkpointer=checkpointer, interrupt_before=["process_human_input"]
+    )
+
+
+# 사용자 입력을 기다리며 멈추는 노드 (다음 노드가 process_human_input)
+PAUSE_NODES = ("review_plan", "apply_review")
+
+
+def resume_with_human_input(graph, config: Dict[str, Any], human_input: str):
+    """
+    process_human_input 직전에 멈춘 그래프에 사용자 입력을 넣고 이어서 실행합니다.
+
+    analyze_goal부터 다시 실행하지 않고, route_after_human_input이 선택한
+    노드부터만 실행됩니다.
+
+    Args:
+        graph: create_task_graph()로 생성한 그래프
+        config: thread_id가 포함된 실행 설정 (callbacks 등 포함 가능)
+        human_input: 사용자 입력
+
+    Returns:
+        다음 중단 지점 또는 종료 시점의 상태
+    """
+    checkpoint_config = {"configurable": config["configurable"]}
+    # 입력을 멈춘 노드의 기록으로 남김 (스냅샷에서 복원한 체크포인트는
+    # LangGraph가 마지막 노드를 추론할 수 없어 처음부터 다시 실행되는 것을 방지)
+    paused_node = graph.get_state(checkpoint_config).values.get("current_node")
+    graph.update_state(
+        checkpoint_config,
+        {"human_input": human_input},
+        as_node=paused_node if paused_node in PAUSE_NODES else None,
+    )
+    return graph.invoke(None, config)
 
 
 def initialize_state(goal: str) -> TaskState:
@@ -251,4 +476,6 @@ def initialize_state(goal: str) -> TaskState:
         "human_input": "",
         "output": "",
         "next": "",
+        "affected_areas": [],
+        "changed_areas": [],
     }
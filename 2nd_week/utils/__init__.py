@@ -1,6 +1,43 @@
 # utils 패키지
-from utils.mcp_context import MCPContext
+from utils.mcp_context import MCPContext, HistoryEntry, TodoRecord
+from utils.schedule_engine import build_schedule
+from utils.stream_presenter import StreamPresenter, StreamPresenterCallbackHandler
+from utils.background_runner import BackgroundGraphRunner, BackgroundRun
+from utils.checkpointer import BoundedMemorySaver
+from utils.snapshot import (
+    encode_snapshot,
+    decode_snapshot,
+    FileSnapshotStore,
+    SQLiteSnapshotStore,
+)
+from utils.leveling import level_schedule, leveling_options
+from utils.review_applier import apply_suggestions, reschedule
+from utils.metrics import GraphMetricsCallbackHandler
+from utils.rate_limiter import TokenBucketRateLimiter, RateLimitUsageCallbackHandler
+from utils.prompt_codec import encode_todo_titles, encode_review_plan, count_tokens
 
 __all__ = [
-    "MCPContext"
+    "MCPContext",
+    "HistoryEntry",
+    "TodoRecord",
+    "build_schedule",
+    "StreamPresenter",
+    "StreamPresenterCallbackHandler",
+    "BackgroundGraphRunner",
+    "BackgroundRun",
+    "BoundedMemorySaver",
+    "encode_snapshot",
+    "decode_snapshot",
+    "FileSnapshotStore",
+    "SQLiteSnapshotStore",
+    "level_schedule",
+    "leveling_options",
+    "apply_suggestions",
+    "reschedule",
+    "GraphMetricsCallbackHandler",
+    "TokenBucketRateLimiter",
+    "RateLimitUsageCallbackHandler",
+    "encode_todo_titles",
+    "encode_review_plan",
+    "count_tokens"
 ] 
\ No newline at end of file
@@ -0,0 +1,128 @@
+from typing import Dict, List, Any, Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from langchain_core.callbacks import BaseCallbackHandler
+from utils.stream_presenter import StreamPresenter, StreamPresenterCallbackHandler
+import threading
+import time
+
+
+class BackgroundRun:
+    """
+    백그라운드에서 실행 중인(또는 끝난) 그래프 실행 하나.
+    진행 상황은 StreamPresenter가 렌더링한 마크다운 중 가장 최근 것만 보관합니다.
+    화면은 최신 진행 상황만 표시하므로 중간 렌더링을 쌓아 두지 않습니다.
+    """
+
+    def __init__(self, session_id: str, kind: str = "", info: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            session_id: 실행을 구분하는 세션 키
+            kind: 실행 종류 (화면에서 결과를 처리하는 방식 구분용, 예: "start", "resume")
+            info: 다시 연결할 때 화면 복원에 필요한 부가 정보 (예: 목표)
+        """
+        self.session_id = session_id
+        self.kind = kind
+        self.info = info or {}
+        self.progress = ""  # 마지막으로 받은 진행 상황 마크다운
+        self._progress_lock = threading.Lock()
+        self.presenter = StreamPresenter(self._set_progress)
+        self.future: Optional[Future] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def poll(self) -> str:
+        """가장 최근 진행 상황을 반환합니다."""
+        with self._progress_lock:
+            return self.progress
+
+    def _set_progress(self, markdown: str) -> None:
+        # 작업 스레드에서 호출. 이전 진행 상황은 덮어씀
+        with self._progress_lock:
+            self.progress = markdown
+
+    def result(self) -> Any:
+        """실행 결과를 반환합니다. 실행 중 예외가 발생했으면 그 예외를 다시 발생시킵니다."""
+        return self.future.result()
+
+
+class BackgroundGraphRunner:
+    """
+    그래프 실행을 스크립트 스레드가 아닌 작업 스레드에서 실행하고 세션 키별로 보관하는 클래스.
+
+    세션마다 진행 중인 실행은 하나뿐이며, 같은 세션으로 다시 제출하면 새로 실행하지 않고
+    진행 중인 실행을 반환합니다. 그래서 화면을 새로 고치거나 다시 실행해도 같은 실행에
+    다시 연결됩니다. 끝난 실행은 결과를 가져가거나 retention_seconds가 지나면 정리됩니다.
+    """
+
+    def __init__(self, max_workers: int = 4, retention_seconds: float = 3600):
+        """
+        Args:
+            max_workers: 동시에 실행할 최대 그래프 수
+            retention_seconds: 결과를 가져가지 않은 끝난 실행을 보관할 시간(초)
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="task-graph"
+        )
+        self.retention_seconds = retention_seconds
+        self.runs: Dict[str, BackgroundRun] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        session_id: str,
+        func: Callable[[List[BaseCallbackHandler]], Any],
+        kind: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        info: Optional[Dict[str, Any]] = None,
+    ) -> BackgroundRun:
+        """
+        그래프 실행을 제출합니다. 세션에 진행 중인 실행이 있으면 그 실행을 반환합니다.
+
+        Args:
+            session_id: 세션 키
+            func: 진행 상황 콜백 목록을 받아 그래프를 실행하고 결과를 반환하는 함수
+                (작업 스레드에서 호출되므로 Streamlit 세션 상태에 접근하지 않아야 함)
+            kind: 실행 종류
+            labels: 그래프 노드 이름 → 진행 상황에 표시할 이름
+            info: 실행에 함께 보관할 부가 정보
+
+        Returns:
+            BackgroundRun 객체
+        """
+        with self._lock:
+            self._reap()
+            run = self.runs.get(session_id)
+            if run is not None and not run.done:
+                return run
+
+            run = BackgroundRun(session_id, kind, info)
+            handler = StreamPresenterCallbackHandler(run.presenter, labels=labels)
+            run.future = self.executor.submit(func, [handler])
+            run.future.add_done_callback(lambda _: setattr(run, "finished_at", time.time()))
+            self.runs[session_id] = run
+            return run
+
+    def get(self, session_id: str) -> Optional[BackgroundRun]:
+        """세션의 실행을 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            return self.runs.get(session_id)
+
+    def discard(self, session_id: str) -> None:
+        """결과를 처리한 세션의 실행을 정리합니다. 진행 중인 실행은 끝날 때까지 계속됩니다."""
+        with self._lock:
+            self.runs.pop(session_id, None)
+
+    def _reap(self) -> None:
+        # self._lock 안에서 호출
+        now = time.time()
+        expired = [
+            session_id
+            for session_id, run in self.runs.items()
+            if run.finished_at is not None and now - run.finished_at > self.retention_seconds
+        ]
+        for session_id in expired:
+            del self.runs[session_id]
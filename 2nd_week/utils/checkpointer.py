@@ -0,0 +1,99 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+from collections import OrderedDict
+from langgraph.checkpoint.memory import MemorySaver
+import threading
+import time
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    메모리 사용량이 세션 수에 비례해 제한되는 메모리 체크포인터.
+
+    - 스레드(세션)마다 가장 최근 체크포인트만 보관합니다. 그래프는 최근 체크포인트에서만
+      이어서 실행하므로, 슈퍼스텝마다 쌓이던 이전 체크포인트와 그 쓰기/채널 값은 바로 정리합니다.
+    - ttl_seconds 동안 사용하지 않은 스레드와, max_threads를 넘는 가장 오래 사용하지 않은
+      스레드를 정리합니다. 정리된 세션은 세션 스냅샷이 있으면 스냅샷에서 복원됩니다.
+
+    여러 작업 스레드에서 동시에 그래프를 실행하므로 모든 읽기/쓰기를 잠금으로 보호합니다.
+    """
+
+    def __init__(self, *, max_threads: int = 1000, ttl_seconds: float = 6 * 3600, **kwargs):
+        """
+        Args:
+            max_threads: 보관할 최대 스레드 수 (0이면 제한 없음)
+            ttl_seconds: 이 시간(초) 동안 사용하지 않은 스레드를 정리 (0이면 제한 없음)
+            **kwargs: MemorySaver 인자 (serde 등)
+        """
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        # (thread_id, checkpoint_ns, 채널) → 최근 체크포인트가 참조하는 채널 값 버전
+        self._channel_versions: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def get_tuple(self, config):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            if thread_id not in self.storage:
+                # 기본 구현은 없는 스레드를 조회해도 빈 항목을 만들므로 바로 반환
+                return None
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            result = super().put(config, checkpoint, metadata, new_versions)
+
+            # 이전 체크포인트와 그 체크포인트에 대한 쓰기 정리
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            for checkpoint_id in [key for key in checkpoints if key != checkpoint["id"]]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            # 새 버전으로 바뀐 채널의 이전 값 정리
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel)
+                previous = self._channel_versions.get(key)
+                if previous is not None and previous != version:
+                    self.blobs.pop((thread_id, checkpoint_ns, channel, previous), None)
+                self._channel_versions[key] = version
+
+            self._touch(thread_id)
+            self._evict(exclude=thread_id)
+            return result
+
+    def put_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        with self._lock:
+            self._touch(config["configurable"]["thread_id"])
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            super().delete_thread(thread_id)
+            self._last_used.pop(thread_id, None)
+            for key in [key for key in self._channel_versions if key[0] == thread_id]:
+                del self._channel_versions[key]
+
+    @property
+    def thread_count(self) -> int:
+        """보관 중인 스레드 수"""
+        return len(self._last_used)
+
+    def _touch(self, thread_id: str) -> None:
+        # self._lock 안에서 호출
+        self._last_used[thread_id] = time.time()
+        self._last_used.move_to_end(thread_id)
+
+    def _evict(self, exclude: Optional[str] = None) -> None:
+        # self._lock 안에서 호출. 가장 오래 사용하지 않은 스레드부터 확인
+        now = time.time()
+        for thread_id, last_used in list(self._last_used.items()):
+            over_limit = self.max_threads and len(self._last_used) > self.max_threads
+            expired = self.ttl_seconds and now - last_used > self.ttl_seconds
+            if not (over_limit or expired):
+                break
+            if thread_id != exclude:
+                self.delete_thread(thread_id)
@@ -0,0 +1,190 @@
+from typing import Dict, List, Any, Iterable, Optional, Union
+from collections import defaultdict
+from datetime import date, datetime
+import heapq
+import numpy as np
+from utils.schedule_engine import _duration_days, _resolve_title
+
+# 기본 근무일: 매일 (평준화하지 않은 일정과 같은 달력 기준)
+DEFAULT_WEEKMASK = "1111111"
+# 주말 제외 근무일: 월~금
+WEEKDAYS_WEEKMASK = "1111100"
+
+# MCPContext.user_preferences에서 일정 평준화에 사용하는 키
+LEVELING_PREFERENCE_KEYS = ("workers", "area_capacity", "weekmask", "holidays")
+
+
+def leveling_options(preferences: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    사용자 선호도에서 level_schedule 옵션을 추출합니다.
+
+    Returns:
+        설정된 옵션 딕셔너리. 관련 선호도가 하나도 없으면 None (평준화하지 않음)
+    """
+    options = {
+        key: preferences[key]
+        for key in LEVELING_PREFERENCE_KEYS
+        if preferences.get(key) not in (None, "", [], {})
+    }
+    return options or None
+
+
+def level_schedule(
+    tasks: List[Dict[str, Any]],
+    start_date: Union[datetime, date],
+    workers: Optional[int] = None,
+    area_capacity: Union[int, Dict[str, int], None] = None,
+    weekmask: str = DEFAULT_WEEKMASK,
+    holidays: Optional[Iterable[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    의존성 순서를 지키면서 할 일을 작업자 수와 영역별 동시 작업 수 안에서 배치하고,
+    근무일 기준 일정을 달력 날짜로 변환합니다.
+
+    근무일 단위로 이벤트를 진행하며 시작 가능한 할 일을 (원래 시작 오프셋, 여유 일수) 순으로
+    배치하는 리스트 스케줄링 방식이고, 근무일 → 달력 날짜 변환은 NumPy 영업일 함수로
+    한 번에 계산합니다.
+
+    Args:
+        tasks: build_schedule 결과의 tasks (title, area, duration_days, start_day_offset, depends_on 등)
+        start_date: 일정 시작일. 근무일이 아니면 다음 근무일부터 시작
+        workers: 동시에 일할 수 있는 작업자 수. None이면 제한 없음
+        area_capacity: 영역별 최대 동시 작업 수 (모든 영역에 같은 값이면 정수). None이면 제한 없음
+        weekmask: 월요일부터 7자리 근무 요일 표시 (예: "1111100")
+        holidays: 휴일 목록 (날짜 또는 "YYYY-MM-DD" 문자열)
+
+    Returns:
+        tasks(달력 기준 시작 순으로 정렬된 일정), total_days(시작일부터 마지막 종료일까지의 달력 일수),
+        working_days(전체 근무일 수)
+
+        각 할 일에는 다음 필드가 추가/갱신됩니다.
+        - start_day_offset / end_day_offset: 시작일 기준 달력 오프셋 (종료일 포함)
+        - work_start_offset: 근무일 기준 시작 오프셋
+        - earliest_start_offset: 평준화 전 시작 오프셋 (증분 재계산용)
+        - worker: 배정된 작업자 번호 (workers를 지정한 경우)
+    """
+    count = len(tasks)
+    areas = [task.get("area", "") for task in tasks]
+    durations = [_duration_days(task) for task in tasks]
+    earliest = [task.get("earliest_start_offset", task.get("start_day_offset", 0)) for task in tasks]
+    slack = [task.get("slack_days", 0) for task in tasks]
+
+    # 의존성 그래프 구성
+    by_area_title: Dict[tuple, int] = {}
+    by_title: Dict[str, int] = {}
+    for index, task in enumerate(tasks):
+        by_area_title.setdefault((areas[index], task["title"]), index)
+        by_title.setdefault(task["title"], index)
+
+    succs: List[List[int]] = [[] for _ in range(count)]
+    indegree = [0] * count
+    for index, task in enumerate(tasks):
+        for title in set(task.get("depends_on") or []):
+            pred = _resolve_title(title, areas[index], by_area_title, by_title)
+            if pred is not None and pred != index:
+                succs[pred].append(index)
+                indegree[index] += 1
+
+    # 영역별 최대 동시 작업 수 (None이면 제한 없음)
+    limits: Dict[str, Optional[int]] = {}
+    for area in set(areas):
+        value = area_capacity.get(area) if isinstance(area_capacity, dict) else area_capacity
+        limits[area] = None if value is None else max(int(value), 1)
+
+    # 시작 가능한 할 일 (우선순위 힙)과 영역 동시 작업 수 초과로 대기 중인 할 일
+    ready: List[tuple] = []
+    blocked: Dict[str, List[tuple]] = defaultdict(list)
+
+    def release(index: int) -> None:
+        heapq.heappush(ready, (earliest[index], slack[index], index))
+
+    for index in range(count):
+        if indegree[index] == 0:
+            release(index)
+
+    free_workers = list(range(max(int(workers), 1))) if workers else None
+    running_by_area: Dict[str, int] = defaultdict(int)
+    events: List[tuple] = []  # (근무일 기준 종료 오프셋, 할 일 인덱스)
+    work_start = [0] * count
+    assigned_worker: List[Optional[int]] = [None] * count
+    now = 0
+    finished = 0
+
+    while finished < count:
+        # 현재 시점에 배치할 수 있는 할 일을 우선순위 순으로 배치
+        while ready and (free_workers is None or free_workers):
+            item = heapq.heappop(ready)
+            index = item[2]
+            area = areas[index]
+            limit = limits[area]
+            if limit is not None and running_by_area[area] >= limit:
+                heapq.heappush(blocked[area], item)
+                continue
+            work_start[index] = now
+            if free_workers is not None:
+                assigned_worker[index] = heapq.heappop(free_workers)
+            running_by_area[area] += 1
+            heapq.heappush(events, (now + durations[index], index))
+
+        if not events:
+            break
+
+        # 다음 종료 시점으로 이동하여 끝난 할 일의 자원 반납 및 후속 할 일 해제
+        now = events[0][0]
+        while events and events[0][0] == now:
+            _, index = heapq.heappop(events)
+            finished += 1
+            area = areas[index]
+            running_by_area[area] -= 1
+            if blocked[area]:
+                # 영역에 자리가 났으므로 대기 중인 할 일 중 가장 우선인 것을 다시 후보로
+                heapq.heappush(ready, heapq.heappop(blocked[area]))
+            if free_workers is not None:
+                heapq.heappush(free_workers, assigned_worker[index])
+            for succ in succs[index]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    release(succ)
+
+    # 근무일 오프셋 → 달력 날짜 (벡터화)
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    base = np.datetime64(start_date, "D")
+    calendar = np.busdaycalendar(
+        weekmask=weekmask,
+        holidays=np.array(list(holidays or []), dtype="datetime64[D]"),
+    )
+    work_start_array = np.array(work_start, dtype=np.int64)
+    work_end_array = work_start_array + np.maximum(np.array(durations, dtype=np.int64), 1) - 1
+    start_offsets = (
+        np.busday_offset(base, work_start_array, roll="forward", busdaycal=calendar) - base
+    ).astype(np.int64)
+    end_offsets = (
+        np.busday_offset(base, work_end_array, roll="forward", busdaycal=calendar) - base
+    ).astype(np.int64)
+    # 소요 시간이 0인 할 일(마일스톤)은 시작일에 끝남
+    end_offsets = np.where(np.array(durations) > 0, end_offsets, start_offsets)
+
+    start_list = start_offsets.tolist()
+    end_list = end_offsets.tolist()
+    leveled_tasks = []
+    for index in sorted(range(count), key=lambda i: (start_list[i], work_start[i], i)):
+        task = {
+            **tasks[index],
+            "duration_days": durations[index],
+            "start_day_offset": start_list[index],
+            "end_day_offset": end_list[index],
+            "work_start_offset": work_start[index],
+            "earliest_start_offset": earliest[index],
+        }
+        if free_workers is not None:
+            task["worker"] = assigned_worker[index]
+        leveled_tasks.append(task)
+
+    return {
+        "tasks": leveled_tasks,
+        "total_days": max(end_list, default=-1) + 1,
+        "working_days": max(
+            (work_start[i] + durations[i] for i in range(count)), default=0
+        ),
+    }
@@ -0,0 +1,202 @@
+from typing import Dict, List, Any, Callable, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# 캐시를 사용하는 호출에 적용할 결정적 temperature
+CACHE_TEMPERATURE = 0.0
+
+
+def normalize_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    캐시 키 계산용으로 프롬프트 입력을 정규화합니다.
+    문자열은 연속 공백을 하나로 합치고 대소문자를 구분하지 않습니다.
+    """
+    return {
+        key: " ".join(value.split()).casefold() if isinstance(value, str) else value
+        for key, value in inputs.items()
+    }
+
+
+def expect_json(**field_types: type) -> Callable[[Any], bool]:
+    """
+    파싱된 JSON이 딕셔너리이고 지정한 필드가 비어 있지 않은 해당 타입인지 확인하는 검증 함수를 만듭니다.
+
+    예: expect_json(task_areas=list, goal_analysis=str)
+    """
+
+    def validate(result: Any) -> bool:
+        if not isinstance(result, dict):
+            return False
+        return all(
+            isinstance(result.get(field), field_type) and bool(result[field])
+            for field, field_type in field_types.items()
+        )
+
+    return validate
+
+
+class LLMOutputCache:
+    """
+    에이전트의 파싱된 JSON 출력을 SQLite에 저장하는 영구 캐시.
+
+    키는 에이전트/프롬프트 버전(namespace)과 정규화된 입력으로 만들며,
+    TTL이 지난 항목은 조회하지 않고, 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    여러 스레드와 프로세스(WAL 모드)에서 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로
+            ttl_seconds: 항목 유효 기간(초). None이면 만료되지 않음
+            max_entries: 최대 항목 수. None이면 제한 없음
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_output_cache (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_output_cache_last_access "
+                "ON llm_output_cache (last_access)"
+            )
+
+    @staticmethod
+    def make_key(namespace: str, inputs: Dict[str, Any]) -> str:
+        """namespace와 정규화된 입력으로 캐시 키를 만듭니다."""
+        payload = json.dumps(
+            [namespace, normalize_inputs(inputs)],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시된 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_output_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (
+                self.ttl_seconds is not None and now - row[1] > self.ttl_seconds
+            ):
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_output_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, namespace: str, value: Any) -> None:
+        """값을 저장하고 만료/초과 항목을 정리합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_output_cache "
+                "(key, namespace, value, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM llm_output_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM llm_output_cache WHERE key IN ("
+                "SELECT key FROM llm_output_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """모든 항목을 삭제합니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_output_cache")
+
+
+def cached_invoke(
+    chain,
+    inputs: Dict[str, Any],
+    cache: Optional[LLMOutputCache],
+    namespace: str,
+    validate: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    캐시에 결과가 있으면 LLM을 호출하지 않고 반환하고, 없으면 chain을 실행하여
+    검증을 통과한 결과만 저장합니다. cache가 None 또는 False이면 chain.invoke와 같습니다.
+
+    Args:
+        chain: prompt | model | JsonOutputParser 체인
+        inputs: 프롬프트 입력
+        cache: 사용할 캐시
+        namespace: 에이전트와 프롬프트 버전을 나타내는 키 접두사 (예: "task_planner:v1")
+        validate: 파싱된 결과를 저장해도 되는지 확인하는 함수
+    """
+    if not cache:
+        return chain.invoke(inputs)
+
+    key = cache.make_key(namespace, inputs)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    result = chain.invoke(inputs)
+    if validate is None or validate(result):
+        cache.set(key, namespace, result)
+    return result
+
+
+def cached_batch(
+    chain,
+    inputs: List[Dict[str, Any]],
+    cache: Optional[LLMOutputCache],
+    namespace: str,
+    validate: Optional[Callable[[Any], bool]] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """
+    chain.batch(..., return_exceptions=True)의 캐시 버전.
+    캐시에 없는 입력만 한 번의 batch로 실행하며, 결과 순서는 inputs와 같습니다.
+    """
+    if not cache:
+        return chain.batch(inputs, config=config, return_exceptions=True)
+
+    keys = [cache.make_key(namespace, item) for item in inputs]
+    results = [cache.get(key) for key in keys]
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        generated = chain.batch(
+            [inputs[index] for index in missing], config=config, return_exceptions=True
+        )
+        for index, result in zip(missing, generated):
+            results[index] = result
+            if not isinstance(result, Exception) and (validate is None or validate(result)):
+                cache.set(keys[index], namespace, result)
+    return results
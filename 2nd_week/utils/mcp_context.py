@@ -1,5 +1,80 @@
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from collections import deque
+from itertools import islice
+import time
+
+# 세션당 보관하는 최대 대화 기록 수
+DEFAULT_HISTORY_LIMIT = 200
+
+
+class HistoryEntry:
+    """대화 기록 한 건을 담는 레코드 (__slots__로 인스턴스 딕셔너리 제거)"""
+    
+    __slots__ = ("role", "message", "timestamp")
+    
+    def __init__(self, role: str, message: str, timestamp: float):
+        self.role = role
+        self.message = message
+        self.timestamp = timestamp
+        
+    def to_dict(self) -> Dict[str, str]:
+        """기존 대화 기록 형식의 딕셔너리로 변환합니다."""
+        return {
+            "role": self.role,
+            "message": self.message,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+
+class TodoRecord:
+    """
+    할 일 한 건을 담는 레코드.
+    task["title"], task.get("duration_days"), "duration_days" in task 처럼 딕셔너리와 같은 방식으로 읽을 수 있습니다.
+    """
+    
+    __slots__ = ("title", "description", "duration_days", "extra")
+    
+    FIELDS = ("title", "description", "duration_days")
+    
+    def __init__(self, title: str, description: Optional[str] = None, duration_days: Any = None, extra: Optional[Dict[str, Any]] = None):
+        self.title = title
+        self.description = description
+        self.duration_days = duration_days
+        self.extra = extra  # 그 밖의 필드가 있을 때만 딕셔너리 생성
+        
+    @classmethod
+    def from_dict(cls, task: Dict[str, Any]) -> "TodoRecord":
+        """할 일 딕셔너리(또는 TodoRecord)로부터 레코드를 만듭니다."""
+        if isinstance(task, cls):
+            return task
+        extra = {key: value for key, value in task.items() if key not in cls.FIELDS}
+        return cls(task["title"], task.get("description"), task.get("duration_days"), extra or None)
+        
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+        
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None and key not in self:
+            raise KeyError(key)
+        return value
+        
+    def __contains__(self, key: str) -> bool:
+        if key in self.FIELDS:
+            return getattr(self, key) is not None
+        return bool(self.extra) and key in self.extra
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """할 일 딕셔너리로 변환합니다."""
+        task = {key: getattr(self, key) for key in self.FIELDS if getattr(self, key) is not None}
+        if self.extra:
+            task.update(self.extra)
+        return task
+
 
 class MCPContext:
     """
@@ -7,17 +82,56 @@ class MCPContext:
     사용자의 목표, 태스크, 일정 등 컨텍스트를 유지합니다.
     """
     
-    def __init__(self):
+    def __init__(self, history_limit: int = DEFAULT_HISTORY_LIMIT):
         self.goal: str = ""
         self.task_areas: List[str] = []
-        self.todos: Dict[str, List[Dict[str, Any]]] = {}
+        self.todos: Dict[str, List[TodoRecord]] = {}
         self.schedule: Dict[str, Any] = {
             "start_date": None,
             "end_date": None,
             "tasks": []
         }
         self.user_preferences: Dict[str, Any] = {}
-        self.conversation_history: List[Dict[str, str]] = []
+        # 오래된 기록부터 버리는 고정 크기 링 버퍼
+        self.conversation_history: deque = deque(maxlen=history_limit)
+        self._reset_render_cache()
+        
+    def _reset_render_cache(self) -> None:
+        """마크다운 렌더링 캐시를 초기화합니다."""
+        self._todo_fragments: Dict[str, str] = {}  # 영역 → 렌더링된 영역 블록
+        self._formatted_todos: Optional[str] = None
+        self._schedule_lines: Dict[tuple, str] = {}  # (제목, 시작 오프셋, 종료 오프셋, 핵심 경로 여부) → 일정 행
+        self._schedule_lines_start: Optional[datetime] = None  # _schedule_lines를 만든 기준 시작일
+        self._formatted_schedule: Optional[str] = None
+        
+    def invalidate_todos(self, area: Optional[str] = None) -> None:
+        """
+        할 일 목록 렌더링 캐시를 무효화합니다.
+        self.todos를 메서드를 거치지 않고 직접 수정한 경우 호출해야 합니다.
+        
+        Args:
+            area: 바뀐 영역. None이면 모든 영역
+        """
+        if area is None:
+            self._todo_fragments.clear()
+        else:
+            self._todo_fragments.pop(area, None)
+        self._formatted_todos = None
+        
+    def invalidate_schedule(self) -> None:
+        """
+        일정 렌더링 캐시를 무효화합니다. 일정 행 캐시는 다음 렌더링에서 바뀐 행만 다시 만듭니다.
+        self.schedule을 메서드를 거치지 않고 직접 수정한 경우 호출해야 합니다.
+        """
+        self._formatted_schedule = None
+        
+    def __getstate__(self) -> Dict[str, Any]:
+        # 렌더링 캐시는 체크포인트/pickle에 포함하지 않음
+        return {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+        
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_render_cache()
         
     def set_goal(self, goal: str) -> None:
         """사용자의 목표를 설정합니다."""
@@ -33,12 +147,29 @@ class MCPContext:
         """특정 영역에 할 일을 추가합니다."""
         if area not in self.todos:
             self.todos[area] = []
-        self.todos[area].append(task)
+        self.todos[area].append(TodoRecord.from_dict(task))
+        self.invalidate_todos(area)
         self.add_to_history("system", f"할 일 추가 ({area}): {task['title']}")
         
+    def set_area_todos(self, area: str, tasks: List[Dict[str, Any]]) -> None:
+        """특정 영역의 할 일 목록을 교체합니다."""
+        self.todos[area] = [TodoRecord.from_dict(task) for task in tasks]
+        self.invalidate_todos(area)
+        self.add_to_history("system", f"할 일 목록 갱신 ({area}): {len(tasks)}개")
+        
     def set_schedule(self, start_date: datetime, tasks: List[Dict[str, Any]]) -> None:
         """일정을 설정합니다."""
-        total_days = sum(task.get("duration_days", 0) for task in tasks)
+        if tasks and all("end_day_offset" in task for task in tasks):
+            # 달력 기준으로 평준화된 일정: 마지막 종료일 기준
+            total_days = max(task["end_day_offset"] for task in tasks) + 1
+        elif all("start_day_offset" in task for task in tasks):
+            # 병렬 일정: 가장 늦게 끝나는 할 일 기준
+            total_days = max(
+                (task["start_day_offset"] + task.get("duration_days", 0) for task in tasks),
+                default=0,
+            )
+        else:
+            total_days = sum(task.get("duration_days", 0) for task in tasks)
         end_date = start_date + timedelta(days=total_days)
         
         self.schedule = {
@@ -46,6 +177,7 @@ class MCPContext:
             "end_date": end_date,
             "tasks": tasks
         }
+        self.invalidate_schedule()
         self.add_to_history("system", f"일정 설정: {start_date.strftime('%Y-%m-%d')}부터 {end_date.strftime('%Y-%m-%d')}까지")
         
     def update_user_preference(self, key: str, value: Any) -> None:
@@ -55,52 +187,94 @@ class MCPContext:
         
     def add_to_history(self, role: str, message: str) -> None:
         """대화 기록에 메시지를 추가합니다."""
-        self.conversation_history.append({
-            "role": role,
-            "message": message,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.conversation_history.append(HistoryEntry(role, message, time.time()))
         
     def get_context_dict(self) -> Dict[str, Any]:
         """전체 컨텍스트를 딕셔너리로 반환합니다."""
         return {
             "goal": self.goal,
             "task_areas": self.task_areas,
-            "todos": self.todos,
+            "todos": {area: [task.to_dict() for task in tasks] for area, tasks in self.todos.items()},
             "schedule": self.schedule,
             "user_preferences": self.user_preferences,
-            "conversation_history": self.conversation_history[-5:] if self.conversation_history else []  # 최근 5개 대화만 포함
+            "conversation_history": self.get_recent_history(5)  # 최근 5개 대화만 포함
         }
         
+    def get_recent_history(self, count: int) -> List[Dict[str, str]]:
+        """최근 대화 기록을 오래된 순으로 반환합니다."""
+        start = max(len(self.conversation_history) - count, 0)
+        return [entry.to_dict() for entry in islice(self.conversation_history, start, None)]
+        
     def get_formatted_todos(self) -> str:
-        """할 일 목록을 마크다운 형식으로 반환합니다."""
+        """할 일 목록을 마크다운 형식으로 반환합니다. 바뀐 영역만 다시 렌더링합니다."""
         if not self.todos:
             return "할 일이 없습니다."
             
-        result = []
-        for area, tasks in self.todos.items():
-            result.append(f"### {area}")
-            for task in tasks:
-                duration = f" ({task.get('duration_days', 0)}일)" if 'duration_days' in task else ""
-                result.append(f"- [ ] {task['title']}{duration}")
-            result.append("")
+        if self._formatted_todos is None:
+            fragments = []
+            for area, tasks in self.todos.items():
+                fragment = self._todo_fragments.get(area)
+                if fragment is None:
+                    fragment = self._render_area_todos(area, tasks)
+                    self._todo_fragments[area] = fragment
+                fragments.append(fragment)
+            # 삭제된 영역의 조각 정리
+            if len(self._todo_fragments) > len(self.todos):
+                self._todo_fragments = {area: self._todo_fragments[area] for area in self.todos}
+            # 마지막 영역 뒤의 빈 줄은 한 줄만 유지
+            self._formatted_todos = "".join(fragments)[:-1]
         
-        return "\n".join(result)
+        return self._formatted_todos
+        
+    @staticmethod
+    def _render_area_todos(area: str, tasks: List[TodoRecord]) -> str:
+        result = [f"### {area}"]
+        for task in tasks:
+            duration = f" ({task.get('duration_days', 0)}일)" if 'duration_days' in task else ""
+            result.append(f"- [ ] {task['title']}{duration}")
+        # 조각을 그대로 이어 붙일 수 있도록 영역 사이의 빈 줄까지 포함
+        return "\n".join(result) + "\n\n"
         
     def get_formatted_schedule(self) -> str:
-        """일정을 마크다운 형식으로 반환합니다."""
+        """일정을 마크다운 형식으로 반환합니다. 바뀐 일정 행만 다시 렌더링합니다."""
         if not self.schedule["start_date"]:
             return "일정이 없습니다."
             
+        if self._formatted_schedule is None:
+            self._formatted_schedule = self._render_schedule()
+        return self._formatted_schedule
+        
+    def _render_schedule(self) -> str:
+        start_date = self.schedule["start_date"]
+        if self._schedule_lines_start != start_date:
+            # 시작일이 바뀌면 모든 행의 날짜가 바뀜
+            self._schedule_lines = {}
+            self._schedule_lines_start = start_date
+            
         result = ["### 추천 일정"]
-        result.append(f"- 시작일: {self.schedule['start_date'].strftime('%Y-%m-%d')}")
+        result.append(f"- 시작일: {start_date.strftime('%Y-%m-%d')}")
         result.append(f"- 완료일: {self.schedule['end_date'].strftime('%Y-%m-%d')}")
         result.append("")
         
-        current_date = self.schedule["start_date"]
+        previous_lines = self._schedule_lines
+        lines: Dict[tuple, str] = {}
+        offset = 0
         for task in self.schedule["tasks"]:
-            end_date = current_date + timedelta(days=task.get("duration_days", 0) - 1)
-            result.append(f"- {current_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}: {task['title']}")
-            current_date = end_date + timedelta(days=1)
+            offset = task.get("start_day_offset", offset)
+            duration = task.get("duration_days", 0)
+            # 평준화된 일정은 주말/휴일을 건너뛴 달력 기준 종료 오프셋을 가짐
+            end_offset = task.get("end_day_offset", offset + duration - 1)
+            key = (task["title"], offset, end_offset, bool(task.get("critical")))
+            line = previous_lines.get(key)
+            if line is None:
+                current_date = start_date + timedelta(days=offset)
+                end_date = start_date + timedelta(days=end_offset)
+                critical = " (핵심 경로)" if key[3] else ""
+                line = f"- {current_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}: {task['title']}{critical}"
+            lines[key] = line
+            result.append(line)
+            offset += duration
             
-        return "\n".join(result) 
\ No newline at end of file
+        # 현재 일정에 남아 있는 행만 보관
+        self._schedule_lines = lines
+        return "\n".join(result)
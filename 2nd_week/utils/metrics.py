@@ -0,0 +1,268 @@
+from typing import Dict, List, Any, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from datetime import datetime
+import json
+import threading
+import time
+
+# 모델별 토큰 가격 (USD / 1M 토큰): (입력, 출력)
+PRICES_PER_MILLION_TOKENS = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+DEFAULT_MODEL = "gpt-4o"
+
+# 노드별로 합산하는 지표
+STAT_FIELDS = (
+    "calls",
+    "wall_ms",
+    "llm_calls",
+    "llm_ms",
+    "ttft_ms",
+    "ttft_count",
+    "prompt_tokens",
+    "completion_tokens",
+    "cost_usd",
+)
+
+
+def _empty_stats() -> Dict[str, float]:
+    return {field: 0 for field in STAT_FIELDS}
+
+
+def _add_stats(target: Dict[str, float], values: Dict[str, float]) -> None:
+    for field, value in values.items():
+        target[field] += value
+
+
+def _token_usage(response: Any) -> Tuple[int, int]:
+    """LLMResult에서 (입력 토큰 수, 출력 토큰 수)를 찾습니다. 없으면 (0, 0)을 반환합니다."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage.get("prompt_tokens") or usage.get("completion_tokens"):
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    for generations in response.generations:
+        for generation in generations:
+            usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage_metadata:
+                return usage_metadata.get("input_tokens", 0), usage_metadata.get("output_tokens", 0)
+    return 0, 0
+
+
+def _with_averages(stats: Dict[str, float]) -> Dict[str, float]:
+    """합산 지표에 평균 지표를 더한 사본을 반환합니다."""
+    result = dict(stats)
+    result["avg_wall_ms"] = stats["wall_ms"] / stats["calls"] if stats["calls"] else 0.0
+    result["avg_ttft_ms"] = stats["ttft_ms"] / stats["ttft_count"] if stats["ttft_count"] else 0.0
+    result["avg_llm_ms"] = stats["llm_ms"] / stats["llm_calls"] if stats["llm_calls"] else 0.0
+    return result
+
+
+class GraphMetricsCallbackHandler(BaseCallbackHandler):
+    """
+    그래프 실행의 노드별 실행 시간, 첫 토큰까지의 시간(TTFT), 토큰 수와 비용을 집계하는 핸들러.
+
+    세션마다 하나를 만들어 그 세션의 모든 그래프 실행(invoke/재개)에 callbacks로 전달하면
+    실행(run)별 기록과 세션 전체 합계를 함께 유지합니다.
+    LLM 호출은 LangGraph가 붙이는 langgraph_node 메타데이터로 노드에 귀속되고,
+    get_llm()이 붙이는 model_route 메타데이터와 실제 호출된 배포 이름으로 경로별로도 집계됩니다.
+    """
+
+    def __init__(
+        self,
+        session_id: str = "",
+        model: str = DEFAULT_MODEL,
+        export_path: Optional[str] = None,
+        max_runs: int = 50,
+    ):
+        """
+        Args:
+            session_id: 지표에 붙일 세션 식별자
+            model: 비용 계산에 사용할 모델 이름 (PRICES_PER_MILLION_TOKENS의 키)
+            export_path: 실행이 끝날 때마다 실행 기록을 한 줄씩 추가할 JSONL 파일 경로
+            max_runs: 보관할 최근 실행 기록 수
+        """
+        super().__init__()
+        self.session_id = session_id
+        self.prices = PRICES_PER_MILLION_TOKENS.get(model, PRICES_PER_MILLION_TOKENS[DEFAULT_MODEL])
+        self.export_path = export_path
+        self.max_runs = max_runs
+        self.nodes: Dict[str, Dict[str, float]] = {}  # 세션 전체 노드별 합계
+        self.routes: Dict[str, Dict[str, float]] = {}  # 세션 전체 "경로/배포"별 LLM 합계
+        self.runs: List[Dict[str, Any]] = []  # 최근 실행 기록
+        self.current_run: Optional[Dict[str, Any]] = None
+        self._root_run_id = None
+        self._node_runs: Dict[Any, Tuple[str, float]] = {}
+        self._llm_runs: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, node: str, values: Dict[str, float], route: Optional[str] = None) -> None:
+        # self._lock 안에서 호출
+        _add_stats(self.nodes.setdefault(node, _empty_stats()), values)
+        if route is not None:
+            _add_stats(self.routes.setdefault(route, _empty_stats()), values)
+        if self.current_run is not None:
+            _add_stats(self.current_run["nodes"].setdefault(node, _empty_stats()), values)
+            if route is not None:
+                _add_stats(self.current_run["routes"].setdefault(route, _empty_stats()), values)
+
+    # 그래프/노드 실행
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        now = time.perf_counter()
+        node = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            if parent_run_id is None:
+                self._root_run_id = run_id
+                self.current_run = {
+                    "session_id": self.session_id,
+                    "run_id": str(run_id),
+                    "started_at": datetime.now().isoformat(),
+                    "wall_ms": 0.0,
+                    "nodes": {},
+                    "routes": {},
+                    "_start": now,
+                }
+            elif node and kwargs.get("name") == node:
+                self._node_runs[run_id] = (node, now)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end_chain(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end_chain(run_id)
+
+    def _end_chain(self, run_id) -> None:
+        now = time.perf_counter()
+        finished = None
+        with self._lock:
+            node_run = self._node_runs.pop(run_id, None)
+            if node_run is not None:
+                node, start = node_run
+                self._record(node, {"calls": 1, "wall_ms": (now - start) * 1000})
+            elif run_id == self._root_run_id and self.current_run is not None:
+                finished = self.current_run
+                finished["wall_ms"] = (now - finished.pop("_start")) * 1000
+                self.runs.append(finished)
+                del self.runs[: -self.max_runs]
+                self.current_run = None
+                self._root_run_id = None
+        if finished is not None and self.export_path:
+            self.export_run(finished)
+
+    # LLM 호출
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, metadata)
+
+    def _start_llm(self, run_id, metadata) -> None:
+        metadata = metadata or {}
+        # 대체 배포(fallback)로 전환된 호출도 구분되도록 실제 호출된 배포 이름 사용
+        deployment = metadata.get("ls_model_name", "")
+        route = metadata.get("model_route", "default")
+        with self._lock:
+            self._llm_runs[run_id] = {
+                "node": metadata.get("langgraph_node", ""),
+                "route": f"{route}/{deployment}" if deployment else route,
+                "prices": PRICES_PER_MILLION_TOKENS.get(deployment, self.prices),
+                "start": time.perf_counter(),
+                "first_token": None,
+            }
+
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs) -> None:
+        llm_run = self._llm_runs.get(run_id)
+        if llm_run is not None and llm_run["first_token"] is None:
+            llm_run["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        prompt_tokens, completion_tokens = _token_usage(response)
+        self._end_llm(run_id, prompt_tokens, completion_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end_llm(run_id, 0, 0)
+
+    def _end_llm(self, run_id, prompt_tokens: int, completion_tokens: int) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            llm_run = self._llm_runs.pop(run_id, None)
+            if llm_run is None:
+                return
+            prices = llm_run["prices"]
+            values = {
+                "llm_calls": 1,
+                "llm_ms": (now - llm_run["start"]) * 1000,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000,
+            }
+            if llm_run["first_token"] is not None:
+                values["ttft_ms"] = (llm_run["first_token"] - llm_run["start"]) * 1000
+                values["ttft_count"] = 1
+            self._record(llm_run["node"], values, llm_run["route"])
+
+    # 집계/내보내기
+    def summary(self) -> Dict[str, Any]:
+        """세션 전체의 노드별/경로별 지표와 합계를 반환합니다."""
+        with self._lock:
+            nodes = {node: _with_averages(stats) for node, stats in self.nodes.items()}
+            routes = {route: _with_averages(stats) for route, stats in self.routes.items()}
+            totals = _empty_stats()
+            for stats in self.nodes.values():
+                _add_stats(totals, stats)
+            runs = len(self.runs)
+        return {
+            "session_id": self.session_id,
+            "runs": runs,
+            "nodes": nodes,
+            "routes": routes,
+            "totals": _with_averages(totals),
+        }
+
+    def export_run(self, run: Dict[str, Any]) -> None:
+        """실행 기록 한 건을 export_path에 JSONL로 추가합니다."""
+        record = {
+            **run,
+            "nodes": {node: _with_averages(stats) for node, stats in run["nodes"].items()},
+            "routes": {route: _with_averages(stats) for route, stats in run["routes"].items()},
+        }
+        try:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Error exporting metrics: {e}")
+
+    def to_prometheus(self, prefix: str = "task_graph") -> str:
+        """세션 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+        summary = self.summary()
+        metrics = [
+            ("node_calls_total", "calls", 1),
+            ("node_wall_seconds_total", "wall_ms", 1 / 1000),
+            ("node_llm_calls_total", "llm_calls", 1),
+            ("node_llm_seconds_total", "llm_ms", 1 / 1000),
+            ("node_ttft_seconds_total", "ttft_ms", 1 / 1000),
+            ("node_prompt_tokens_total", "prompt_tokens", 1),
+            ("node_completion_tokens_total", "completion_tokens", 1),
+            ("node_cost_usd_total", "cost_usd", 1),
+        ]
+        lines = []
+        for name, field, scale in metrics:
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for node, stats in summary["nodes"].items():
+                lines.append(
+                    f'{prefix}_{name}{{session="{self.session_id}",node="{node}"}} {stats[field] * scale:g}'
+                )
+        route_metrics = [
+            ("route_llm_calls_total", "llm_calls", 1),
+            ("route_llm_seconds_total", "llm_ms", 1 / 1000),
+            ("route_ttft_seconds_total", "ttft_ms", 1 / 1000),
+            ("route_prompt_tokens_total", "prompt_tokens", 1),
+            ("route_completion_tokens_total", "completion_tokens", 1),
+            ("route_cost_usd_total", "cost_usd", 1),
+        ]
+        for name, field, scale in route_metrics:
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for route, stats in summary["routes"].items():
+                lines.append(
+                    f'{prefix}_{name}{{session="{self.session_id}",route="{route}"}} {stats[field] * scale:g}'
+                )
+        return "\n".join(lines) + "\n"
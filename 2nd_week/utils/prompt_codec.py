@@ -0,0 +1,99 @@
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+from functools import lru_cache
+
+DEFAULT_TOKEN_MODEL = "gpt-4o"
+
+
+def encode_todo_titles(todos: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    할 일 제목만 영역별로 묶어 직렬화합니다 (의존성 추론용).
+
+    예:
+        [영역A]
+        할 일 1
+        할 일 2
+    """
+    lines = []
+    for area, tasks in todos.items():
+        lines.append(f"[{area}]")
+        lines.extend(task["title"] for task in tasks)
+    return "\n".join(lines)
+
+
+def encode_review_plan(
+    todos: Dict[str, List[Dict[str, Any]]], schedule: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    할 일 목록과 일정을 검토에 필요한 필드만 담은 압축 표로 직렬화합니다.
+
+    할 일마다 제목을 한 번만 쓰고, 날짜 대신 시작일 기준 일차(D+n)를 사용합니다.
+    설명은 검토에 쓰이지 않으므로 포함하지 않습니다.
+
+    예:
+        시작일 2025-01-06, 전체 12일. 형식: 제목|소요일|D+시작~종료|핵심 경로 여부(*)
+        [영역A]
+        할 일 1|3|0~2|*
+        할 일 2|2|3~4
+    """
+    schedule = schedule or {}
+    scheduled = {
+        (task.get("area", ""), task["title"]): task for task in schedule.get("tasks") or []
+    }
+
+    start_date = schedule.get("start_date")
+    if isinstance(start_date, datetime):
+        start_date = start_date.strftime("%Y-%m-%d")
+    if start_date:
+        header = f"시작일 {start_date}, 전체 {schedule.get('total_days', 0)}일. "
+    else:
+        header = "일정 없음. "
+    lines = [header + "형식: 제목|소요일|D+시작~종료|핵심 경로 여부(*)"]
+
+    for area, tasks in todos.items():
+        lines.append(f"[{area}]")
+        for task in tasks:
+            row = f"{task['title']}|{task.get('duration_days', '')}"
+            item = scheduled.get((area, task["title"]))
+            if item is not None:
+                start = item.get("start_day_offset", 0)
+                end = item.get("end_day_offset", start + max(item.get("duration_days", 0), 1) - 1)
+                row += f"|{start}~{end}"
+                if item.get("critical"):
+                    row += "|*"
+            lines.append(row)
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    # tiktoken은 처음 토큰 수를 셀 때만 불러옴 (인코딩 파일 다운로드 포함)
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        print(f"Error loading tiktoken encoding, using estimate: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """tiktoken을 쓸 수 없을 때의 토큰 수 추정치 (ASCII 4글자당 1토큰, 그 외 글자당 1토큰)."""
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def count_tokens(text: str, model: str = DEFAULT_TOKEN_MODEL) -> int:
+    """
+    모델 토크나이저 기준 토큰 수를 반환합니다.
+    tiktoken이 없거나 인코딩을 불러올 수 없으면 estimate_tokens 추정치를 반환합니다.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text))
+
+
+def is_token_count_exact(model: str = DEFAULT_TOKEN_MODEL) -> bool:
+    """count_tokens가 실제 토크나이저를 사용하는지 여부."""
+    return _encoding(model) is not None
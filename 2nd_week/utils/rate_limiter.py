@@ -0,0 +1,122 @@
+from typing import Any, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+import asyncio
+import threading
+import time
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 제한하는 토큰 버킷 속도 제한기.
+
+    채팅 모델의 rate_limiter로 지정하면 요청마다 acquire가 호출되며, 여러 스레드와
+    이벤트 루프에서 같은 인스턴스를 공유할 수 있습니다. 요청 전에는 실제 사용 토큰 수를
+    알 수 없으므로 estimated_tokens_per_request만큼 미리 차감하고, 응답 후
+    RateLimitUsageCallbackHandler가 실제 사용량과의 차이를 정산합니다.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        estimated_tokens_per_request: int = 1500,
+        burst_seconds: float = 10.0,
+        check_every_n_seconds: float = 0.1,
+    ):
+        """
+        Args:
+            requests_per_minute: 분당 최대 요청 수
+            tokens_per_minute: 분당 최대 토큰 수. None이면 토큰 수는 제한하지 않음
+            estimated_tokens_per_request: 요청마다 미리 차감할 예상 토큰 수
+            burst_seconds: 버킷 용량 (이 시간 동안 채워지는 양만큼만 한 번에 사용 가능).
+                Azure OpenAI는 할당량을 1~10초 단위로도 검사하므로 분 단위 버스트를 막음
+            check_every_n_seconds: 대기 중 버킷을 다시 확인하는 간격(초)
+        """
+        self.requests_per_second = requests_per_minute / 60
+        self.tokens_per_second = tokens_per_minute / 60 if tokens_per_minute else None
+        self.estimated_tokens_per_request = estimated_tokens_per_request
+        self.check_every_n_seconds = check_every_n_seconds
+
+        self.max_requests = max(self.requests_per_second * burst_seconds, 1.0)
+        self.max_tokens = (
+            max(self.tokens_per_second * burst_seconds, estimated_tokens_per_request)
+            if self.tokens_per_second
+            else None
+        )
+        # 처음부터 최대 용량을 쓰지 않도록 한 요청 분량만 채운 상태로 시작
+        self._requests = 1.0
+        self._tokens = float(estimated_tokens_per_request)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        self._requests = min(self.max_requests, self._requests + elapsed * self.requests_per_second)
+        if self.tokens_per_second:
+            self._tokens = min(self.max_tokens, self._tokens + elapsed * self.tokens_per_second)
+
+    def _consume(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._requests < 1:
+                return False
+            if self.tokens_per_second and self._tokens < self.estimated_tokens_per_request:
+                return False
+            self._requests -= 1
+            if self.tokens_per_second:
+                self._tokens -= self.estimated_tokens_per_request
+            return True
+
+    def record_usage(self, total_tokens: int) -> None:
+        """
+        응답의 실제 토큰 사용량으로 미리 차감한 예상치를 정산합니다.
+        예상보다 많이 쓴 만큼은 버킷이 음수가 되어 다음 요청이 그만큼 더 기다립니다.
+        """
+        if not self.tokens_per_second:
+            return
+        with self._lock:
+            self._tokens -= total_tokens - self.estimated_tokens_per_request
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._consume()
+        while not self._consume():
+            time.sleep(self.check_every_n_seconds)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._consume()
+        while not self._consume():
+            await asyncio.sleep(self.check_every_n_seconds)
+        return True
+
+
+def _total_tokens(response: Any) -> Optional[int]:
+    """LLMResult에서 전체 토큰 사용량을 찾습니다. 없으면 None을 반환합니다."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage_metadata = getattr(message, "usage_metadata", None)
+            if usage_metadata:
+                return usage_metadata.get("total_tokens")
+    return None
+
+
+class RateLimitUsageCallbackHandler(BaseCallbackHandler):
+    """LLM 응답의 토큰 사용량을 TokenBucketRateLimiter에 정산하는 핸들러"""
+
+    def __init__(self, limiter: TokenBucketRateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        total_tokens = _total_tokens(response)
+        if total_tokens is not None:
+            self.limiter.record_usage(total_tokens)
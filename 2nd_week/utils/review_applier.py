@@ -0,0 +1,161 @@
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
+from utils.schedule_engine import build_schedule
+from utils.leveling import level_schedule
+
+
+def _normalize_title(title: Any) -> str:
+    """공백과 대소문자 차이를 무시하고 할 일 제목을 비교하기 위한 키"""
+    return " ".join(str(title).split()).lower()
+
+
+def _find_task(
+    todos: Dict[str, List[Dict[str, Any]]], area: Optional[str], title: Any
+) -> Optional[Tuple[str, int]]:
+    """제목으로 할 일을 찾습니다. 지정된 영역을 먼저 찾고 없으면 다른 영역에서 찾습니다."""
+    key = _normalize_title(title)
+    areas = list(todos)
+    if area in todos:
+        areas.remove(area)
+        areas.insert(0, area)
+    for candidate in areas:
+        for index, task in enumerate(todos[candidate]):
+            if _normalize_title(task["title"]) == key:
+                return candidate, index
+    return None
+
+
+def _valid_duration(value: Any) -> bool:
+    try:
+        return float(value) >= 0
+    except (TypeError, ValueError):
+        return False
+
+
+def apply_suggestions(
+    todos: Dict[str, List[Dict[str, Any]]], suggestions: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    ReviewAgent의 개선 제안(add, remove, modify_duration)을 할 일 목록에 적용합니다.
+
+    원래 목록은 바꾸지 않고 바뀐 영역만 복사한 새 목록을 반환합니다.
+
+    Args:
+        todos: 영역별 할 일 목록
+        suggestions: ReviewAgent.review_plan 결과의 suggestions
+
+    Returns:
+        todos(제안을 적용한 할 일 목록), changed_areas(바뀐 영역),
+        applied(적용한 제안 설명), skipped(적용하지 못한 제안)
+    """
+    new_todos = dict(todos)
+    copied = set()
+    changed_areas: List[str] = []
+    applied: List[str] = []
+    skipped: List[Dict[str, Any]] = []
+
+    def edit(area: str) -> List[Dict[str, Any]]:
+        # 처음 바뀌는 영역만 목록을 복사
+        if area not in copied:
+            new_todos[area] = list(new_todos.get(area, []))
+            copied.add(area)
+        if area not in changed_areas:
+            changed_areas.append(area)
+        return new_todos[area]
+
+    for suggestion in suggestions:
+        kind = suggestion.get("type")
+        area = suggestion.get("area")
+
+        if kind == "add":
+            task = suggestion.get("task") or {}
+            if not task.get("title"):
+                skipped.append(suggestion)
+                continue
+            area = area or next(iter(new_todos), "기타")
+            if area in new_todos and any(
+                _normalize_title(t["title"]) == _normalize_title(task["title"])
+                for t in new_todos[area]
+            ):
+                # 이미 있는 할 일은 중복 추가하지 않음
+                skipped.append(suggestion)
+                continue
+            edit(area).append(dict(task))
+            applied.append(f"추가: {area}에 '{task['title']}' 추가")
+
+        elif kind == "remove":
+            found = _find_task(new_todos, area, suggestion.get("task_title", ""))
+            if found is None:
+                skipped.append(suggestion)
+                continue
+            area, index = found
+            removed = edit(area).pop(index)
+            applied.append(f"제거: {area}에서 '{removed['title']}' 제거")
+
+        elif kind == "modify_duration":
+            found = _find_task(new_todos, area, suggestion.get("task_title", ""))
+            new_duration = suggestion.get("new_duration")
+            if found is None or not _valid_duration(new_duration):
+                skipped.append(suggestion)
+                continue
+            area, index = found
+            tasks = edit(area)
+            tasks[index] = {**tasks[index], "duration_days": new_duration}
+            applied.append(
+                f"수정: {area}의 '{tasks[index]['title']}' 소요 시간을 {new_duration}일로 변경"
+            )
+
+        else:
+            skipped.append(suggestion)
+
+    return {
+        "todos": new_todos,
+        "changed_areas": changed_areas,
+        "applied": applied,
+        "skipped": skipped,
+    }
+
+
+def reschedule(
+    schedule: Dict[str, Any],
+    todos: Dict[str, List[Dict[str, Any]]],
+    changed_areas: List[str],
+    leveling: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    이전 일정의 의존성과 시작일을 유지한 채 바뀐 영역만 다시 계산합니다 (LLM 호출 없음).
+
+    Args:
+        schedule: SchedulerAgent.recommend_schedule 결과
+        todos: 제안을 적용한 할 일 목록
+        changed_areas: 할 일이 바뀐 영역
+        leveling: level_schedule 옵션. 주면 다시 계산한 일정을 평준화
+
+    Returns:
+        recommend_schedule과 같은 형식의 일정
+    """
+    # 제거된 할 일을 가리키는 의존성은 build_schedule이 무시하며,
+    # 선행 할 일이 모두 사라진 할 일은 같은 영역의 직전 할 일 뒤에 배치됨
+    dependencies = {
+        task["title"]: task.get("depends_on", []) for task in schedule.get("tasks", [])
+    }
+    plan = build_schedule(
+        todos,
+        dependencies,
+        chain_areas=True,
+        previous=schedule,
+        changed_areas=changed_areas,
+    )
+
+    start_date = schedule.get("start_date") or datetime.now().replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    if leveling:
+        plan.update(level_schedule(plan["tasks"], start_date, **leveling))
+    return {
+        "start_date": start_date,
+        "tasks": plan["tasks"],
+        "total_days": plan["total_days"],
+        "critical_path": plan["critical_path"],
+        "recomputed": plan["recomputed"],
+    }
@@ -0,0 +1,249 @@
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from collections import deque
+import math
+
+# 우선순위 표기 → 정렬 순위 (작을수록 먼저)
+PRIORITY_RANKS = {
+    "high": 0,
+    "높음": 0,
+    "상": 0,
+    "medium": 1,
+    "보통": 1,
+    "중간": 1,
+    "중": 1,
+    "low": 2,
+    "낮음": 2,
+    "하": 2,
+}
+DEFAULT_PRIORITY_RANK = 1
+
+
+def _duration_days(task: Dict[str, Any]) -> int:
+    """할 일의 소요 시간을 0 이상의 정수 일수로 변환합니다."""
+    try:
+        return max(int(math.ceil(float(task.get("duration_days", 1)))), 0)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _priority_rank(task: Dict[str, Any]) -> int:
+    """할 일의 우선순위 표기를 정렬 순위로 변환합니다."""
+    priority = task.get("priority")
+    if isinstance(priority, (int, float)):
+        return int(priority)
+    if isinstance(priority, str):
+        return PRIORITY_RANKS.get(priority.strip().lower(), DEFAULT_PRIORITY_RANK)
+    return DEFAULT_PRIORITY_RANK
+
+
+def _resolve_title(
+    title: str,
+    area: str,
+    by_area_title: Dict[Tuple[str, str], int],
+    by_title: Dict[str, int],
+) -> Optional[int]:
+    """선행 할 일 제목을 인덱스로 변환합니다. 같은 영역의 할 일을 우선합니다."""
+    index = by_area_title.get((area, title))
+    if index is None:
+        index = by_title.get(title)
+    return index
+
+
+def build_schedule(
+    todos: Dict[str, List[Dict[str, Any]]],
+    dependencies: Optional[Dict[str, List[str]]] = None,
+    chain_areas: bool = True,
+    previous: Optional[Dict[str, Any]] = None,
+    changed_areas: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    할 일 간 의존성을 바탕으로 각 할 일의 시작 오프셋과 핵심 경로를 계산합니다.
+
+    위상 정렬 후 전진/후진 계산(CPM)으로 가장 이른 시작일과 여유 일수를 구하며,
+    할 일 수와 의존성 수에 선형인 시간이 걸립니다.
+
+    Args:
+        todos: 영역별 할 일 목록
+        dependencies: 할 일 제목 → 선행 할 일 제목 목록. 할 일의 "depends_on" 필드도 함께 사용
+        chain_areas: 명시적 의존성이 없는 할 일을 같은 영역의 직전 할 일 뒤에 배치할지 여부
+        previous: 이전에 계산한 일정 (build_schedule 결과 또는 tasks가 포함된 딕셔너리)
+        changed_areas: 이전 일정 이후 할 일이 바뀐 영역. previous와 함께 주면
+            바뀐 영역과 그 후속 할 일의 시작 오프셋만 다시 계산하고 나머지는 재사용
+
+    Returns:
+        tasks(시작 오프셋 순으로 정렬된 일정), total_days(전체 기간), critical_path(핵심 경로 할 일 제목),
+        recomputed(시작 오프셋을 다시 계산한 할 일 수)
+    """
+    dependencies = dependencies or {}
+
+    areas: List[str] = []
+    tasks: List[Dict[str, Any]] = []
+    by_area_title: Dict[Tuple[str, str], int] = {}
+    by_title: Dict[str, int] = {}
+
+    for area, area_tasks in todos.items():
+        for task in area_tasks:
+            index = len(tasks)
+            areas.append(area)
+            tasks.append(task)
+            by_area_title.setdefault((area, task["title"]), index)
+            by_title.setdefault(task["title"], index)
+
+    count = len(tasks)
+    durations = [_duration_days(task) for task in tasks]
+    preds: List[List[int]] = [[] for _ in range(count)]
+    succs: List[List[int]] = [[] for _ in range(count)]
+
+    # 의존성 그래프 구성
+    previous_in_area: Dict[str, int] = {}
+    for index, task in enumerate(tasks):
+        area = areas[index]
+        titles = list(task.get("depends_on") or []) + list(
+            dependencies.get(task["title"], [])
+        )
+
+        seen = set()
+        for title in titles:
+            pred = _resolve_title(title, area, by_area_title, by_title)
+            if pred is None or pred == index or pred in seen:
+                continue
+            seen.add(pred)
+            preds[index].append(pred)
+
+        if not preds[index] and chain_areas and area in previous_in_area:
+            preds[index].append(previous_in_area[area])
+
+        for pred in preds[index]:
+            succs[pred].append(index)
+        previous_in_area[area] = index
+
+    # 위상 정렬 (Kahn)
+    indegree = [len(p) for p in preds]
+    queue = deque(i for i in range(count) if indegree[i] == 0)
+    order: List[int] = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ in succs[node]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+
+    if len(order) < count:
+        # 순환 의존성은 이미 배치된 선행 할 일만 남기고 끊어냄
+        print("Cyclic task dependencies detected; ignoring edges inside the cycle")
+        placed = set(order)
+        for index in range(count):
+            if index not in placed:
+                preds[index] = [p for p in preds[index] if p in placed]
+                order.append(index)
+                placed.add(index)
+        succs = [[] for _ in range(count)]
+        for index in range(count):
+            for pred in preds[index]:
+                succs[pred].append(index)
+
+    # 증분 계산용 이전 일정: (영역, 제목) → (시작 오프셋, 소요 시간, 선행 할 일)
+    previous_tasks = {}
+    if previous and changed_areas is not None:
+        previous_tasks = {
+            (task["area"], task["title"]): (
+                # 평준화된 일정은 평준화 전 오프셋을 별도로 보관
+                task.get("earliest_start_offset", task.get("start_day_offset")),
+                task.get("duration_days"),
+                task.get("depends_on", []),
+            )
+            for task in previous.get("tasks", [])
+        }
+        changed_areas = set(changed_areas)
+
+    # 다시 계산할 할 일: 바뀐(또는 이전 일정에 없는) 할 일과 그 후속 할 일 전체
+    if previous_tasks:
+        affected = set()
+        stack = []
+        for node in range(count):
+            cached = previous_tasks.get((areas[node], tasks[node]["title"]))
+            if (
+                cached is None
+                or cached[0] is None
+                or areas[node] in changed_areas
+                or cached[1] != durations[node]
+                or cached[2] != [tasks[p]["title"] for p in preds[node]]
+            ):
+                affected.add(node)
+                stack.append(node)
+        while stack:
+            for succ in succs[stack.pop()]:
+                if succ not in affected:
+                    affected.add(succ)
+                    stack.append(succ)
+    else:
+        affected = None
+
+    # 전진 계산: 가장 이른 시작/종료 (영향받지 않은 할 일은 이전 오프셋 재사용)
+    earliest_start = [0] * count
+    earliest_finish = [0] * count
+    if affected is not None:
+        for node in range(count):
+            if node not in affected:
+                earliest_start[node] = previous_tasks[(areas[node], tasks[node]["title"])][0]
+                earliest_finish[node] = earliest_start[node] + durations[node]
+    for node in order:
+        if affected is not None and node not in affected:
+            continue
+        start = max((earliest_finish[p] for p in preds[node]), default=0)
+        earliest_start[node] = start
+        earliest_finish[node] = start + durations[node]
+
+    total_days = max(earliest_finish, default=0)
+
+    # 후진 계산: 가장 늦은 종료/시작
+    latest_finish = [total_days] * count
+    for node in reversed(order):
+        if succs[node]:
+            latest_finish[node] = min(
+                latest_finish[s] - durations[s] for s in succs[node]
+            )
+    slack = [latest_finish[i] - earliest_finish[i] for i in range(count)]
+
+    # 핵심 경로 추적: 가장 늦게 끝나는 할 일에서 여유가 없는 선행 할 일을 따라감
+    critical_path: List[str] = []
+    if count:
+        node = max(range(count), key=lambda i: (earliest_finish[i], -i))
+        while node is not None:
+            critical_path.append(tasks[node]["title"])
+            node = next(
+                (
+                    p
+                    for p in preds[node]
+                    if slack[p] == 0 and earliest_finish[p] == earliest_start[node]
+                ),
+                None,
+            )
+        critical_path.reverse()
+
+    ranks = [_priority_rank(task) for task in tasks]
+    schedule_order = sorted(
+        range(count), key=lambda i: (earliest_start[i], ranks[i], slack[i], i)
+    )
+
+    scheduled_tasks = []
+    for index in schedule_order:
+        scheduled_tasks.append(
+            {
+                "title": tasks[index]["title"],
+                "area": areas[index],
+                "duration_days": durations[index],
+                "start_day_offset": earliest_start[index],
+                "depends_on": [tasks[p]["title"] for p in preds[index]],
+                "slack_days": slack[index],
+                "critical": slack[index] == 0,
+            }
+        )
+
+    return {
+        "tasks": scheduled_tasks,
+        "total_days": total_days,
+        "critical_path": critical_path,
+        "recomputed": count if affected is None else len(affected),
+    }
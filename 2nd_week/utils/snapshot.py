@@ -0,0 +1,248 @@
+from typing import Dict, Any, Optional
+from collections import deque
+from datetime import date, datetime
+from utils.mcp_context import MCPContext, HistoryEntry, TodoRecord
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import ormsgpack
+
+# 스냅샷 형식 버전. 형식을 바꾸면 올리고 decode_snapshot에서 이전 버전을 변환
+SNAPSHOT_VERSION = 1
+
+# 스냅샷 바이트 헤더: 매직 바이트 + 버전 1바이트, 이후 zlib으로 압축한 MessagePack
+SNAPSHOT_MAGIC = b"TSS"
+
+# 반복되는 키가 많아 빠른 압축만으로도 크기가 크게 줄어듦
+COMPRESSION_LEVEL = 1
+
+# MessagePack 확장 타입 코드
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+
+
+def _pack_default(value: Any) -> Any:
+    # datetime/date는 타입을 유지하도록 확장 타입으로 저장
+    if isinstance(value, datetime):
+        return ormsgpack.Ext(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return ormsgpack.Ext(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, (set, tuple, deque)):
+        return list(value)
+    if isinstance(value, TodoRecord):
+        return value.to_dict()
+    raise TypeError(f"Type is not snapshot serializable: {type(value).__name__}")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    return ormsgpack.Ext(code, data)
+
+
+def context_to_dict(context: MCPContext) -> Dict[str, Any]:
+    """MCPContext를 기본 타입으로 된 딕셔너리로 변환합니다 (렌더링 캐시 제외)."""
+    return {
+        "goal": context.goal,
+        "task_areas": list(context.task_areas),
+        "todos": {area: [task.to_dict() for task in tasks] for area, tasks in context.todos.items()},
+        "schedule": context.schedule,
+        "user_preferences": context.user_preferences,
+        "history_limit": context.conversation_history.maxlen,
+        "conversation_history": [
+            [entry.role, entry.message, entry.timestamp] for entry in context.conversation_history
+        ],
+    }
+
+
+def context_from_dict(data: Dict[str, Any]) -> MCPContext:
+    """context_to_dict 결과로 MCPContext를 복원합니다 (대화 기록은 추가하지 않음)."""
+    context = MCPContext(history_limit=data["history_limit"])
+    context.goal = data["goal"]
+    context.task_areas = data["task_areas"]
+    context.todos = {
+        area: [TodoRecord.from_dict(task) for task in tasks] for area, tasks in data["todos"].items()
+    }
+    context.schedule = data["schedule"]
+    context.user_preferences = data["user_preferences"]
+    context.conversation_history.extend(
+        HistoryEntry(role, message, timestamp)
+        for role, message, timestamp in data["conversation_history"]
+    )
+    return context
+
+
+def encode_snapshot(state: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    TaskState(MCPContext 포함)와 화면 복원용 부가 정보를 버전이 붙은 압축 MessagePack 바이트로 인코딩합니다.
+
+    Args:
+        state: 그래프 상태 (context 키에 MCPContext)
+        meta: 함께 저장할 부가 정보 (예: 대화 메시지). 기본 타입과 datetime만 사용
+
+    Returns:
+        스냅샷 바이트
+    """
+    values = dict(state)
+    if isinstance(values.get("context"), MCPContext):
+        values["context"] = context_to_dict(values["context"])
+    payload = ormsgpack.packb(
+        {"saved_at": time.time(), "state": values, "meta": meta or {}},
+        default=_pack_default,
+        option=ormsgpack.OPT_PASSTHROUGH_DATETIME,
+    )
+    return SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """
+    encode_snapshot 결과를 복원합니다.
+
+    Returns:
+        state(MCPContext가 복원된 그래프 상태), meta, saved_at
+
+    Raises:
+        ValueError: 스냅샷 형식이 아니거나 지원하지 않는 버전인 경우
+    """
+    header_size = len(SNAPSHOT_MAGIC) + 1
+    if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(data) < header_size:
+        raise ValueError("Not a task state snapshot")
+    version = data[len(SNAPSHOT_MAGIC)]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    snapshot = ormsgpack.unpackb(zlib.decompress(data[header_size:]), ext_hook=_ext_hook)
+    state = snapshot["state"]
+    if isinstance(state.get("context"), dict):
+        state["context"] = context_from_dict(state["context"])
+    return {"state": state, "meta": snapshot["meta"], "saved_at": snapshot["saved_at"]}
+
+
+class SnapshotStore:
+    """세션 ID → 스냅샷 바이트 저장소 인터페이스"""
+
+    def save(self, session_id: str, data: bytes) -> None:
+        raise NotImplementedError("Subclasses must implement save")
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        raise NotImplementedError("Subclasses must implement load")
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError("Subclasses must implement delete")
+
+
+class FileSnapshotStore(SnapshotStore):
+    """
+    세션마다 파일 하나에 스냅샷을 저장하는 저장소.
+    임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 쓰다 만 파일을 보지 않으며,
+    공유 디렉터리(NFS 등)를 쓰면 여러 서버가 같은 세션을 이어서 처리할 수 있습니다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        # 파일 이름에 쓸 수 없는 문자가 있으면 해시 사용
+        if not re.fullmatch(r"[A-Za-z0-9_-]{1,128}", session_id):
+            session_id = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{session_id}.snapshot")
+
+    def save(self, session_id: str, data: bytes) -> None:
+        path = self._path(session_id)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        try:
+            with open(self._path(session_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    """
+    SQLite 테이블에 스냅샷을 저장하는 저장소.
+    여러 스레드와 프로세스(WAL 모드)에서 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS session_snapshots (
+                    session_id TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+
+    def save(self, session_id: str, data: bytes) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_snapshots (session_id, data, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, data, time.time()),
+            )
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM session_snapshots WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM session_snapshots WHERE session_id = ?", (session_id,))
+
+
+def save_session(
+    store: SnapshotStore, session_id: str, state: Dict[str, Any], meta: Optional[Dict[str, Any]] = None
+) -> None:
+    """세션 상태를 스냅샷으로 저장합니다. 실패해도 예외를 전파하지 않습니다."""
+    try:
+        store.save(session_id, encode_snapshot(state, meta))
+    except Exception as e:
+        print(f"Error saving session snapshot: {e}")
+
+
+def load_session(store: SnapshotStore, session_id: str) -> Optional[Dict[str, Any]]:
+    """세션 스냅샷을 불러옵니다. 없거나 읽을 수 없으면 None을 반환합니다."""
+    try:
+        data = store.load(session_id)
+        return decode_snapshot(data) if data else None
+    except Exception as e:
+        print(f"Error loading session snapshot: {e}")
+        return None
+
+
+def restore_graph_state(graph, config: Dict[str, Any], state: Dict[str, Any]) -> None:
+    """
+    스냅샷의 상태를 그래프 체크포인트로 되돌립니다.
+    review_plan이 끝난 것처럼 기록하므로 그래프를 다시 실행하지 않고
+    resume_with_human_input으로 바로 이어서 진행할 수 있습니다.
+
+    Args:
+        graph: create_task_graph()로 생성한 그래프
+        config: thread_id가 포함된 실행 설정
+        state: decode_snapshot으로 복원한 그래프 상태
+    """
+    graph.update_state({"configurable": config["configurable"]}, state, as_node="review_plan")
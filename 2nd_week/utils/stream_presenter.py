@@ -0,0 +1,333 @@
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+import json
+import re
+import threading
+import time
+
+
+# 문자열 안에서 다음으로 확인해야 할 문자 (닫는 따옴표 또는 이스케이프)
+_STRING_STOP = re.compile(r'["\\]')
+
+
+class IncrementalJSONScanner:
+    """
+    스트리밍 중인 JSON 텍스트를 새로 들어온 부분만 훑어 완성된 값을 꺼내는 스캐너.
+
+    배열의 원소와 최상위 객체의 스칼라 값이 완성되는 즉시 (경로, 값)으로 반환하며,
+    각 값은 완성될 때 한 번만 파싱하므로 전체 비용이 토큰 길이에 선형입니다.
+    경로는 최상위부터의 객체 키 목록이며 배열은 "[]"로 표시합니다 (예: ("todos", "개발", "[]")).
+    코드 블록(```json) 등 첫 '{' 앞의 텍스트는 무시합니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        # 열린 컨테이너: [종류("{" 또는 "["), 현재 키, 키를 기다리는 중인지, 시작 위치]
+        self.stack: List[List[Any]] = []
+        self.in_string = False
+        self.string_start = 0
+        self.scalar_start: Optional[int] = None
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """텍스트를 추가하고 새로 완성된 (경로, 값) 목록을 반환합니다."""
+        self.text += chunk
+        events: List[Any] = []
+        if self.finished:
+            return events
+
+        text = self.text
+        length = len(text)
+        pos = self.pos
+        if not self.started:
+            pos = text.find("{", pos)
+            if pos < 0:
+                self.pos = length
+                return events
+            self.started = True
+
+        while pos < length:
+            if self.in_string:
+                match = _STRING_STOP.search(text, pos)
+                if match is None:
+                    pos = length
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    if pos >= length:
+                        # 이스케이프 뒤 문자가 아직 오지 않음
+                        pos -= 1
+                        break
+                    pos += 1
+                    continue
+                self.in_string = False
+                self._value_done(self.string_start, pos, events)
+                continue
+
+            char = text[pos]
+            if self.scalar_start is not None and char in ",}] \t\r\n":
+                self._value_done(self.scalar_start, pos, events)
+                self.scalar_start = None
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = pos
+            elif char in "{[":
+                self.stack.append([char, None, char == "{", pos])
+            elif char in "}]":
+                if not self.stack:
+                    self.finished = True
+                    break
+                frame = self.stack.pop()
+                if not self.stack:
+                    self.finished = True
+                    pos += 1
+                    break
+                self._value_done(frame[3], pos + 1, events)
+            elif char == ",":
+                if self.stack and self.stack[-1][0] == "{":
+                    self.stack[-1][2] = True
+            elif char not in ": \t\r\n" and self.scalar_start is None:
+                self.scalar_start = pos
+            pos += 1
+
+        self.pos = pos
+        return events
+
+    def _value_done(self, start: int, end: int, events: List[Any]) -> None:
+        """start~end 범위의 값이 완성되었을 때 호출됩니다."""
+        if not self.stack:
+            return
+        parent = self.stack[-1]
+        if parent[0] == "{" and parent[2]:
+            # 객체의 키
+            try:
+                parent[1] = json.loads(self.text[start:end])
+            except ValueError:
+                parent[1] = self.text[start + 1 : end - 1]
+            parent[2] = False
+            return
+
+        # 배열 원소이거나 최상위 객체의 스칼라 값만 반환
+        if parent[0] != "[" and (len(self.stack) > 1 or self.text[start] in "{["):
+            return
+        path = tuple(frame[1] if frame[0] == "{" else "[]" for frame in self.stack)
+        try:
+            events.append((path, json.loads(self.text[start:end])))
+        except ValueError:
+            pass
+
+
+def _todo_row(item: Any) -> Optional[str]:
+    if not isinstance(item, dict) or "title" not in item:
+        return None
+    duration = f" ({item['duration_days']}일)" if "duration_days" in item else ""
+    return f"- [ ] {item['title']}{duration}"
+
+
+class _StreamView:
+    """
+    응답 스트림 하나의 렌더링 상태.
+    완성된 항목만 행으로 변환해 이어 붙이므로 플러시마다 처음부터 다시 파싱하지 않습니다.
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.scanner = IncrementalJSONScanner()
+        self.pending: List[str] = []  # 아직 스캔하지 않은 토큰
+        self.completed = False
+        self.chars = 0
+        self._body: Optional[str] = None  # 마지막 렌더링 결과 (바뀌면 None)
+        self.task_areas: List[str] = []
+        self.scalars: Dict[str, Any] = {}
+        self.rows: List[str] = []  # 제목 없는 행 (할 일/의존성/제안)
+        self.groups: Dict[str, List[str]] = {}  # 영역 → 할 일 행
+
+    def scan(self) -> None:
+        """쌓인 토큰을 스캔해 새로 완성된 항목을 행으로 추가합니다."""
+        if not self.pending:
+            return
+        chunk = "".join(self.pending)
+        self.pending.clear()
+        self.chars += len(chunk)
+        self._body = None
+        for path, value in self.scanner.feed(chunk):
+            self._add(path, value)
+
+    def _add(self, path: Tuple[str, ...], value: Any) -> None:
+        if path in (("goal_analysis",), ("review_comment",)):
+            self.scalars[path[0]] = value
+        elif path == ("task_areas", "[]"):
+            if isinstance(value, str):
+                self.task_areas.append(value)
+        elif path == ("dependencies", "[]"):
+            # SchedulerAgent (의존성 추론)
+            if isinstance(value, dict) and value.get("task"):
+                depends_on = ", ".join(value.get("depends_on") or []) or "-"
+                self.rows.append(f"- {value['task']} ← {depends_on}")
+        elif path == ("suggestions", "[]"):
+            # ReviewAgent
+            if isinstance(value, dict):
+                title = value.get("task_title") or (value.get("task") or {}).get("title", "")
+                self.rows.append(f"- {value.get('type', '')}: {value.get('area', '')} {title}")
+        elif path == ("todos", "[]"):
+            # TodoGeneratorAgent (영역별 생성)
+            row = _todo_row(value)
+            if row:
+                self.rows.append(row)
+        elif len(path) == 3 and path[0] == "todos" and path[2] == "[]":
+            # PlanGeneratorAgent: {"todos": {"영역": [할 일, ...]}}
+            row = _todo_row(value)
+            if row:
+                self.groups.setdefault(path[1], []).append(row)
+        elif len(path) == 2 and path[1] == "[]":
+            # TodoGeneratorAgent (한 번에 생성): {"영역": [할 일, ...]}
+            row = _todo_row(value)
+            if row:
+                self.groups.setdefault(path[0], []).append(row)
+
+    def body(self) -> str:
+        if self._body is None:
+            self._body = self._render()
+        return self._body
+
+    def _render(self) -> str:
+        complete = self.completed
+        lines = []
+        if self.task_areas:
+            lines.append(f"작업 영역: {', '.join(self.task_areas)}")
+        if complete and self.scalars.get("goal_analysis"):
+            lines.append(self.scalars["goal_analysis"])
+        if self.scalars.get("review_comment"):
+            lines.append(self.scalars["review_comment"])
+        if self.groups and lines:
+            lines.append("")
+        for area, rows in self.groups.items():
+            lines.append(f"### {area}")
+            lines.extend(rows)
+            lines.append("")
+        lines.extend(self.rows)
+        if lines:
+            return "\n".join(lines)
+        return f"응답 생성 중... ({self.chars}자)" if self.chars else ""
+
+
+class StreamPresenter:
+    """
+    LLM 토큰 스트림을 모아 일정 시간/크기 단위로만 렌더링하는 클래스.
+    스트리밍 중인 JSON 출력에서 새로 완성된 항목만 파싱해 구조화된 행으로 이어 붙이므로
+    렌더링 비용이 전체 토큰 길이에 선형입니다.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[str], None],
+        min_interval: float = 0.2,
+        max_pending_chars: int = 400,
+    ):
+        """
+        Args:
+            render: 마크다운 문자열을 화면에 그리는 함수
+            min_interval: 렌더링 사이의 최소 간격(초)
+            max_pending_chars: 이만큼 토큰이 쌓이면 간격과 관계없이 렌더링
+        """
+        self.render = render
+        self.min_interval = min_interval
+        self.max_pending_chars = max_pending_chars
+        self.views: Dict[Any, _StreamView] = {}
+        self.pending_chars = 0
+        self.last_render = 0.0
+        self.render_count = 0
+        self.last_output = ""  # 마지막으로 렌더링한 마크다운
+        self._lock = threading.Lock()
+
+    def start(self, run_id: Any, label: str = "") -> None:
+        """새 LLM 응답 스트림을 등록합니다."""
+        with self._lock:
+            self.views[run_id] = _StreamView(label)
+
+    def feed(self, run_id: Any, token: str) -> None:
+        """토큰을 버퍼에 추가하고, 예산을 넘으면 렌더링합니다."""
+        with self._lock:
+            view = self.views.get(run_id)
+            if view is None:
+                view = self.views[run_id] = _StreamView()
+            view.pending.append(token)
+            self.pending_chars += len(token)
+            due = (
+                self.pending_chars >= self.max_pending_chars
+                or time.monotonic() - self.last_render >= self.min_interval
+            )
+        if due:
+            self.flush()
+
+    def end(self, run_id: Any) -> None:
+        """응답 스트림 종료를 표시하고 최종 상태를 렌더링합니다."""
+        with self._lock:
+            view = self.views.get(run_id)
+            if view is not None:
+                view.completed = True
+                view._body = None
+        self.flush()
+
+    def clear(self) -> None:
+        """모든 스트림을 정리합니다."""
+        with self._lock:
+            self.views.clear()
+            self.pending_chars = 0
+        self.render("")
+
+    def flush(self) -> None:
+        """현재까지 받은 모든 스트림을 렌더링합니다."""
+        with self._lock:
+            sections = []
+            for view in self.views.values():
+                view.scan()
+                body = view.body()
+                if view.label:
+                    header = f"**{view.label}**" + ("" if view.completed else " (생성 중...)")
+                    sections.append(f"{header}\n\n{body}")
+                elif body:
+                    sections.append(body)
+            self.last_output = "\n\n".join(sections)
+            output = self.last_output
+            self.pending_chars = 0
+            self.last_render = time.monotonic()
+            self.render_count += 1
+
+        self.render(output)
+
+
+class StreamPresenterCallbackHandler(BaseCallbackHandler):
+    """LLM 콜백 이벤트를 StreamPresenter로 전달하는 핸들러"""
+
+    def __init__(self, presenter: StreamPresenter, labels: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            presenter: 토큰을 전달할 StreamPresenter
+            labels: 그래프 노드 이름 → 화면에 표시할 이름
+        """
+        super().__init__()
+        self.presenter = presenter
+        self.labels = labels or {}
+
+    def _label(self, metadata: Optional[Dict[str, Any]]) -> str:
+        node = (metadata or {}).get("langgraph_node", "")
+        return self.labels.get(node, node)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        self.presenter.start(run_id, self._label(metadata))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        self.presenter.start(run_id, self._label(metadata))
+
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs) -> None:
+        self.presenter.feed(run_id, token)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        self.presenter.end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self.presenter.end(run_id)
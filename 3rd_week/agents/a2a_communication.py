@@ -1,6 +1,8 @@
 import json
 import asyncio
-from typing import Dict, Any, Optional, Callable
+import contextvars
+import threading
+from typing import Dict, Any, Optional, Callable, List, Set
 from google.cloud import pubsub_v1
 from google.cloud import functions_v1
 from google.auth import default
@@ -9,16 +11,68 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 logger = logging.getLogger(__name__)
 
+# 오케스트레이터가 단계별 결과를 받는 토픽 이름과 핸들러 이름
+ORCHESTRATOR_NAME = "orchestrator"
+RESULT_HANDLER = "collect_result"
+
+# 처리 중인 메시지에서 이어지는 모든 메시지(다음 단계 전송, 결과 보고)에 그대로 전달되는 필드
+ENVELOPE_FIELDS = ("workflow_id", "report_to")
+
+# 현재 처리 중인 메시지의 봉투 필드. 태스크별 컨텍스트라 동시에 처리하는 메시지끼리 섞이지 않음
+current_envelope: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "current_envelope", default={}
+)
+
+
+def envelope_of(message_data: Dict[str, Any]) -> Dict[str, Any]:
+    """메시지에서 봉투 필드만 추출"""
+    return {
+        field: message_data[field]
+        for field in ENVELOPE_FIELDS
+        if message_data.get(field) is not None
+    }
+
 
 class A2ACommunicationManager:
     """Google Cloud Pub/Sub을 통한 Agent-to-Agent 통신 매니저"""
 
-    def __init__(self, project_id: str, topic_prefix: str = "agent-communication"):
+    def __init__(
+        self,
+        project_id: str,
+        topic_prefix: str = "agent-communication",
+        batch_settings: Optional[pubsub_v1.types.BatchSettings] = None,
+        fire_and_forget: bool = False,
+    ):
+        """
+        Args:
+            project_id: Google Cloud 프로젝트 ID
+            topic_prefix: 토픽/구독 이름 접두사
+            batch_settings: 발행 배치 설정. None이면 클라이언트 기본값
+            fire_and_forget: True면 publish_message가 발행 결과를 기다리지 않음
+        """
         self.project_id = project_id
         self.topic_prefix = topic_prefix
-        self.publisher = pubsub_v1.PublisherClient()
+        self.publisher = (
+            pubsub_v1.PublisherClient(batch_settings=batch_settings)
+            if batch_settings
+            else pubsub_v1.PublisherClient()
+        )
         self.subscriber = pubsub_v1.SubscriberClient()
         self.message_handlers: Dict[str, Callable] = {}
+        self.fire_and_forget = fire_and_forget
+        # 발행 실패 콜백 (target_agent, message_data, exception). 발행 스레드에서 호출됨
+        self.delivery_failure_callbacks: List[Callable] = []
+        # 결과를 기다리지 않은 발행 중인 future (flush에서 사용)
+        # 이벤트 루프와 발행 콜백 스레드에서 함께 접근하므로 잠금으로 보호
+        self._pending_publishes: Set[Any] = set()
+        self._pending_lock = threading.Lock()
+        # 에이전트 이름별 수신 중인 StreamingPullFuture
+        self.streaming_pull_futures: Dict[str, Any] = {}
+        # 새 메시지를 받지 않고 돌려보내는 에이전트 (종료 중, pause_listening)
+        self._paused: Set[str] = set()
+        # 에이전트 이름별 핸들러가 끝나지 않아 아직 ack/nack하지 않은 메시지의 future
+        self._handling: Dict[str, Set[Any]] = {}
+        self._handling_lock = threading.Lock()
 
     def get_topic_path(self, agent_name: str) -> str:
         """에이전트별 토픽 경로 생성"""
@@ -31,107 +85,363 @@ class A2ACommunicationManager:
         return self.subscriber.subscription_path(self.project_id, subscription_name)
 
     async def publish_message(
-        self, target_agent: str, message_data: Dict[str, Any]
-    ) -> None:
-        """메시지를 특정 에이전트에게 발송"""
+        self, target_agent: str, message_data: Dict[str, Any], wait: bool = None
+    ) -> Optional[str]:
+        """
+        메시지를 특정 에이전트에게 발송
+
+        발행은 PublisherClient가 배치로 모아 백그라운드 스레드에서 전송하므로
+        이벤트 루프를 막지 않습니다.
+
+        Args:
+            target_agent: 받을 에이전트 이름
+            message_data: 메시지
+            wait: True면 발행 완료까지 (루프를 막지 않고) 기다림, False면 바로 반환하고
+                실패는 delivery_failure_callbacks로 보고. None이면 fire_and_forget 설정을 따름
+
+        Returns:
+            발행된 메시지 ID (기다리지 않은 경우 None)
+        """
         topic_path = self.get_topic_path(target_agent)
         message_json = json.dumps(message_data).encode("utf-8")
+        if wait is None:
+            wait = not self.fire_and_forget
 
         try:
             future = self.publisher.publish(topic_path, message_json)
-            message_id = future.result()
+        except Exception as e:
+            logger.error(f"Failed to publish message to {target_agent}: {e}")
+            raise
+
+        if not wait:
+            with self._pending_lock:
+                self._pending_publishes.add(future)
+            future.add_done_callback(
+                lambda f: self._on_publish_done(f, target_agent, message_data)
+            )
+            return None
+
+        try:
+            message_id = await asyncio.wrap_future(future)
             logger.info(f"Message published to {target_agent}: {message_id}")
+            return message_id
         except Exception as e:
             logger.error(f"Failed to publish message to {target_agent}: {e}")
             raise
 
+    def _on_publish_done(self, future, target_agent: str, message_data: Dict[str, Any]):
+        """기다리지 않은 발행의 완료 처리 (발행 스레드에서 호출됨)"""
+        with self._pending_lock:
+            self._pending_publishes.discard(future)
+        exception = future.exception()
+        if exception is None:
+            logger.debug(f"Message published to {target_agent}: {future.result()}")
+            return
+
+        logger.error(f"Failed to publish message to {target_agent}: {exception}")
+        for callback in self.delivery_failure_callbacks:
+            try:
+                callback(target_agent, message_data, exception)
+            except Exception as e:
+                logger.error(f"Error in delivery failure callback: {e}")
+
+    def add_delivery_failure_callback(self, callback: Callable):
+        """기다리지 않은 발행이 실패했을 때 호출할 콜백 등록"""
+        self.delivery_failure_callbacks.append(callback)
+
+    async def flush(self, timeout: float = None):
+        """기다리지 않고 보낸 발행이 모두 끝날 때까지 대기 (종료 전 호출)"""
+        with self._pending_lock:
+            pending = list(self._pending_publishes)
+        pending = [asyncio.wrap_future(future) for future in pending]
+        if pending:
+            done, _ = await asyncio.wait(pending, timeout=timeout)
+            for future in done:
+                future.exception()  # 실패는 _on_publish_done에서 이미 보고됨
+
     def register_message_handler(self, handler_name: str, handler_func: Callable):
         """메시지 핸들러 등록"""
         self.message_handlers[handler_name] = handler_func
 
-    async def start_listening(self, agent_name: str):
-        """특정 에이전트의 메시지 수신 시작"""
+    async def start_listening(self, agent_name: str, max_messages: int = 100):
+        """
+        특정 에이전트의 메시지 수신 시작 (수신은 백그라운드 스레드에서 진행되고 바로 반환)
+
+        Pub/Sub 콜백은 gRPC 스레드에서 호출되므로 핸들러는 이 메서드를 호출한 이벤트 루프에서
+        run_coroutine_threadsafe로 실행합니다. 메시지는 핸들러가 끝난 뒤(에이전트는 처리가 끝난 뒤)
+        ack하고, 핸들러가 예외를 내면 nack해서 다시 전달받습니다.
+
+        Args:
+            agent_name: 에이전트 이름
+            max_messages: 동시에 ack하지 않고 들고 있을 최대 메시지 수 (FlowControl).
+                넘으면 Pub/Sub이 전달을 멈추므로 에이전트 큐가 넘치지 않음
+
+        Returns:
+            StreamingPullFuture (stop_listening으로 중지)
+        """
+        self._paused.discard(agent_name)
         subscription_path = self.get_subscription_path(agent_name)
+        loop = asyncio.get_running_loop()
+
+        handling = self._handling.setdefault(agent_name, set())
+
+        def on_handled(message, future):
+            with self._handling_lock:
+                handling.discard(future)
+            try:
+                future.result()
+                message.ack()
+            except Exception as e:
+                logger.error(f"Error processing message on {agent_name}: {e}")
+                message.nack()
 
         def callback(message):
+            if agent_name in self._paused:
+                # 종료 중 - 스트림은 열어 둔 채 새 메시지는 다른 구독자가 받도록 돌려보냄
+                message.nack()
+                return
+
             try:
                 message_data = json.loads(message.data.decode("utf-8"))
-                handler_name = message_data.get("handler", "default")
-
-                if handler_name in self.message_handlers:
-                    asyncio.create_task(
-                        self.message_handlers[handler_name](message_data)
-                    )
+            except Exception as e:
+                # 다시 받아도 처리할 수 없는 메시지이므로 버림
+                logger.error(f"Dropping undecodable message on {agent_name}: {e}")
+                message.ack()
+                return
 
+            handler = self.message_handlers.get(message_data.get("handler", "default"))
+            if handler is None:
+                logger.warning(
+                    f"No handler for message on {agent_name}: {message_data.get('handler')}"
+                )
                 message.ack()
-            except Exception as e:
-                logger.error(f"Error processing message: {e}")
+                return
+
+            try:
+                future = asyncio.run_coroutine_threadsafe(handler(message_data), loop)
+            except RuntimeError as e:
+                # 이벤트 루프가 닫힘 - 다른 구독자가 받도록 돌려보냄
+                logger.error(f"Event loop unavailable for {agent_name}: {e}")
                 message.nack()
+                return
+            with self._handling_lock:
+                handling.add(future)
+            future.add_done_callback(lambda f: on_handled(message, f))
 
-        flow_control = pubsub_v1.types.FlowControl(max_messages=100)
+        flow_control = pubsub_v1.types.FlowControl(max_messages=max_messages)
         streaming_pull_future = self.subscriber.subscribe(
             subscription_path, callback=callback, flow_control=flow_control
         )
+        self.streaming_pull_futures[agent_name] = streaming_pull_future
+
+        logger.info(
+            f"Listening for messages on {subscription_path} (max_messages={max_messages})"
+        )
+        return streaming_pull_future
 
-        logger.info(f"Listening for messages on {subscription_path}")
+    def pause_listening(self, agent_name: str = None):
+        """
+        새 메시지 수신 중지. agent_name이 없으면 모든 에이전트
 
-        try:
-            streaming_pull_future.result()
-        except KeyboardInterrupt:
-            streaming_pull_future.cancel()
+        스트림은 열어 둔 채 새로 전달되는 메시지만 nack해서 돌려보내므로, 이미 받아서
+        처리 중인 메시지는 처리가 끝난 뒤 정상적으로 ack됩니다.
+        """
+        # 수신을 시작하지 않은 에이전트는 건너뜀
+        names = [
+            name
+            for name in ([agent_name] if agent_name else list(self.streaming_pull_futures))
+            if name in self.streaming_pull_futures
+        ]
+        self._paused.update(names)
+        for name in names:
+            logger.info(f"Paused listening on {self.get_subscription_path(name)}")
+
+    async def wait_handled(self, agent_name: str = None, timeout: float = None) -> bool:
+        """
+        받은 메시지의 핸들러가 모두 끝나 ack/nack될 때까지 대기. agent_name이 없으면 모든 에이전트
+
+        Returns:
+            timeout 안에 모두 끝났으면 True
+        """
+        names = [agent_name] if agent_name else list(self._handling)
+        with self._handling_lock:
+            pending = [
+                asyncio.wrap_future(future)
+                for name in names
+                for future in self._handling.get(name, ())
+            ]
+        if not pending:
+            return True
+        _, not_done = await asyncio.wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} messages still being handled after timeout")
+        return not not_done
+
+    def stop_listening(self, agent_name: str = None, timeout: float = None):
+        """
+        메시지 수신 중지. agent_name이 없으면 모든 에이전트
+
+        스트림을 닫으면 그 뒤의 ack는 전달되지 않으므로, 처리 중인 메시지가 있으면
+        pause_listening → 처리 완료 대기(wait_handled) 뒤에 호출합니다.
+
+        Args:
+            agent_name: 에이전트 이름
+            timeout: 지정하면 보내지 않은 ack까지 전송하고 스트림이 닫힐 때까지 최대 이 시간(초)
+                동안 대기 (블로킹 호출)
+        """
+        names = [agent_name] if agent_name else list(self.streaming_pull_futures)
+        for name in names:
+            streaming_pull_future = self.streaming_pull_futures.pop(name, None)
+            if streaming_pull_future is not None:
+                streaming_pull_future.cancel()
+                if timeout is not None:
+                    try:
+                        streaming_pull_future.result(timeout=timeout)
+                    except Exception as e:
+                        logger.warning(f"Error while closing stream on {name}: {e}")
+                logger.info(f"Stopped listening on {self.get_subscription_path(name)}")
+            self._paused.discard(name)
 
 
 class A2AAgent:
     """A2A 통신을 지원하는 기본 에이전트 클래스"""
 
     def __init__(
-        self, agent_name: str, llm, communication_manager: A2ACommunicationManager
+        self,
+        agent_name: str,
+        llm,
+        communication_manager: A2ACommunicationManager,
+        queue_size: int = 100,
+        concurrency: int = 1,
     ):
+        """
+        Args:
+            agent_name: 에이전트 이름 (토픽/핸들러 이름에 사용)
+            llm: LLM 인스턴스
+            communication_manager: A2A 통신 매니저
+            queue_size: 처리 대기 큐 크기
+            concurrency: 동시에 처리할 최대 메시지 수 (워커 수)
+        """
         self.agent_name = agent_name
         self.llm = llm
         self.comm_manager = communication_manager
-        self.processing_queue = asyncio.Queue()
+        # (메시지, 처리 완료 future) 큐. 크기 제한으로 수신 흐름 제어와 맞춤
+        self.processing_queue = asyncio.Queue(maxsize=queue_size)
+        self.concurrency = max(concurrency, 1)
+        # 동시 LLM 호출 제한. 큐 워커와 외부 직접 호출(analyze_requirements 등)이 함께 사용
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.active_count = 0
 
         # 메시지 핸들러 등록
         self.comm_manager.register_message_handler(
             f"{agent_name}_process", self._handle_incoming_message
         )
 
+    @property
+    def max_in_flight(self) -> int:
+        """ack 전까지 들고 있을 수 있는 최대 메시지 수 (큐 + 동시에 처리 중인 메시지)"""
+        return self.processing_queue.maxsize + self.concurrency
+
     async def _handle_incoming_message(self, message_data: Dict[str, Any]):
-        """들어오는 메시지 처리"""
-        await self.processing_queue.put(message_data)
+        """들어오는 메시지를 큐에 넣고 처리가 끝날 때까지 대기 (끝난 뒤 ack되도록)"""
+        done = asyncio.get_running_loop().create_future()
+        await self.processing_queue.put((message_data, done))
+        return await done
 
     async def process_message(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """메시지 처리 - 서브클래스에서 구현"""
         raise NotImplementedError("Subclasses must implement process_message")
 
     async def send_to_agent(self, target_agent: str, message_data: Dict[str, Any]):
-        """다른 에이전트에게 메시지 전송"""
+        """다른 에이전트에게 메시지 전송 (처리 중인 메시지의 워크플로우 ID 등을 이어 붙임)"""
+        for field, value in current_envelope.get().items():
+            message_data.setdefault(field, value)
         message_data["handler"] = f"{target_agent}_process"
         message_data["sender"] = self.agent_name
         await self.comm_manager.publish_message(target_agent, message_data)
 
+    async def report_result(self, report_to: str, result: Dict[str, Any]):
+        """처리 결과를 결과 수집 핸들러(오케스트레이터)에게 바로 보고"""
+        await self.comm_manager.publish_message(
+            report_to,
+            {
+                **result,
+                **current_envelope.get(),
+                "handler": RESULT_HANDLER,
+                "sender": self.agent_name,
+            },
+        )
+
     async def start_processing(self):
-        """메시지 처리 루프 시작"""
+        """메시지 처리 워커들을 시작하고 모두 끝날 때까지 대기 (취소하면 워커도 함께 취소)"""
+        workers = [
+            asyncio.create_task(self._worker(), name=f"{self.agent_name}-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def drain(self, timeout: float = None) -> bool:
+        """
+        큐에 남은 메시지와 처리 중인 메시지가 모두 끝날 때까지 대기
+        (먼저 pause_listening으로 새 메시지 수신을 멈춘 뒤 호출)
+
+        Returns:
+            timeout 안에 모두 처리되었으면 True
+        """
+        try:
+            await asyncio.wait_for(self.processing_queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{self.agent_name}: {self.processing_queue.qsize()} messages left after drain timeout"
+            )
+            return False
+
+    async def _worker(self):
+        """큐에서 메시지를 하나씩 꺼내 처리하는 워커"""
         while True:
+            message_data, done = await self.processing_queue.get()
             try:
-                message_data = await self.processing_queue.get()
-                result = await self.process_message(message_data)
-
-                # 응답이 필요한 경우 sender에게 결과 전송
-                if "reply_to" in message_data and result:
-                    await self.send_to_agent(
-                        message_data["reply_to"],
-                        {
-                            "type": "response",
-                            "original_message_id": message_data.get("message_id"),
-                            "result": result,
-                        },
-                    )
-
-                self.processing_queue.task_done()
+                result = await self._process_one(message_data)
+                if not done.done():
+                    done.set_result(result)
             except Exception as e:
                 logger.error(f"Error processing message in {self.agent_name}: {e}")
+                if not done.done():
+                    done.set_exception(e)
+            finally:
+                self.processing_queue.task_done()
+
+    async def _process_one(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """메시지 하나를 처리하고 결과를 보고/응답"""
+        envelope_token = current_envelope.set(envelope_of(message_data))
+        self.active_count += 1
+        try:
+            result = await self.process_message(message_data)
+
+            # 결과 보고 대상이 있으면 처리 즉시 보고 (실패 결과 포함)
+            if message_data.get("report_to") and result:
+                await self.report_result(message_data["report_to"], result)
+
+            # 응답이 필요한 경우 sender에게 결과 전송
+            if "reply_to" in message_data and result:
+                await self.send_to_agent(
+                    message_data["reply_to"],
+                    {
+                        "type": "response",
+                        "original_message_id": message_data.get("message_id"),
+                        "result": result,
+                    },
+                )
+            return result
+        finally:
+            self.active_count -= 1
+            current_envelope.reset(envelope_token)
 
     async def process_with_llm(self, system_prompt: str, user_input: str) -> str:
         """LLM을 사용한 메시지 처리"""
@@ -141,7 +451,8 @@ class A2AAgent:
         ]
 
         try:
-            response = await self.llm.ainvoke(messages)
+            async with self.semaphore:
+                response = await self.llm.ainvoke(messages)
             return response.content
         except Exception as e:
             logger.error(f"LLM processing error: {e}")
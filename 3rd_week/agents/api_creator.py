@@ -4,8 +4,8 @@ import uuid
 
 
 class APISpecCreatorAgent(A2AAgent):
-    def __init__(self, llm, communication_manager: A2ACommunicationManager):
-        super().__init__("api-spec-creator", llm, communication_manager)
+    def __init__(self, llm, communication_manager: A2ACommunicationManager, **kwargs):
+        super().__init__("api-spec-creator", llm, communication_manager, **kwargs)
 
         self.system_prompt = """당신은 API 명세서 작성 전문가입니다.
         요구사항과 서비스 흐름도를 바탕으로 다음 항목을 포함한 상세한 API 명세서를 작성해야 합니다:
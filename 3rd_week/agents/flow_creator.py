@@ -4,8 +4,8 @@ import uuid
 
 
 class ServiceFlowCreatorAgent(A2AAgent):
-    def __init__(self, llm, communication_manager: A2ACommunicationManager):
-        super().__init__("service-flow-creator", llm, communication_manager)
+    def __init__(self, llm, communication_manager: A2ACommunicationManager, **kwargs):
+        super().__init__("service-flow-creator", llm, communication_manager, **kwargs)
 
         self.system_prompt = """당신은 서비스 흐름도 설계 전문가입니다.
         요구사항 명세서를 바탕으로 다음을 포함한 서비스 흐름도를 작성해야 합니다:
@@ -4,8 +4,8 @@ import uuid
 
 
 class RequirementAnalysisAgent(A2AAgent):
-    def __init__(self, llm, communication_manager: A2ACommunicationManager):
-        super().__init__("requirement-analysis", llm, communication_manager)
+    def __init__(self, llm, communication_manager: A2ACommunicationManager, **kwargs):
+        super().__init__("requirement-analysis", llm, communication_manager, **kwargs)
 
         self.system_prompt = """당신은 요구사항 분석 전문가입니다. 
         프로젝트 설명을 분석하여 상세한 요구사항 명세서를 작성해야 합니다.
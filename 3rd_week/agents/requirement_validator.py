@@ -4,8 +4,8 @@ import uuid
 
 
 class RequirementValidatorAgent(A2AAgent):
-    def __init__(self, llm, communication_manager: A2ACommunicationManager):
-        super().__init__("requirement-validator", llm, communication_manager)
+    def __init__(self, llm, communication_manager: A2ACommunicationManager, **kwargs):
+        super().__init__("requirement-validator", llm, communication_manager, **kwargs)
 
         self.system_prompt = """당신은 요구사항 검증 전문가입니다.
         제공된 요구사항 명세서를 검토하고 다음 사항을 확인해야 합니다:
@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from google.auth import default
 from google.auth.exceptions import DefaultCredentialsError
 from pydantic_settings import BaseSettings
@@ -11,6 +12,24 @@ class GoogleCloudConfig(BaseSettings):
     topic_prefix: str = "agent-communication"
     region: str = "asia-northeast3"  # 서울 리전
 
+    # 발행 배치 설정 (PublisherClient BatchSettings). 조건 중 하나를 만족하면 배치를 전송
+    publish_max_messages: int = 100
+    publish_max_bytes: int = 1_000_000
+    publish_max_latency: float = 0.01  # 초
+    # True면 발행 결과를 기다리지 않고 실패는 콜백으로 보고
+    publish_fire_and_forget: bool = False
+
+    # 에이전트별 동시 처리 수 (LLM 호출 할당량에 맞춰 조정)
+    agent_concurrency: int = 4
+    # 에이전트 이름 → 동시 처리 수 (JSON, 예: GCP_AGENT_CONCURRENCY_OVERRIDES='{"api-spec-creator": 8}')
+    agent_concurrency_overrides: Dict[str, int] = {}
+    # 에이전트별 처리 대기 큐 크기 (수신 흐름 제어 기준)
+    agent_queue_size: int = 100
+
+    def get_agent_concurrency(self, agent_name: str) -> int:
+        """에이전트의 동시 처리 수"""
+        return max(self.agent_concurrency_overrides.get(agent_name, self.agent_concurrency), 1)
+
     class Config:
         env_prefix = "GCP_"
         env_file = ".env"
@@ -32,6 +32,7 @@ async def main():
     # 오케스트레이터 초기화
     print("\n2. A2A 오케스트레이터 초기화 중...")
     orchestrator = A2AOrchestrator()
+    agent_tasks = []
 
     try:
         # 인프라 설정
@@ -171,8 +172,7 @@ async def main():
         # 정리 작업
         print("\n🧹 정리 작업 중...")
         try:
-            for task in agent_tasks:
-                task.cancel()
+            await orchestrator.stop_all_agents(agent_tasks)
         except:
             pass
         print("✅ 정리 완료")
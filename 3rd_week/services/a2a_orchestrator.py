@@ -1,10 +1,18 @@
 import asyncio
 import logging
-from typing import Dict, Any, List
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from google.cloud import pubsub_v1
 from google.api_core.exceptions import AlreadyExists
 
-from agents.a2a_communication import A2ACommunicationManager
+from agents.a2a_communication import (
+    A2ACommunicationManager,
+    ORCHESTRATOR_NAME,
+    RESULT_HANDLER,
+    current_envelope,
+)
 from agents.requirement_agent import RequirementAnalysisAgent
 from agents.requirement_validator import RequirementValidatorAgent
 from agents.flow_creator import ServiceFlowCreatorAgent
@@ -15,6 +23,69 @@ from conf.cloud_config import cloud_config, validate_cloud_setup
 
 logger = logging.getLogger(__name__)
 
+# 워크플로우 단계 (A2A 체인 순서)
+WORKFLOW_STAGES = [
+    "requirement-analysis",
+    "requirement-validator",
+    "service-flow-creator",
+    "api-spec-creator",
+    "api-spec-validator",
+]
+
+# 워크플로우 전체 최대 대기 시간(초)
+WORKFLOW_TIMEOUT = 300
+
+# 끝난 워크플로우의 결과를 보관할 최대 개수 (넘으면 오래된 것부터 정리)
+MAX_FINISHED_WORKFLOWS = 1000
+
+
+class WorkflowRun:
+    """워크플로우(프로젝트) 하나의 단계별 결과와 완료 future"""
+
+    def __init__(self, workflow_id: str):
+        self.workflow_id = workflow_id
+        self.status = "running"  # running, completed, failed, timeout
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.stage_futures: Dict[str, asyncio.Future] = {}
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def stage_future(self, agent_name: str) -> asyncio.Future:
+        """단계의 완료 future 반환 (없으면 생성)"""
+        future = self.stage_futures.get(agent_name)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.stage_futures[agent_name] = future
+        return future
+
+    def record(self, agent_name: str, result: Dict[str, Any]):
+        """단계 결과 기록 - 해당 단계를 기다리는 쪽을 즉시 깨움"""
+        self.results[agent_name] = result
+        future = self.stage_future(agent_name)
+        if not future.done():
+            future.set_result(result)
+
+    def finish(self, status: str):
+        """워크플로우 종료 처리 (기다리는 쪽이 없는 future 정리)"""
+        self.status = status
+        self.finished_at = time.time()
+        for future in self.stage_futures.values():
+            future.cancel()
+        self.stage_futures.clear()
+
+    def to_status(self) -> Dict[str, Any]:
+        return {
+            "workflow_id": self.workflow_id,
+            "status": self.status,
+            "completed_stages": [
+                stage for stage in WORKFLOW_STAGES if stage in self.results
+            ],
+            "pending_stages": [
+                stage for stage in WORKFLOW_STAGES if stage not in self.results
+            ],
+            "elapsed_seconds": (self.finished_at or time.time()) - self.started_at,
+        }
+
 
 class A2AOrchestrator:
     """A2A 통신 기반 에이전트 오케스트레이터"""
@@ -23,51 +94,118 @@ class A2AOrchestrator:
         self.project_id = project_id or cloud_config.project_id
         self.llm = get_llm()
         self.comm_manager = A2ACommunicationManager(
-            project_id=self.project_id, topic_prefix=cloud_config.topic_prefix
+            project_id=self.project_id,
+            topic_prefix=cloud_config.topic_prefix,
+            batch_settings=pubsub_v1.types.BatchSettings(
+                max_messages=cloud_config.publish_max_messages,
+                max_bytes=cloud_config.publish_max_bytes,
+                max_latency=cloud_config.publish_max_latency,
+            ),
+            fire_and_forget=cloud_config.publish_fire_and_forget,
         )
 
         # 에이전트 초기화
         self.agents = {}
         self._initialize_agents()
 
-        # 결과 저장소
-        self.results_store = {}
+        # 워크플로우 ID별 결과 저장소 (삽입 순서 = 시작 순서)
+        self.workflows: "OrderedDict[str, WorkflowRun]" = OrderedDict()
 
     def _initialize_agents(self):
-        """모든 에이전트 초기화"""
+        """모든 에이전트 초기화 (동시 처리 수와 큐 크기는 cloud_config 설정)"""
+        agent_classes = {
+            "requirement-analysis": RequirementAnalysisAgent,
+            "requirement-validator": RequirementValidatorAgent,
+            "service-flow-creator": ServiceFlowCreatorAgent,
+            "api-spec-creator": APISpecCreatorAgent,
+            "api-spec-validator": APISpecValidatorAgent,
+        }
         self.agents = {
-            "requirement-analysis": RequirementAnalysisAgent(
-                self.llm, self.comm_manager
-            ),
-            "requirement-validator": RequirementValidatorAgent(
-                self.llm, self.comm_manager
-            ),
-            "service-flow-creator": ServiceFlowCreatorAgent(
-                self.llm, self.comm_manager
-            ),
-            "api-spec-creator": APISpecCreatorAgent(self.llm, self.comm_manager),
-            "api-spec-validator": APISpecValidatorAgent(self.llm, self.comm_manager),
+            agent_name: agent_class(
+                self.llm,
+                self.comm_manager,
+                queue_size=cloud_config.agent_queue_size,
+                concurrency=cloud_config.get_agent_concurrency(agent_name),
+            )
+            for agent_name, agent_class in agent_classes.items()
         }
 
         # 결과 수집 핸들러 등록
         self.comm_manager.register_message_handler(
-            "collect_result", self._collect_result
+            RESULT_HANDLER, self._collect_result
         )
+        # 기다리지 않은 발행이 실패하면 해당 단계를 실패로 기록
+        self.comm_manager.add_delivery_failure_callback(self._on_delivery_failure)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def _collect_result(self, message_data: Dict[str, Any]):
-        """에이전트 결과 수집"""
+        """에이전트 결과를 해당 워크플로우에 수집"""
         agent_name = message_data.get("agent")
-        if agent_name:
-            self.results_store[agent_name] = message_data
-            logger.info(f"결과 수집됨: {agent_name}")
+        workflow_id = message_data.get("workflow_id")
+        if not agent_name:
+            return
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None or workflow.finished_at is not None:
+            # 정리되었거나 이미 끝난(타임아웃 등) 워크플로우의 늦은 결과
+            logger.warning(f"[{workflow_id}] 알 수 없는 워크플로우의 결과 무시: {agent_name}")
+            return
+        workflow.record(agent_name, message_data)
+        logger.info(f"[{workflow_id}] 결과 수집됨: {agent_name}")
+
+    def _on_delivery_failure(
+        self, target_agent: str, message_data: Dict[str, Any], exception: Exception
+    ):
+        """발행 실패 콜백 (발행 스레드에서 호출됨) - 결과를 기다리는 단계를 실패로 완료"""
+        workflow_id = message_data.get("workflow_id")
+        if workflow_id is None or self._loop is None:
+            return
+        # 결과 보고가 실패했으면 보고한 단계, 단계 전송이 실패했으면 받을 단계가 실패
+        stage = message_data.get("agent") if target_agent == ORCHESTRATOR_NAME else target_agent
+        failure = {
+            "error": f"메시지 전송 실패: {exception}",
+            "status": "failed",
+            "agent": stage,
+            "workflow_id": workflow_id,
+        }
+        self._loop.call_soon_threadsafe(
+            lambda: asyncio.ensure_future(self._collect_result(failure))
+        )
+
+    async def await_stage(
+        self, workflow_id: str, agent_name: str, timeout: float = None
+    ) -> Dict[str, Any]:
+        """
+        워크플로우의 특정 단계 결과가 수집될 때까지 대기
+
+        Args:
+            workflow_id: 워크플로우 ID
+            agent_name: 단계(에이전트) 이름
+            timeout: 최대 대기 시간(초). None이면 무제한
+
+        Returns:
+            해당 단계의 결과
+
+        Raises:
+            KeyError: 진행 중인 워크플로우가 아닌 경우
+            asyncio.TimeoutError: timeout 안에 결과가 오지 않은 경우
+        """
+        workflow = self.workflows[workflow_id]
+        if agent_name in workflow.results:
+            return workflow.results[agent_name]
+        if workflow.finished_at is not None:
+            raise KeyError(f"Workflow already finished: {workflow_id}")
+        # shield: 대기가 타임아웃되어도 future는 취소되지 않아 나중에 다시 기다릴 수 있음
+        return await asyncio.wait_for(
+            asyncio.shield(workflow.stage_future(agent_name)), timeout
+        )
 
     async def setup_infrastructure(self):
         """Google Cloud Pub/Sub 인프라 설정"""
         publisher = pubsub_v1.PublisherClient()
         subscriber = pubsub_v1.SubscriberClient()
 
-        # 각 에이전트별 토픽과 구독 생성
-        for agent_name in self.agents.keys():
+        # 각 에이전트별(+ 결과 수집용 오케스트레이터) 토픽과 구독 생성
+        for agent_name in [*self.agents.keys(), ORCHESTRATOR_NAME]:
             try:
                 # 토픽 생성
                 topic_path = self.comm_manager.get_topic_path(agent_name)
@@ -95,53 +233,155 @@ class A2AOrchestrator:
                 logger.error(f"인프라 설정 오류 ({agent_name}): {e}")
 
     async def start_all_agents(self):
-        """모든 에이전트의 메시지 처리 시작"""
+        """
+        모든 에이전트의 메시지 처리 시작
+
+        중간에 실패하면 이미 시작한 처리 루프와 수신을 정리한 뒤 예외를 다시 발생시킵니다.
+        """
+        self._loop = asyncio.get_running_loop()
         tasks = []
-        for agent in self.agents.values():
-            task = asyncio.create_task(agent.start_processing())
-            tasks.append(task)
+        try:
+            for agent_name, agent in self.agents.items():
+                task = asyncio.create_task(agent.start_processing())
+                tasks.append(task)
+                # 큐가 받을 수 있는 만큼만 Pub/Sub에서 받아 오도록 흐름 제어
+                await self.comm_manager.start_listening(
+                    agent_name, max_messages=agent.max_in_flight
+                )
+
+            # 단계 결과 수신
+            await self.comm_manager.start_listening(ORCHESTRATOR_NAME)
+        except Exception:
+            logger.error("에이전트 시작 중 오류가 발생해 시작한 에이전트를 종료합니다.")
+            await self.stop_all_agents(tasks)
+            raise
 
         logger.info("모든 에이전트가 메시지 수신을 시작했습니다.")
         return tasks
 
-    async def process_project(self, project_description: str) -> Dict[str, Any]:
-        """프로젝트 전체 처리 워크플로우"""
+    async def stop_all_agents(self, tasks: List[asyncio.Task], drain_timeout: float = 30):
+        """
+        에이전트를 정상 종료
+
+        1. 에이전트 구독은 스트림을 열어 둔 채 새 메시지만 돌려보냄 (처리 중인 메시지의 ack 유지)
+        2. 큐에 남은/처리 중인 메시지를 끝내고, 보내지 않은 발행(다음 단계, 결과 보고)을 마침
+        3. 결과 수신도 멈추고 모든 핸들러가 ack/nack한 뒤 스트림을 닫음
+        4. 처리 루프 종료
+
+        일부만 시작된 상태(수신을 시작하지 않은 에이전트, 처리 루프가 없는 에이전트)에서도
+        호출할 수 있으며, 앞 단계가 실패해도 스트림 종료와 처리 루프 종료는 진행합니다.
+        """
+        try:
+            for agent_name in self.agents:
+                self.comm_manager.pause_listening(agent_name)
+            await asyncio.gather(
+                *(agent.drain(drain_timeout) for agent in self.agents.values())
+            )
+            await self.comm_manager.flush(timeout=10)
+        finally:
+            try:
+                self.comm_manager.pause_listening()
+                await self.comm_manager.wait_handled(timeout=10)
+                # 스트림 종료 대기는 블로킹이므로 이벤트 루프 밖에서 실행
+                await asyncio.to_thread(self.comm_manager.stop_listening, timeout=10)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("모든 에이전트를 종료했습니다.")
+
+    async def process_project(
+        self, project_description: str, workflow_id: str = None
+    ) -> Dict[str, Any]:
+        """
+        프로젝트 전체 처리 워크플로우
+
+        Args:
+            project_description: 프로젝트 설명
+            workflow_id: 워크플로우 ID. 없으면 새로 생성
+
+        Returns:
+            에이전트 이름별 단계 결과
+        """
+        workflow_id = workflow_id or str(uuid.uuid4())
+        workflow = WorkflowRun(workflow_id)
+        self.workflows[workflow_id] = workflow
+        self._evict_finished_workflows()
+        envelope_token = current_envelope.set(
+            {"workflow_id": workflow_id, "report_to": ORCHESTRATOR_NAME}
+        )
         try:
-            # 1. 요구사항 분석 시작
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + WORKFLOW_TIMEOUT
+
+            # 1. 요구사항 분석 (직접 호출하므로 결과를 바로 기록)
             req_agent = self.agents["requirement-analysis"]
             result = await req_agent.analyze_requirements(project_description)
+            workflow.record(req_agent.agent_name, result)
 
             if result.get("status") == "failed":
+                workflow.finish("failed")
                 return {"error": "요구사항 분석 실패", "details": result}
 
-            # 결과 수집을 위해 잠시 대기
-            await asyncio.sleep(5)
-
-            # A2A 체인 시작 (자동 전송 모드)
+            # A2A 체인 시작 (자동 전송 모드, 워크플로우 ID와 결과 보고 대상은 봉투로 전달됨)
             await req_agent.send_to_agent(
                 "requirement-validator",
                 {
                     "input": result["requirement_spec"],
-                    "message_id": "workflow-start",
+                    "message_id": str(uuid.uuid4()),
                     "auto_forward": True,
                 },
             )
 
-            # 모든 에이전트가 처리 완료될 때까지 대기
-            max_wait_time = 300  # 5분
-            wait_time = 0
-
-            while wait_time < max_wait_time:
-                if len(self.results_store) >= 5:  # 모든 에이전트 완료
+            # 단계 결과가 도착하는 즉시 다음 단계를 기다림. 실패한 단계 뒤로는 체인이 끊기므로 중단
+            status = "completed"
+            for stage in WORKFLOW_STAGES[1:]:
+                try:
+                    stage_result = await self.await_stage(
+                        workflow_id, stage, timeout=max(deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"[{workflow_id}] 단계 대기 시간 초과: {stage}")
+                    status = "timeout"
+                    break
+                if stage_result.get("status") == "failed":
+                    status = "failed"
                     break
-                await asyncio.sleep(5)
-                wait_time += 5
 
-            return self.results_store
+            workflow.finish(status)
+            return dict(workflow.results)
 
         except Exception as e:
-            logger.error(f"프로젝트 처리 오류: {e}")
+            logger.error(f"[{workflow_id}] 프로젝트 처리 오류: {e}")
+            workflow.finish("failed")
             return {"error": str(e)}
+        finally:
+            current_envelope.reset(envelope_token)
+
+    def _evict_finished_workflows(self):
+        """보관 개수를 넘은 끝난 워크플로우를 오래된 것부터 정리"""
+        finished = [
+            workflow_id
+            for workflow_id, workflow in self.workflows.items()
+            if workflow.finished_at is not None
+        ]
+        for workflow_id in finished[: max(len(finished) - MAX_FINISHED_WORKFLOWS, 0)]:
+            del self.workflows[workflow_id]
+
+    def get_workflow_results(self, workflow_id: str) -> Dict[str, Any]:
+        """워크플로우의 지금까지 수집된 단계 결과"""
+        workflow = self.workflows.get(workflow_id)
+        return dict(workflow.results) if workflow else {}
+
+    def get_workflow_status(self, workflow_id: str = None):
+        """워크플로우 진행 상태. workflow_id가 없으면 보관 중인 모든 워크플로우"""
+        if workflow_id is None:
+            return {
+                workflow_id: workflow.to_status()
+                for workflow_id, workflow in self.workflows.items()
+            }
+        workflow = self.workflows.get(workflow_id)
+        return workflow.to_status() if workflow else None
 
     async def get_agent_status(self) -> Dict[str, str]:
         """모든 에이전트의 상태 확인"""
@@ -149,13 +389,25 @@ class A2AOrchestrator:
         for agent_name, agent in self.agents.items():
             status[agent_name] = {
                 "queue_size": agent.processing_queue.qsize(),
-                "status": "running" if not agent.processing_queue.empty() else "idle",
+                "active": agent.active_count,
+                "concurrency": agent.concurrency,
+                "status": "running"
+                if agent.active_count or not agent.processing_queue.empty()
+                else "idle",
             }
         return status
 
-    def cleanup_results(self):
-        """결과 저장소 초기화"""
-        self.results_store.clear()
+    def cleanup_results(self, workflow_id: str = None):
+        """결과 저장소 정리. workflow_id가 없으면 끝난 워크플로우 전체"""
+        if workflow_id is not None:
+            self.workflows.pop(workflow_id, None)
+            return
+        for workflow_id in [
+            workflow_id
+            for workflow_id, workflow in self.workflows.items()
+            if workflow.finished_at is not None
+        ]:
+            del self.workflows[workflow_id]
 
 
 async def main():
@@ -166,6 +418,7 @@ async def main():
         return
 
     orchestrator = A2AOrchestrator()
+    agent_tasks = []
 
     try:
         # 인프라 설정
@@ -202,8 +455,7 @@ async def main():
         print(f"오류 발생: {e}")
     finally:
         # 정리 작업
-        for task in agent_tasks:
-            task.cancel()
+        await orchestrator.stop_all_agents(agent_tasks)
 
 
 if __name__ == "__main__":